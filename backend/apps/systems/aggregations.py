@@ -0,0 +1,251 @@
+"""
+Single-pass aggregation helpers for dashboard statistics.
+
+Dashboard endpoints declare the buckets they need as a list of specs
+(distributions over a choice field, boolean flags, sums) and
+``aggregate_buckets`` compiles all of them into ONE ``queryset.aggregate()``
+call built from conditional ``Count(filter=Q(...))`` expressions, instead of
+issuing a separate ``.filter(...).count()`` round-trip per bucket.
+"""
+from typing import Any, Dict, Iterable, List
+
+from django.db.models import Avg, Count, Q, Sum
+from django.db.models.functions import Coalesce
+
+from .models import System, RECOMMENDATION_BUCKETS, recommendation_bucket_q
+from .utils import ROADMAP_CRITERIA
+
+
+class Buckets:
+    """
+    Count rows per named condition.
+
+    Result: ``{label: count}`` in the declared order of ``conditions``
+    (buckets with no rows are reported as 0).
+    """
+
+    def __init__(self, key: str, conditions: Dict[Any, Q]):
+        self.key = key
+        self.conditions = dict(conditions)
+
+    def expressions(self) -> Dict[str, Any]:
+        return {
+            f'{self.key}_b{index}': Count('pk', filter=condition)
+            for index, condition in enumerate(self.conditions.values())
+        }
+
+    def collect(self, row: Dict[str, Any]) -> Dict[Any, int]:
+        return {
+            label: row[f'{self.key}_b{index}']
+            for index, label in enumerate(self.conditions)
+        }
+
+
+class Distribution(Buckets):
+    """
+    Count rows per value of a field.
+
+    Result: ``{value: count}`` in the declared order of ``values``.
+    """
+
+    def __init__(self, key: str, field: str, values: Iterable[Any]):
+        self.field = field
+        self.values = list(values)
+        super().__init__(key, {value: Q(**{field: value}) for value in self.values})
+
+
+class Flag:
+    """
+    Count rows matching an arbitrary condition.
+
+    Result: ``int``
+    """
+
+    def __init__(self, key: str, condition: Q):
+        self.key = key
+        self.condition = condition
+
+    def expressions(self) -> Dict[str, Any]:
+        return {self.key: Count('pk', filter=self.condition)}
+
+    def collect(self, row: Dict[str, Any]) -> int:
+        return row[self.key]
+
+
+class Total:
+    """
+    Any other aggregate expression (total count, Sum, Avg, ...).
+
+    Result: the raw aggregate value.
+    """
+
+    def __init__(self, key: str, expression: Any = None):
+        self.key = key
+        self.expression = expression if expression is not None else Count('pk')
+
+    def expressions(self) -> Dict[str, Any]:
+        return {self.key: self.expression}
+
+    def collect(self, row: Dict[str, Any]) -> Any:
+        return row[self.key]
+
+
+def aggregate_buckets(queryset, specs: List[Any]) -> Dict[str, Any]:
+    """
+    Evaluate every spec against ``queryset`` in a single aggregate query.
+
+    Args:
+        queryset: Base System queryset (already filtered by role/soft delete)
+        specs: Buckets / Distribution / Flag / Total instances
+
+    Returns:
+        dict: ``{spec.key: collected value}``
+    """
+    expressions = {}
+    for spec in specs:
+        expressions.update(spec.expressions())
+
+    row = queryset.aggregate(**expressions)
+    return {spec.key: spec.collect(row) for spec in specs}
+
+
+# ============================================================================
+# Shared bucket definitions
+# ============================================================================
+
+def _choice_values(choices):
+    return [value for value, _label in choices]
+
+
+TOTAL = Total('total')
+
+STATUS_DISTRIBUTION = Distribution(
+    'status_distribution', 'status', _choice_values(System.STATUS_CHOICES)
+)
+CRITICALITY_DISTRIBUTION = Distribution(
+    'criticality_distribution', 'criticality_level', _choice_values(System.CRITICALITY_CHOICES)
+)
+SCOPE_DISTRIBUTION = Distribution(
+    'scope_distribution', 'scope', _choice_values(System.SCOPE_CHOICES)
+)
+HOSTING_DISTRIBUTION = Distribution(
+    'hosting_distribution', 'hosting_platform',
+    _choice_values(System._meta.get_field('hosting_platform').choices),
+)
+
+# A system "has integration" when it provides or consumes at least one API
+HAS_INTEGRATION = Q(api_provided_count__gt=0) | Q(api_consumed_count__gt=0)
+
+# keep / upgrade / replace / merge / unknown (unknown includes "no assessment row")
+RECOMMENDATION_DISTRIBUTION = Buckets(
+    'recommendation_distribution',
+    {bucket: recommendation_bucket_q(bucket) for bucket in RECOMMENDATION_BUCKETS + ['unknown']},
+)
+
+WITH_INTEGRATION = Flag('with_integration', HAS_INTEGRATION)
+TOTAL_API_PROVIDED = Total('total_api_provided', Coalesce(Sum('api_provided_count'), 0))
+TOTAL_API_CONSUMED = Total('total_api_consumed', Coalesce(Sum('api_consumed_count'), 0))
+
+
+# SystemCost columns reported in investment_stats cost_breakdown
+COST_BREAKDOWN_FIELDS = {
+    'development': 'development_cost',
+    'license': 'annual_license_cost',
+    'maintenance': 'annual_maintenance_cost',
+    'infrastructure': 'annual_infrastructure_cost',
+    'personnel': 'annual_personnel_cost',
+}
+
+
+def org_cost_rollup(queryset):
+    """
+    Per-organization system count and cost sums in one grouped query.
+
+    Systems are LEFT JOINed to their SystemCost row, so ``system_count``
+    includes systems without cost data while the sums only see filled rows.
+
+    Returns:
+        QuerySet of dicts ``{'org_id', 'org__name', 'system_count',
+        'initial_investment', <COST_BREAKDOWN_FIELDS keys>...}`` ordered by
+        system count (desc), then organization name. Slice it to add a LIMIT.
+    """
+    cost_sums = {
+        key: Sum(f'cost__{field}') for key, field in COST_BREAKDOWN_FIELDS.items()
+    }
+    return (
+        queryset.values('org_id', 'org__name')
+        .annotate(
+            system_count=Count('pk'),
+            initial_investment=Sum('cost__initial_investment'),
+            **cost_sums,
+        )
+        .order_by('-system_count', 'org__name')
+    )
+
+
+# ============================================================================
+# Per-endpoint bucket declarations
+# ============================================================================
+
+# GET /api/systems/statistics/
+STATISTICS_BUCKETS = [
+    TOTAL,
+    # Stored System.completion_percentage (NULL when there are no systems)
+    Total('average_completion_percentage', Avg('completion_percentage')),
+    Distribution('by_status', 'status', ['operating', 'pilot', 'stopped', 'replacing']),
+    # P0.8: Removed 'critical' option per customer request
+    Distribution('by_criticality', 'criticality_level', ['high', 'medium', 'low']),
+    Distribution('by_form_level', 'form_level', [1, 2]),
+]
+
+# GET /api/systems/strategic_stats/
+STRATEGIC_STATS_BUCKETS = [
+    TOTAL,
+    STATUS_DISTRIBUTION,
+    CRITICALITY_DISTRIBUTION,
+    SCOPE_DISTRIBUTION,
+    HOSTING_DISTRIBUTION,
+    RECOMMENDATION_DISTRIBUTION,
+    TOTAL_API_PROVIDED,
+    TOTAL_API_CONSUMED,
+    WITH_INTEGRATION,
+]
+
+# GET /api/systems/integration_stats/
+INTEGRATION_STATS_BUCKETS = [
+    TOTAL,
+    TOTAL_API_PROVIDED,
+    TOTAL_API_CONSUMED,
+    WITH_INTEGRATION,
+]
+
+# GET /api/systems/investment_stats/
+INVESTMENT_STATS_BUCKETS = [
+    Total('initial_investment', Sum('cost__initial_investment')),
+    *[
+        Total(key, Sum(f'cost__{field}'))
+        for key, field in COST_BREAKDOWN_FIELDS.items()
+    ],
+    Total('total_users', Coalesce(Sum('users_total'), 0)),
+]
+
+# GET /api/systems/optimization_stats/
+OPTIMIZATION_STATS_BUCKETS = [
+    TOTAL,
+    RECOMMENDATION_DISTRIBUTION,
+]
+
+# GET /api/systems/insights/: see insights.INSIGHTS_BUCKETS
+
+# GET /api/systems/roadmap_stats/
+# Systems still needing each utils.ROADMAP_CRITERIA improvement, keyed by
+# (phase, action) - the criteria's own SQL side (``criterion.needed``)
+ROADMAP_IMPROVEMENTS = Buckets('improvements', {
+    (phase, action): criterion.needed for phase, action, _detail, criterion in ROADMAP_CRITERIA
+})
+
+ROADMAP_STATS_BUCKETS = [
+    TOTAL,
+    Distribution('phase_distribution', 'roadmap_phase', _choice_values(System.ROADMAP_PHASE_CHOICES)),
+    ROADMAP_IMPROVEMENTS,
+]
@@ -0,0 +1,94 @@
+"""
+Answer cache for the AI assistant (ai_query_stream).
+
+Leaders ask the same questions over and over ("Bộ có bao nhiêu hệ thống?").
+Answers are cached under the normalized question + mode + a hash of the
+active improvement policies, and every entry records the systems data
+version (cache.py) it was computed at:
+
+- Same data version: the stored ``complete`` payload is streamed as is.
+- Newer data version: the stored SQL is re-executed (quick mode rebuilds
+  the answer from its template; deep mode skips SQL generation and writes
+  the report from the fresh rows).
+- Policies changed: the key changes, so the question goes to the LLM again.
+
+Follow-up questions (conversation context) are never cached. The data
+version must be shared by all workers (Redis), otherwise a worker that never
+saw a write would keep serving an outdated answer: AI_ANSWER_CACHE_ENABLED
+defaults to on only with REDIS_CACHE_URL. Cache errors never break a
+request: the question is simply answered without the cache.
+"""
+import hashlib
+import logging
+import re
+import unicodedata
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .cache import get_data_version
+
+logger = logging.getLogger(__name__)
+
+ANSWER_CACHE_TIMEOUT = getattr(settings, 'AI_ANSWER_CACHE_TIMEOUT', 7 * 24 * 60 * 60)
+
+
+def normalize_query(query: str) -> str:
+    """
+    Fold a question to its cache identity: lower case, no Vietnamese
+    diacritics, punctuation dropped, whitespace collapsed.
+
+    Example: ``"  Bộ có bao nhiêu HỆ THỐNG?? "`` -> ``"bo co bao nhieu he thong"``
+    """
+    text = unicodedata.normalize('NFD', query.lower().replace('đ', 'd'))
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    text = re.sub(r'[^\w\s]|_', ' ', text)
+    return ' '.join(text.split())
+
+
+def answer_cache_key(query: str, mode: str, policies_text: str) -> str:
+    """
+    Example: ``ai_answer:quick:3f2a9c1e0b7d4a62:d41d8cd9``
+    """
+    query_hash = hashlib.sha256(normalize_query(query).encode('utf-8')).hexdigest()[:16]
+    policies_hash = hashlib.md5(policies_text.encode('utf-8')).hexdigest()[:8]
+    return f'ai_answer:{mode}:{query_hash}:{policies_hash}'
+
+
+def lookup_answer(query: str, mode: str, policies_text: str, context: Any = None):
+    """
+    Find the cached answer for a question.
+
+    Returns:
+        tuple: (key, data version, entry) - key is None when the question
+               must not be cached (follow-up, cache disabled or unavailable),
+               entry is None on a miss
+    """
+    if context or not getattr(settings, 'AI_ANSWER_CACHE_ENABLED', True):
+        return None, None, None
+
+    version = get_data_version()
+    if not version:
+        return None, None, None
+
+    key = answer_cache_key(query, mode, policies_text)
+    try:
+        entry = cache.get(key)
+    except Exception as e:
+        logger.warning(f"AI answer cache read failed for {key}: {e}")
+        entry = None
+    return key, version, entry
+
+
+def store_answer(key: Optional[str], entry: Dict[str, Any]) -> None:
+    """
+    Store an answer (``{'data_version', 'sql', 'response', ...}``) under
+    ``key``; no-op when the question is not cacheable.
+    """
+    if not key:
+        return
+    try:
+        cache.set(key, entry, timeout=ANSWER_CACHE_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"AI answer cache write failed for {key}: {e}")
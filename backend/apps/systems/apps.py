@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class SystemsConfig(AppConfig):
+    name = 'apps.systems'
+    verbose_name = 'Systems'
+
+    def ready(self):
+        # Register signal handlers (completion tracking)
+        from . import signals  # noqa: F401
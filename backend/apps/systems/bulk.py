@@ -0,0 +1,323 @@
+"""
+Bulk create/update of systems with set-based writes.
+
+POST /api/systems/bulk/ accepts a list of systems in the
+SystemCreateUpdateSerializer format (items with an ``id`` update that
+system, the others are created). Every item is validated first; the valid
+ones are then written inside one transaction with ``bulk_create`` /
+``bulk_update`` per table instead of the ~10 INSERT/UPDATE statements per
+system of SystemCreateUpdateSerializer.create / update.
+
+Bulk writes bypass model signals, so the side effects of the per-system
+path are applied once for the whole batch: system codes are reserved as
+one block per organization, stored completion / roadmap values are
+recomputed for every written system and the dashboard data version is
+bumped.
+"""
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import (
+    System,
+    SystemArchitecture,
+    SystemDataInfo,
+    SystemOperations,
+    SystemIntegration,
+    SystemAssessment,
+    SystemCost,
+    SystemVendor,
+    SystemInfrastructure,
+    SystemSecurity,
+    SystemIntegrationConnection,
+    SystemCodeCounter,
+    format_system_code,
+)
+from .serializers import SystemCreateUpdateSerializer, apply_changes, diff_integration_connections
+from .utils import (
+    COMPLETION_RELATED_FIELDS,
+    ROADMAP_RELATED_FIELDS,
+    calculate_roadmap_maturity,
+    get_completion_snapshot,
+)
+
+# Max systems per request
+BULK_MAX_ITEMS = getattr(settings, 'SYSTEM_BULK_MAX_ITEMS', 500)
+
+# One-to-one sub-models written with the system (validated_data key -> model),
+# in the order of SystemCreateUpdateSerializer.create
+LEVEL_1_MODELS = {
+    'architecture': SystemArchitecture,
+    'data_info': SystemDataInfo,
+    'operations': SystemOperations,
+    'integration': SystemIntegration,
+    'assessment': SystemAssessment,
+}
+# Only written for form_level == 2 systems
+LEVEL_2_MODELS = {
+    'cost': SystemCost,
+    'vendor': SystemVendor,
+    'infrastructure': SystemInfrastructure,
+    'security': SystemSecurity,
+}
+SUB_MODELS = {**LEVEL_1_MODELS, **LEVEL_2_MODELS}
+
+DERIVED_FIELDS = [
+    'completion_percentage', 'completion_status',
+    'roadmap_score', 'roadmap_phase', 'roadmap_improvements',
+]
+
+
+class BulkItem:
+    """One submitted system: validation result and, once written, the row"""
+
+    def __init__(self, index: int, data: Any):
+        self.index = index
+        self.data = data
+        self.instance: Optional[System] = None
+        self.validated_data: Optional[Dict[str, Any]] = None
+        self.nested: Dict[str, Any] = {}
+        self.connections: Optional[List[Dict[str, Any]]] = None
+        self.errors: Any = None
+        self.written = False
+
+    @property
+    def is_update(self) -> bool:
+        return isinstance(self.data, dict) and self.data.get('id') is not None
+
+    def result(self) -> Dict[str, Any]:
+        if not self.written:
+            return {
+                'index': self.index,
+                'status': 'error' if self.errors is not None else 'skipped',
+                'id': self.data.get('id') if isinstance(self.data, dict) else None,
+                'errors': self.errors,
+            }
+        return {
+            'index': self.index,
+            'status': 'updated' if self.is_update else 'created',
+            'id': self.instance.pk,
+            'system_code': self.instance.system_code,
+        }
+
+
+def _auto_now_fields(model) -> List[str]:
+    return [field.name for field in model._meta.concrete_fields if getattr(field, 'auto_now', False)]
+
+
+def validate_items(items: List[BulkItem], queryset, context: Dict[str, Any]) -> None:
+    """
+    Validate every item with SystemCreateUpdateSerializer.
+
+    Items with an ``id`` are validated as partial updates of that system;
+    ids outside ``queryset`` (the role-scoped systems) are reported as not found.
+    """
+    ids = [item.data['id'] for item in items if item.is_update]
+    existing = queryset.in_bulk([pk for pk in ids if isinstance(pk, int)]) if ids else {}
+    seen_ids = set()
+
+    for item in items:
+        if not isinstance(item.data, dict):
+            item.errors = {'non_field_errors': ['Mỗi phần tử phải là một đối tượng hệ thống.']}
+            continue
+
+        instance = None
+        if item.is_update:
+            instance = existing.get(item.data['id'])
+            if instance is None:
+                item.errors = {'id': [f"Không tìm thấy hệ thống {item.data['id']}."]}
+                continue
+            if instance.pk in seen_ids:
+                item.errors = {'id': [f"Hệ thống {instance.pk} xuất hiện nhiều lần trong yêu cầu."]}
+                continue
+            seen_ids.add(instance.pk)
+
+        serializer = SystemCreateUpdateSerializer(
+            instance, data=item.data, partial=instance is not None, context=context,
+        )
+        if not serializer.is_valid():
+            item.errors = serializer.errors
+            continue
+
+        validated = dict(serializer.validated_data)
+        item.instance = instance
+        item.connections = validated.pop('integration_connections', None)
+        item.nested = {name: validated.pop(name) for name in SUB_MODELS if name in validated}
+        item.validated_data = validated
+
+
+def allocate_system_codes(systems: List[System]) -> None:
+    """
+    Assign SYS-{ORG_CODE}-{YYYY}-{XXXX} codes to new systems without one,
+    reserving one block of numbers per organization from SystemCodeCounter.
+    """
+    by_org = defaultdict(list)
+    for system in systems:
+        if not system.system_code:
+            by_org[system.org_id].append(system)
+
+    year = timezone.now().year
+    for org_systems in by_org.values():
+        org = org_systems[0].org
+        first = SystemCodeCounter.allocate(org, year, count=len(org_systems))
+        for offset, system in enumerate(org_systems):
+            system.system_code = format_system_code(org, year, first + offset)
+
+
+def _write_systems(created: List[BulkItem], updated: List[BulkItem]) -> None:
+    new_systems = [System(**item.validated_data) for item in created]
+    allocate_system_codes(new_systems)
+    System.objects.bulk_create(new_systems)
+    for item, system in zip(created, new_systems):
+        item.instance = system
+
+    if updated:
+        now = timezone.now()
+        fields = set(_auto_now_fields(System))
+        for item in updated:
+            fields.update(apply_changes(item.instance, item.validated_data))
+            item.instance.updated_at = now
+        System.objects.bulk_update([item.instance for item in updated], sorted(fields))
+
+
+def _write_sub_models(created: List[BulkItem], updated: List[BulkItem]) -> None:
+    """One bulk_create and at most one bulk_update per sub-model table"""
+    for name, model in SUB_MODELS.items():
+        level_2 = name in LEVEL_2_MODELS
+        to_create = [
+            model(system=item.instance, **item.nested.get(name, {}))
+            for item in created
+            if not level_2 or item.instance.form_level == 2
+        ]
+
+        # Updates only touch sub-models present in the payload (as update() does)
+        changes = {
+            item.instance.pk: item.nested[name]
+            for item in updated
+            if name in item.nested and (not level_2 or item.instance.form_level == 2)
+        }
+        if changes:
+            existing = {row.system_id: row for row in model.objects.filter(system_id__in=changes)}
+            now = timezone.now()
+            fields = set()
+            to_update = []
+            for system_id, values in changes.items():
+                row = existing.get(system_id)
+                if row is None:
+                    to_create.append(model(system_id=system_id, **values))
+                    continue
+                changed = apply_changes(row, values)
+                if changed:
+                    fields.update(changed)
+                    to_update.append(row)
+            if to_update:
+                for row in to_update:
+                    for field in _auto_now_fields(model):
+                        setattr(row, field, now)
+                model.objects.bulk_update(to_update, sorted(fields | set(_auto_now_fields(model))))
+
+        if to_create:
+            model.objects.bulk_create(to_create)
+
+
+def _write_connections(created: List[BulkItem], updated: List[BulkItem]) -> None:
+    """
+    Sync the integration connections of every item that sent a list, by
+    identity as SystemCreateUpdateSerializer.update does
+    (serializers.diff_integration_connections), with set-based writes.
+    """
+    to_create = [
+        SystemIntegrationConnection(system=item.instance, **{k: v for k, v in connection.items() if k != 'id'})
+        for item in created
+        for connection in item.connections or []
+    ]
+
+    synced = [item for item in updated if item.connections is not None]
+    existing = defaultdict(list)
+    if synced:
+        for connection in SystemIntegrationConnection.objects.filter(
+            system_id__in=[item.instance.pk for item in synced]
+        ):
+            existing[connection.system_id].append(connection)
+
+    to_update, fields, to_delete = [], set(), []
+    for item in synced:
+        changed_rows, new_rows, deleted_rows = diff_integration_connections(
+            existing[item.instance.pk], item.connections
+        )
+        for connection, changed in changed_rows:
+            to_update.append(connection)
+            fields.update(changed)
+        to_create += [SystemIntegrationConnection(system=item.instance, **values) for values in new_rows]
+        to_delete += deleted_rows
+
+    if to_delete:
+        SystemIntegrationConnection.objects.filter(pk__in=[c.pk for c in to_delete]).delete()
+    if to_update:
+        now = timezone.now()
+        for connection in to_update:
+            connection.updated_at = now
+        SystemIntegrationConnection.objects.bulk_update(to_update, sorted(fields | {'updated_at'}))
+    if to_create:
+        SystemIntegrationConnection.objects.bulk_create(to_create)
+
+
+def refresh_derived_fields(system_ids: List[int]) -> None:
+    """
+    Recompute stored completion and roadmap values for ``system_ids``
+    (one read with the relations the rules need, one bulk_update).
+    """
+    systems = list(
+        System.objects.select_related(*COMPLETION_RELATED_FIELDS, *ROADMAP_RELATED_FIELDS)
+        .filter(pk__in=system_ids)
+    )
+    for system in systems:
+        snapshot = get_completion_snapshot(system)
+        maturity = calculate_roadmap_maturity(system)
+        system.completion_percentage = snapshot['percentage']
+        system.completion_status = snapshot['status']
+        system.roadmap_score = maturity['score']
+        system.roadmap_phase = maturity['phase']
+        system.roadmap_improvements = maturity['improvements']
+    System.objects.bulk_update(systems, DERIVED_FIELDS)
+
+
+def bulk_write_systems(data: List[Any], queryset, context: Dict[str, Any],
+                       atomic: bool = False) -> List[Dict[str, Any]]:
+    """
+    Validate and write a batch of systems.
+
+    Args:
+        data: Submitted items (SystemCreateUpdateSerializer payloads)
+        queryset: Systems the user may update (role-scoped)
+        context: Serializer context (must contain the request)
+        atomic: Write nothing if any item is invalid (valid items are
+                then reported as 'skipped')
+
+    Returns:
+        list: Per-item results in submission order, e.g.
+              ``{'index': 0, 'status': 'created', 'id': 12, 'system_code': '...'}``
+              or ``{'index': 1, 'status': 'error', 'id': None, 'errors': {...}}``
+    """
+    from .signals import invalidate_dashboard_cache
+
+    items = [BulkItem(index, entry) for index, entry in enumerate(data)]
+    validate_items(items, queryset, context)
+
+    valid = [item for item in items if item.errors is None]
+    if valid and not (atomic and len(valid) < len(items)):
+        created = [item for item in valid if not item.is_update]
+        updated = [item for item in valid if item.is_update]
+        with transaction.atomic():
+            _write_systems(created, updated)
+            _write_sub_models(created, updated)
+            _write_connections(created, updated)
+            refresh_derived_fields([item.instance.pk for item in valid])
+            invalidate_dashboard_cache(sender=System, instance=None)
+        for item in valid:
+            item.written = True
+
+    return [item.result() for item in items]
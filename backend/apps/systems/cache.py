@@ -0,0 +1,243 @@
+"""
+Versioned cache and conditional GET for dashboard/system endpoints.
+
+Every cache key embeds a global "systems data version". Any save/delete of
+System, its sub-models, SystemIntegrationConnection or Organization bumps
+that version (see signals.py), so cached dashboard payloads are never
+invalidated one by one - they simply stop being read and expire.
+
+Backend: settings.CACHES['default'] (Redis in deployment, local memory in
+dev/tests). The version must be shared by every worker, so without Redis a
+deployment runs DummyCache: the version reads 0 and nothing is cached or
+answered with 304. Cache errors never break a request: on failure the view
+is computed as if the cache were empty.
+
+The same version plus a cheap (max updated_at, count) watermark of the
+visible systems drives ETag / Last-Modified headers (``conditional_get``),
+so unchanged polls get a 304 before anything is serialized.
+"""
+import functools
+import hashlib
+import logging
+import time
+from typing import Any, Callable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+DATA_VERSION_KEY = 'systems:data_version'
+DATA_CHANGED_AT_KEY = 'systems:data_changed_at'
+
+# Payloads are invalidated by the version bump; the timeout only bounds
+# how long unreachable entries occupy memory
+DASHBOARD_CACHE_TIMEOUT = getattr(settings, 'DASHBOARD_CACHE_TIMEOUT', 60 * 60)
+
+
+def get_data_version() -> int:
+    """Current systems data version (0 when no cache backend keeps it)"""
+    try:
+        version = cache.get(DATA_VERSION_KEY)
+        if version is None:
+            # First use or evicted: seed from the clock (as bump_data_version
+            # does) so the sequence cannot collide with versions cached before
+            cache.add(DATA_VERSION_KEY, int(time.time()), timeout=None)
+            version = cache.get(DATA_VERSION_KEY)
+        return version or 0
+    except Exception as e:
+        logger.warning(f"Dashboard cache unavailable, reading version failed: {e}")
+        return 0
+
+
+def bump_data_version() -> None:
+    """Invalidate every versioned cache entry (called on data writes)"""
+    try:
+        try:
+            cache.incr(DATA_VERSION_KEY)
+        except ValueError:
+            # Key missing (first write or evicted): start a new version sequence
+            # that cannot collide with versions cached before the eviction
+            cache.add(DATA_VERSION_KEY, int(time.time()), timeout=None)
+            cache.incr(DATA_VERSION_KEY)
+        cache.set(DATA_CHANGED_AT_KEY, time.time(), timeout=None)
+    except Exception as e:
+        logger.warning(f"Dashboard cache unavailable, version bump failed: {e}")
+
+
+def get_org_scope(user: Any) -> str:
+    """Data visible to the user: 'all' (admin/leader) or their organization ID"""
+    if getattr(user, 'role', None) == 'org_user':
+        return f'org{user.organization_id}' if user.organization_id else 'none'
+    return 'all'
+
+
+def dashboard_cache_key(endpoint: str, request: Any, version: Optional[int] = None,
+                        query: Optional[str] = None) -> str:
+    """
+    Cache key: endpoint + role + org scope + data version (+ query string).
+
+    Example: ``dashboard:strategic_stats:v42:leader:all:d41d8cd9``
+
+    Args:
+        query: Query string to key on; defaults to the request's own
+               (dashboard_bundle passes '' to share entries with the
+               parameterless section endpoints)
+    """
+    if version is None:
+        version = get_data_version()
+    user = request.user
+    if query is None:
+        query = request.GET.urlencode() if hasattr(request, 'GET') else ''
+    query_hash = hashlib.md5(query.encode('utf-8')).hexdigest()[:8]
+    return f'dashboard:{endpoint}:v{version}:{getattr(user, "role", "")}:{get_org_scope(user)}:{query_hash}'
+
+
+def read_dashboard_cache(key: str) -> Any:
+    """Cached payload for ``key`` or None (also on cache errors)"""
+    try:
+        return cache.get(key)
+    except Exception as e:
+        logger.warning(f"Dashboard cache read failed for {key}: {e}")
+        return None
+
+
+def write_dashboard_cache(key: str, data: Any) -> None:
+    try:
+        cache.set(key, data, timeout=DASHBOARD_CACHE_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"Dashboard cache write failed for {key}: {e}")
+
+
+def cached_dashboard(endpoint: str) -> Callable:
+    """
+    Cache the JSON payload of a successful (200) dashboard action.
+
+    Usage:
+        @action(detail=False, methods=['get'])
+        @cached_dashboard('strategic_stats')
+        def strategic_stats(self, request): ...
+
+    Error responses (403 etc.) are never cached and the key includes the
+    role, so a role the view rejects can never be served a cached payload.
+    """
+    def decorator(view_method: Callable) -> Callable:
+        @functools.wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            version = get_data_version()
+            if not version:
+                return view_method(self, request, *args, **kwargs)
+
+            key = dashboard_cache_key(endpoint, request, version)
+            data = read_dashboard_cache(key)
+            if data is not None:
+                response = Response(data)
+                response['X-Cache'] = 'HIT'
+                return response
+
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                write_dashboard_cache(key, response.data)
+                response['X-Cache'] = 'MISS'
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+# ============================================================================
+# Conditional GET (ETag / Last-Modified)
+# ============================================================================
+
+def get_data_changed_at() -> Optional[float]:
+    """Unix time of the last data version bump (None if unknown)"""
+    try:
+        return cache.get(DATA_CHANGED_AT_KEY)
+    except Exception as e:
+        logger.warning(f"Dashboard cache unavailable, reading change time failed: {e}")
+        return None
+
+
+def data_watermark(queryset: Any):
+    """
+    Cheap fingerprint of the data behind a response.
+
+    Combines the data version (covers sub-models, connections, organizations)
+    with max(updated_at) and count of ``queryset`` (covers the System rows
+    even when the version lives in per-process local memory).
+
+    Returns:
+        tuple: (fingerprint string, last modified as int Unix time or None)
+    """
+    row = queryset.order_by().aggregate(last_updated=Max('updated_at'), count=Count('pk'))
+    version = get_data_version()
+    last_updated = row['last_updated']
+
+    timestamps = [t for t in (last_updated.timestamp() if last_updated else None, get_data_changed_at()) if t]
+    # Whole seconds, as HTTP dates have no sub-second precision
+    last_modified = int(max(timestamps)) if timestamps else None
+
+    fingerprint = f'v{version}:{last_updated.isoformat() if last_updated else "-"}:{row["count"]}'
+    return fingerprint, last_modified
+
+
+def conditional_get(endpoint: str, queryset_func: Optional[Callable] = None) -> Callable:
+    """
+    Add a strong ETag and Last-Modified to a GET view method and answer
+    If-None-Match / If-Modified-Since with 304 without running the view.
+
+    Usage:
+        @action(detail=False, methods=['get'])
+        @conditional_get('completion_stats')
+        def completion_stats(self, request): ...
+
+    Args:
+        endpoint: Name mixed into the ETag (different views never share tags)
+        queryset_func: ``(view, request, *args, **kwargs) -> System queryset``
+                       whose watermark identifies the response data;
+                       defaults to ``view.get_queryset()`` (role-scoped)
+    """
+    def decorator(view_method: Callable) -> Callable:
+        @functools.wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view_method(self, request, *args, **kwargs)
+
+            if not get_data_version():
+                # No shared version: sub-model writes would not change the ETag
+                return view_method(self, request, *args, **kwargs)
+
+            queryset = queryset_func(self, request, *args, **kwargs) if queryset_func else self.get_queryset()
+            fingerprint, last_modified = data_watermark(queryset)
+
+            user = request.user
+            tag_source = '|'.join([
+                endpoint,
+                str(sorted(kwargs.items())),
+                getattr(user, 'role', ''),
+                get_org_scope(user),
+                request.GET.urlencode(),
+                request.META.get('HTTP_ACCEPT', ''),
+                fingerprint,
+            ])
+            etag = '"%s"' % hashlib.md5(tag_source.encode('utf-8')).hexdigest()
+
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = view_method(self, request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+
+            if last_modified and not response.has_header('Last-Modified'):
+                response['Last-Modified'] = http_date(last_modified)
+            response.headers.setdefault('ETag', etag)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,681 @@
+"""
+Server-side Excel export of the system inventory.
+
+Builds the multi-sheet report of 14-automated-solution/generate_excel_sample.py
+(summary, per-organization, system list, follow-up notes) with openpyxl's
+write-only mode: rows are written straight to the worksheet's temporary XML
+stream instead of being kept as cell objects, and the system list is read
+with ``.iterator(chunk_size=...)``, so memory stays flat however many
+systems are exported. Summary figures come from one aggregate query and
+per-organization figures from one grouped query.
+
+Large exports run as background jobs (``ExportJob`` + tasks.run_export_job)
+that report rows processed and keep the finished file under
+settings.EXPORT_ROOT, named by ``export_cache_key`` so an identical export
+of unchanged data is served from disk.
+"""
+import csv
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from datetime import timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Avg, Count, F, Q
+from django.utils import timezone
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+
+from apps.organizations.models import Organization
+
+from .aggregations import (
+    CRITICALITY_DISTRIBUTION,
+    STATUS_DISTRIBUTION,
+    TOTAL,
+    Flag,
+    Total,
+    aggregate_buckets,
+)
+from .cache import data_watermark, get_org_scope
+from .models import ExportJob, System
+
+logger = logging.getLogger(__name__)
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# Rows fetched per round-trip while writing the system list
+EXPORT_CHUNK_SIZE = getattr(settings, 'EXPORT_CHUNK_SIZE', 2000)
+
+# Query params shared by export_data, export_xlsx and export jobs
+EXPORT_FILTER_PARAMS = ('search', 'org', 'status')
+
+SUMMARY_BUCKETS = [
+    TOTAL,
+    STATUS_DISTRIBUTION,
+    CRITICALITY_DISTRIBUTION,
+    Total('average_completion', Avg('completion_percentage')),
+    Flag('completed', Q(completion_percentage__gte=100)),
+    Flag('below_50', Q(completion_percentage__lt=50)),
+]
+
+# Columns of sheet "3. Danh sách HT", read with values_list()
+SYSTEM_SHEET_FIELDS = (
+    'system_name', 'org__name', 'status', 'criticality_level',
+    'completion_percentage', 'updated_at',
+)
+
+STATUS_LABELS = dict(System.STATUS_CHOICES)
+CRITICALITY_LABELS = dict(System.CRITICALITY_CHOICES)
+
+# ============================================================================
+# Styles (same palette as generate_excel_sample.py)
+# ============================================================================
+
+FONT_NAME = 'Times New Roman'
+FONT_SIZE = 14
+
+NORMAL_FONT = Font(name=FONT_NAME, size=FONT_SIZE)
+BOLD_FONT = Font(name=FONT_NAME, size=FONT_SIZE, bold=True)
+TITLE_FONT = Font(name=FONT_NAME, size=FONT_SIZE + 2, bold=True)
+HEADER_FONT = Font(name=FONT_NAME, size=FONT_SIZE, bold=True, color='FFFFFF')
+
+HEADER_FILL = PatternFill(start_color='1F4E78', end_color='1F4E78', fill_type='solid')
+SUBHEADER_FILL = PatternFill(start_color='D9E1F2', end_color='D9E1F2', fill_type='solid')
+YELLOW_FILL = PatternFill(start_color='FFC000', end_color='FFC000', fill_type='solid')
+RED_FILL = PatternFill(start_color='FFC7CE', end_color='FFC7CE', fill_type='solid')
+ORANGE_FILL = PatternFill(start_color='FFEB9C', end_color='FFEB9C', fill_type='solid')
+LIGHT_YELLOW_FILL = PatternFill(start_color='FFF2CC', end_color='FFF2CC', fill_type='solid')
+GREEN_FILL = PatternFill(start_color='C6EFCE', end_color='C6EFCE', fill_type='solid')
+
+_SIDE = Side(style='thin', color='1F4E78')
+BORDER = Border(left=_SIDE, right=_SIDE, top=_SIDE, bottom=_SIDE)
+
+CENTER = Alignment(horizontal='center', vertical='center', wrap_text=True)
+LEFT = Alignment(horizontal='left', vertical='center', wrap_text=True)
+
+PERCENT_FORMAT = '0.0'
+DATE_FORMAT = 'DD/MM/YYYY'
+
+
+def _cell(ws, value: Any, font=NORMAL_FONT, fill=None, alignment=LEFT,
+          border=True, number_format: Optional[str] = None) -> WriteOnlyCell:
+    cell = WriteOnlyCell(ws, value=value)
+    cell.font = font
+    cell.alignment = alignment
+    if fill is not None:
+        cell.fill = fill
+    if border:
+        cell.border = BORDER
+    if number_format:
+        cell.number_format = number_format
+    return cell
+
+
+def _header_row(ws, labels: List[str]) -> List[WriteOnlyCell]:
+    return [_cell(ws, label, font=HEADER_FONT, fill=HEADER_FILL, alignment=CENTER) for label in labels]
+
+
+def _setup_sheet(ws, widths: List[int], freeze: Optional[str] = None) -> None:
+    """Column widths and frozen panes must be set before the first row is written"""
+    for index, width in enumerate(widths):
+        ws.column_dimensions[chr(ord('A') + index)].width = width
+    if freeze:
+        ws.freeze_panes = freeze
+
+
+def _completion_fill(pct: float):
+    if pct >= 80:
+        return GREEN_FILL
+    if pct >= 60:
+        return LIGHT_YELLOW_FILL
+    return RED_FILL
+
+
+def _percentage(value: Optional[float]) -> float:
+    return round(float(value or 0), 1)
+
+
+# ============================================================================
+# Data
+# ============================================================================
+
+def org_completion_rollup(queryset, organizations) -> List[Dict[str, Any]]:
+    """
+    System count and average completion per organization (one grouped query).
+
+    Organizations without matching systems are listed with 0 systems so
+    they show up as "not updated" in the report.
+
+    Returns:
+        list: ``[{'id', 'name', 'system_count', 'avg_completion'}]`` ordered
+        by organization name
+    """
+    rollup = {
+        row['org_id']: row
+        for row in queryset.order_by().values('org_id').annotate(
+            system_count=Count('pk'),
+            avg_completion=Avg('completion_percentage'),
+        )
+    }
+    rows = []
+    for org_id, name in organizations.order_by('name').values_list('id', 'name'):
+        row = rollup.get(org_id, {})
+        rows.append({
+            'id': org_id,
+            'name': name,
+            'system_count': row.get('system_count', 0),
+            'avg_completion': _percentage(row.get('avg_completion')),
+        })
+    return rows
+
+
+def follow_up_note(pct: float):
+    """(note, fill) for an organization in the follow-up sheet"""
+    if pct == 0:
+        return 'Chưa cập nhật dữ liệu', RED_FILL
+    if pct < 30:
+        return 'Cần đốc thúc nhập liệu', ORANGE_FILL
+    if pct < 40:
+        return 'Cần quan tâm', YELLOW_FILL
+    return 'Tiếp tục theo dõi', YELLOW_FILL
+
+
+# ============================================================================
+# Sheets
+# ============================================================================
+
+def _write_summary_sheet(wb, summary: Dict[str, Any], now) -> None:
+    ws = wb.create_sheet('1. Tổng quan')
+    _setup_sheet(ws, [35, 15, 15])
+
+    ws.append([_cell(ws, 'BÁO CÁO TỔNG QUAN HỆ THỐNG CDS', font=TITLE_FONT, alignment=CENTER, border=False)])
+    ws.merged_cells.add('A1:C1')
+    ws.append([_cell(ws, f"Ngày {now.strftime('%d/%m/%Y')}", alignment=CENTER, border=False)])
+    ws.merged_cells.add('A2:C2')
+    ws.append([])
+    ws.append(_header_row(ws, ['CHỈ TIÊU', 'GIÁ TRỊ', 'GHI CHÚ']))
+
+    total = summary['total']
+
+    def section(title):
+        ws.append([_cell(ws, title, font=BOLD_FONT, fill=SUBHEADER_FILL)] +
+                  [_cell(ws, None, fill=SUBHEADER_FILL) for _ in range(2)])
+
+    def line(label, value, note=None, number_format=None):
+        ws.append([
+            _cell(ws, label),
+            _cell(ws, value, alignment=CENTER, number_format=number_format),
+            _cell(ws, note, alignment=CENTER),
+        ])
+
+    def share(count):
+        return f'{count / total * 100:.1f}%' if total else '0.0%'
+
+    section('THEO TRẠNG THÁI')
+    line('Tổng số hệ thống', total)
+    for value, count in summary['status_distribution'].items():
+        line(f'  - {STATUS_LABELS.get(value, value)}', count, share(count))
+
+    section('THEO MỨC ĐỘ QUAN TRỌNG')
+    for value, count in summary['criticality_distribution'].items():
+        line(f'  - {CRITICALITY_LABELS.get(value, value)}', count, share(count))
+
+    section('THEO TRÌNH ĐỘ NHẬP LIỆU')
+    line('Hoàn thành trung bình (%)', _percentage(summary['average_completion']), number_format=PERCENT_FORMAT)
+    line('Hệ thống hoàn thành 100%', summary['completed'], share(summary['completed']))
+    line('Hệ thống dưới 50%', summary['below_50'], share(summary['below_50']))
+
+
+def _write_org_sheet(wb, orgs: List[Dict[str, Any]], now) -> None:
+    ws = wb.create_sheet('2. Theo đơn vị')
+    _setup_sheet(ws, [5, 50, 15, 12, 15], freeze='A3')
+
+    ws.append(_header_row(ws, [
+        'STT', 'ĐƠN VỊ', 'TRẠNG THÁI',
+        f"TỶ LỆ NHẬP DỮ LIỆU TÍNH ĐẾN {now.strftime('%d/%m %H:%M')}", None,
+    ]))
+    ws.merged_cells.add('D1:E1')
+    ws.append(
+        [_cell(ws, None, fill=HEADER_FILL) for _ in range(3)] +
+        [_cell(ws, label, font=BOLD_FONT, fill=SUBHEADER_FILL, alignment=CENTER)
+         for label in ('Số hệ thống', '% hoàn thành trung bình')]
+    )
+    ws.merged_cells.add('A1:A2')
+    ws.merged_cells.add('B1:B2')
+    ws.merged_cells.add('C1:C2')
+
+    for index, org in enumerate(orgs, 1):
+        has_data = org['system_count'] > 0
+        ws.append([
+            _cell(ws, index, alignment=CENTER),
+            _cell(ws, org['name']),
+            _cell(ws, 'Hoạt động', alignment=CENTER),
+            _cell(ws, org['system_count'] if has_data else 'Chưa có dữ liệu', alignment=CENTER),
+            _cell(ws, org['avg_completion'] if has_data else 'Chưa có dữ liệu',
+                  alignment=CENTER, number_format=PERCENT_FORMAT),
+        ])
+
+    updated = [org for org in orgs if org['avg_completion'] > 0]
+    not_updated = [org for org in orgs if org['avg_completion'] == 0]
+    bands = [
+        ('Trên 80%', sum(1 for org in updated if org['avg_completion'] > 80)),
+        ('Từ 60% đến 80%', sum(1 for org in updated if 60 <= org['avg_completion'] <= 80)),
+        ('Dưới 60%', sum(1 for org in updated if org['avg_completion'] < 60)),
+        ('Dưới 30%', sum(1 for org in updated if org['avg_completion'] < 30)),
+    ]
+
+    ws.append([])
+    ws.append([None, _cell(ws, f'Tổng hợp: {len(orgs)} Đơn vị', font=BOLD_FONT, border=False)])
+    ws.append([None, _cell(ws, f'Đã cập nhật: {len(updated)} đơn vị', border=False)])
+    ws.append([None, _cell(ws, 'Trong đó:', border=False)])
+    for label, count in bands:
+        ws.append([None, _cell(ws, f'  - {label}: {count} đơn vị', border=False)])
+    ws.append([None, _cell(ws, f'Chưa cập nhật: {len(not_updated)} đơn vị', border=False)])
+
+    if not_updated:
+        ws.append([])
+        ws.append([None, _cell(ws, 'Danh sách đơn vị chưa cập nhật dữ liệu', font=BOLD_FONT, border=False)])
+        for index, org in enumerate(not_updated, 1):
+            ws.append([None, _cell(ws, f'{index}. {org["name"]}', border=False)])
+
+
+def _write_systems_sheet(wb, queryset, chunk_size: int,
+                         progress: Optional[Callable[[int], None]] = None) -> int:
+    ws = wb.create_sheet('3. Danh sách HT')
+    _setup_sheet(ws, [5, 40, 25, 12, 12, 12, 15], freeze='A2')
+
+    ws.append(_header_row(ws, [
+        'STT', 'TÊN HỆ THỐNG', 'ĐƠN VỊ', 'TRẠNG THÁI', 'QUAN TRỌNG', '% HOÀN THÀNH', 'NGÀY CẬP NHẬT',
+    ]))
+
+    rows = (
+        queryset.order_by('org__name', 'system_name')
+        .values_list(*SYSTEM_SHEET_FIELDS)
+        .iterator(chunk_size=chunk_size)
+    )
+    count = 0
+    for name, org_name, status, criticality, completion, updated_at in rows:
+        count += 1
+        pct = _percentage(completion)
+        ws.append([
+            _cell(ws, count, alignment=CENTER),
+            _cell(ws, name),
+            _cell(ws, org_name),
+            _cell(ws, STATUS_LABELS.get(status, status), alignment=CENTER),
+            _cell(ws, CRITICALITY_LABELS.get(criticality, criticality), alignment=CENTER),
+            _cell(ws, pct, fill=_completion_fill(pct), alignment=CENTER, number_format=PERCENT_FORMAT),
+            _cell(ws, timezone.localtime(updated_at).date() if updated_at else None,
+                  alignment=CENTER, number_format=DATE_FORMAT),
+        ])
+        if progress and count % chunk_size == 0:
+            progress(count)
+    return count
+
+
+def _write_follow_up_sheet(wb, orgs: List[Dict[str, Any]]) -> None:
+    ws = wb.create_sheet('4. Lưu ý đôn đốc')
+    _setup_sheet(ws, [5, 45, 12, 40], freeze='A2')
+
+    ws.append(_header_row(ws, ['STT', 'ĐƠN VỊ', '% HOÀN THÀNH', 'LƯU Ý / GHI CHÚ']))
+
+    follow_up = sorted(
+        (org for org in orgs if org['avg_completion'] <= 50),
+        key=lambda org: (org['avg_completion'], org['name']),
+    )
+    for index, org in enumerate(follow_up, 1):
+        note, fill = follow_up_note(org['avg_completion'])
+        ws.append([
+            _cell(ws, index, alignment=CENTER),
+            _cell(ws, org['name']),
+            _cell(ws, org['avg_completion'], fill=fill, alignment=CENTER, number_format=PERCENT_FORMAT),
+            _cell(ws, note, fill=fill),
+        ])
+
+
+def write_systems_workbook(queryset, output, organizations=None,
+                           chunk_size: int = EXPORT_CHUNK_SIZE,
+                           progress: Optional[Callable[[int, int], None]] = None) -> int:
+    """
+    Write the system report workbook for ``queryset`` to ``output``.
+
+    Args:
+        queryset: Role-scoped, filtered System queryset
+        output: Path or binary file object (a temporary file for HTTP responses)
+        organizations: Organizations listed in the per-organization sheets
+                       (defaults to all organizations)
+        chunk_size: Rows fetched per round-trip for the system list
+        progress: Called as ``progress(rows_processed, rows_total)`` after
+                  the summary and after every chunk of the system list
+
+    Returns:
+        int: Number of systems written to the system list sheet
+    """
+    if organizations is None:
+        organizations = Organization.objects.all()
+    now = timezone.localtime()
+
+    summary = aggregate_buckets(queryset, SUMMARY_BUCKETS)
+    orgs = org_completion_rollup(queryset, organizations)
+    total = summary['total']
+    if progress:
+        progress(0, total)
+
+    wb = Workbook(write_only=True)
+    _write_summary_sheet(wb, summary, now)
+    _write_org_sheet(wb, orgs, now)
+    count = _write_systems_sheet(
+        wb, queryset, chunk_size,
+        progress=(lambda rows: progress(rows, total)) if progress else None,
+    )
+    _write_follow_up_sheet(wb, orgs)
+    wb.save(output)
+    if progress:
+        progress(count, total)
+    return count
+
+
+def export_filename(now=None, extension: str = 'xlsx') -> str:
+    now = timezone.localtime(now)
+    return f"Bao-cao-CDS-{now.strftime('%Y%m%d-%H%M')}.{extension}"
+
+
+# ============================================================================
+# Filters shared with the export endpoints
+# ============================================================================
+
+def export_params(query_params, user) -> Dict[str, Any]:
+    """
+    Export parameters of a request: the filters in EXPORT_FILTER_PARAMS
+    (empty ones dropped) and the organization scope of ``user``.
+    """
+    params = {
+        name: query_params.get(name)
+        for name in EXPORT_FILTER_PARAMS
+        if query_params.get(name)
+    }
+    params['org_scope'] = get_org_scope(user)
+    return params
+
+
+def filter_export_queryset(queryset, params):
+    """Apply the search / org / status export filters to a System queryset"""
+    search = params.get('search', '')
+    if search:
+        queryset = queryset.filter(
+            Q(system_code__icontains=search) |
+            Q(system_name__icontains=search) |
+            Q(system_name_en__icontains=search) |
+            Q(purpose__icontains=search)
+        )
+
+    org_id = params.get('org')
+    if org_id:
+        queryset = queryset.filter(org_id=org_id)
+
+    status_filter = params.get('status')
+    if status_filter:
+        queryset = queryset.filter(status=status_filter)
+
+    # Order by org name, then system name
+    return queryset.order_by('org__name', 'system_name')
+
+
+def export_querysets(params):
+    """
+    (systems, organizations) for export ``params`` outside a request.
+
+    ``org_scope`` is the value of cache.get_org_scope() for the user who
+    started the export: 'all', 'org<ID>' or 'none'.
+    """
+    systems = System.objects.filter(is_deleted=False)
+    organizations = Organization.objects.all()
+
+    scope = params.get('org_scope', 'none')
+    if scope != 'all':
+        org_id = int(scope[3:]) if scope.startswith('org') else None
+        systems = systems.filter(org_id=org_id) if org_id else systems.none()
+        organizations = organizations.filter(pk=org_id) if org_id else organizations.none()
+
+    if params.get('org'):
+        organizations = organizations.filter(pk=params['org'])
+    return filter_export_queryset(systems, params), organizations
+
+
+# ============================================================================
+# Flat NDJSON / CSV dumps (export_data?format=ndjson|csv)
+# ============================================================================
+
+FLAT_EXPORT_CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+def _flat_columns(model, prefix: str = '', exclude=()) -> List[str]:
+    return [
+        f'{prefix}{field.attname}'
+        for field in model._meta.concrete_fields
+        if field.name not in exclude
+    ]
+
+
+def flat_export_columns(fields=None, relations=None) -> List[str]:
+    """
+    Columns of the flat export, in output order.
+
+    System columns come first (foreign keys as ``org_id``, plus
+    ``org_name``), then every column of each one-to-one sub-model in
+    SYSTEM_DETAIL_ONE_TO_ONE, prefixed with the relation name, e.g.
+    ``architecture__backend_tech``.
+
+    Args:
+        fields / relations: As returned by serializers.parse_sparse_fieldset;
+            None keeps every System column / every relation
+
+    Raises:
+        ValidationError: ``fields`` names an unknown column
+    """
+    from rest_framework.exceptions import ValidationError
+    from .serializers import SYSTEM_DETAIL_ONE_TO_ONE
+
+    system_columns = _flat_columns(System, exclude=('is_deleted',)) + ['org_name']
+    one_to_one = [name for name in SYSTEM_DETAIL_ONE_TO_ONE if relations is None or name in relations]
+
+    if fields is not None:
+        unknown = set(fields) - set(system_columns) - set(SYSTEM_DETAIL_ONE_TO_ONE)
+        if unknown:
+            raise ValidationError({'fields': f"Trường không tồn tại: {', '.join(sorted(unknown))}"})
+        system_columns = [column for column in system_columns if column in fields]
+
+    columns = list(system_columns)
+    for name in one_to_one:
+        related_model = System._meta.get_field(name).related_model
+        columns += _flat_columns(related_model, prefix=f'{name}__', exclude=('id', 'system'))
+    return columns
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ''
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False, cls=DjangoJSONEncoder)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+class _Echo:
+    """File-like object whose write() returns the line for csv.writer"""
+
+    def write(self, value):
+        return value
+
+
+def stream_flat_export(queryset, export_format: str, columns: List[str],
+                       chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Yield the flat export of ``queryset`` line by line.
+
+    One query: one-to-one sub-models are LEFT JOINed by ``values()`` and the
+    rows are read with ``.iterator(chunk_size=...)`` (a server-side cursor on
+    PostgreSQL), so the first line is sent before the whole result is read
+    and memory does not grow with the number of systems.
+    """
+    expressions = {'org_name': F('org__name')} if 'org_name' in columns else {}
+    rows = (
+        queryset.select_related(None).prefetch_related(None)
+        .values(*[column for column in columns if column not in expressions], **expressions)
+        .iterator(chunk_size=chunk_size)
+    )
+
+    if export_format == 'csv':
+        writer = csv.writer(_Echo())
+        yield writer.writerow(columns)
+        for row in rows:
+            yield writer.writerow([_csv_value(row[column]) for column in columns])
+        return
+
+    for row in rows:
+        yield json.dumps({column: row[column] for column in columns},
+                         ensure_ascii=False, cls=DjangoJSONEncoder) + '\n'
+
+
+# ============================================================================
+# Background export jobs
+# ============================================================================
+
+def export_root() -> str:
+    return str(getattr(settings, 'EXPORT_ROOT', os.path.join(settings.BASE_DIR, 'exports')))
+
+
+def export_cache_key(export_format: str, params: Dict[str, Any]) -> str:
+    """
+    Artifact key: format + params + watermark of the exported systems.
+
+    The watermark (cache.data_watermark) combines the systems data version
+    with max(updated_at) and count, so any data change yields a new key.
+    """
+    systems, _organizations = export_querysets(params)
+    fingerprint, _last_modified = data_watermark(systems)
+    source = json.dumps(
+        {'format': export_format, 'params': params, 'data': fingerprint},
+        sort_keys=True,
+    )
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+
+def export_artifact_path(job: ExportJob) -> Optional[str]:
+    """Absolute path of the job's finished artifact, or None if it is gone"""
+    if not job.file_path:
+        return None
+    path = os.path.join(export_root(), job.file_path)
+    return path if os.path.exists(path) else None
+
+
+def fail_stale_jobs(cache_key: Optional[str] = None) -> int:
+    """
+    Mark jobs stuck in progress as failed.
+
+    A pending job not started within settings.EXPORT_JOB_TIMEOUT seconds
+    of its creation, or a running job not finished within it of its start,
+    was lost (worker killed, task dropped from the queue) and never gets a
+    finished_at otherwise.
+
+    Returns:
+        int: Number of jobs marked as failed
+    """
+    cutoff = timezone.now() - timedelta(seconds=getattr(settings, 'EXPORT_JOB_TIMEOUT', 45 * 60))
+    jobs = ExportJob.objects.filter(
+        Q(status='pending', created_at__lt=cutoff) | Q(status='running', started_at__lt=cutoff)
+    )
+    if cache_key is not None:
+        jobs = jobs.filter(cache_key=cache_key)
+    return jobs.update(status='failed', error='Quá thời gian xuất dữ liệu', finished_at=timezone.now())
+
+
+def find_reusable_job(cache_key: str) -> Optional[ExportJob]:
+    """
+    Latest job for ``cache_key`` that is still in progress or whose
+    artifact is still on disk. Stale jobs are failed first (fail_stale_jobs).
+    """
+    fail_stale_jobs(cache_key)
+    for job in ExportJob.objects.filter(cache_key=cache_key).exclude(status='failed')[:5]:
+        if job.status in ('pending', 'running') or export_artifact_path(job):
+            return job
+    return None
+
+
+def build_export_artifact(job: ExportJob, chunk_size: int = EXPORT_CHUNK_SIZE) -> ExportJob:
+    """
+    Write the artifact of ``job`` and record progress on the job row.
+
+    The workbook is written to a temporary file in EXPORT_ROOT and renamed
+    into place when complete, so a download never sees a partial file.
+    """
+    root = export_root()
+    os.makedirs(root, exist_ok=True)
+    file_name = f'{job.cache_key}.{job.export_format}'
+
+    job.status = 'running'
+    job.started_at = timezone.now()
+    job.save(update_fields=['status', 'started_at'])
+
+    def progress(rows_processed, rows_total):
+        ExportJob.objects.filter(pk=job.pk).update(rows_processed=rows_processed, rows_total=rows_total)
+
+    systems, organizations = export_querysets(job.params)
+    fd, tmp_path = tempfile.mkstemp(dir=root, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as output:
+            count = write_systems_workbook(
+                systems, output, organizations, chunk_size=chunk_size, progress=progress,
+            )
+        os.replace(tmp_path, os.path.join(root, file_name))
+    except Exception as e:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        logger.exception(f"Export job {job.pk} failed")
+        job.status = 'failed'
+        job.error = str(e)
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'error', 'finished_at'])
+        return job
+
+    job.status = 'success'
+    job.rows_processed = count
+    job.rows_total = count
+    job.file_path = file_name
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'rows_processed', 'rows_total', 'file_path', 'finished_at'])
+    return job
+
+
+def prune_export_artifacts(max_age: int) -> int:
+    """
+    Delete artifacts and finished jobs older than ``max_age`` seconds.
+
+    Stale jobs are failed first (fail_stale_jobs), so they get a
+    finished_at and are deleted in turn.
+
+    Returns:
+        int: Number of files deleted
+    """
+    fail_stale_jobs()
+    root = export_root()
+    cutoff = timezone.now() - timedelta(seconds=max_age)
+    ExportJob.objects.filter(finished_at__lt=cutoff).delete()
+
+    if not os.path.isdir(root):
+        return 0
+    deleted = 0
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        if os.path.isfile(path) and os.path.getmtime(path) < cutoff.timestamp():
+            os.remove(path)
+            deleted += 1
+    return deleted
@@ -0,0 +1,306 @@
+"""
+Declarative rule registry for the strategic dashboard insights.
+
+Each insight is a rule object declaring its predicate, severity thresholds
+and message templates. ``evaluate_insights`` runs every CountInsight
+predicate as one Flag of a single ``aggregate_buckets`` query, plus one
+grouped query per TopValuesInsight, then asks each rule to render itself.
+Adding a CountInsight therefore adds no database round-trip.
+
+Rules are plain objects: ``rule.evaluate(buckets)`` can be unit-tested with a
+hand-written dict, without HTTP or database.
+
+Templates are ``str.format`` strings. CountInsight fields: ``{count}``,
+``{pct}``; TopValuesInsight fields: ``{value}``, ``{count}``, ``{items}``.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from django.db.models import Count, Q
+
+from .aggregations import TOTAL, Flag, aggregate_buckets
+
+SEVERITY_ORDER = {'critical': 0, 'warning': 1, 'info': 2, 'success': 3}
+
+
+class CountInsight:
+    """
+    Insight about the number of systems matching ``condition``.
+
+    Reported only when at least one system matches. ``thresholds`` is a
+    sequence of ``(percentage, severity)``: the first entry whose percentage
+    is exceeded wins, otherwise ``severity`` applies.
+    """
+
+    def __init__(self, id: str, category: str, condition: Q, title: str,
+                 description: str, recommendation: str, filter: Dict[str, Any],
+                 severity: str = 'info', thresholds: Sequence[Tuple[float, str]] = (),
+                 with_percentage: bool = True):
+        self.id = id
+        self.category = category
+        self.condition = condition
+        self.title = title
+        self.description = description
+        self.recommendation = recommendation
+        self.filter = filter
+        self.severity = severity
+        self.thresholds = list(thresholds)
+        self.with_percentage = with_percentage
+
+    def spec(self) -> Flag:
+        return Flag(self.id, self.condition)
+
+    def get_severity(self, pct: float) -> str:
+        for threshold, severity in self.thresholds:
+            if pct > threshold:
+                return severity
+        return self.severity
+
+    def evaluate(self, buckets: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Args:
+            buckets: aggregate_buckets result with 'total' and ``self.id``
+
+        Returns:
+            dict: The insight, or None when no system matches
+        """
+        count = buckets[self.id]
+        if not count:
+            return None
+
+        pct = round(count / buckets['total'] * 100, 1)
+        metric = {'count': count, 'percentage': pct} if self.with_percentage else {'count': count}
+        return {
+            'id': self.id,
+            'category': self.category,
+            'severity': self.get_severity(pct),
+            'title': self.title.format(count=count, pct=pct),
+            'description': self.description.format(count=count, pct=pct),
+            'recommendation': self.recommendation,
+            'metric': metric,
+            'filter': self.filter,
+        }
+
+
+class TopValuesInsight:
+    """
+    Insight about the most common non-empty values of ``field``
+    (one grouped query, ``limit`` rows).
+    """
+
+    def __init__(self, id: str, category: str, field: str, title: str,
+                 description: str, recommendation: str, filter: Dict[str, Any],
+                 severity: str = 'info', limit: int = 5):
+        self.id = id
+        self.category = category
+        self.field = field
+        self.title = title
+        self.description = description
+        self.recommendation = recommendation
+        self.filter = filter
+        self.severity = severity
+        self.limit = limit
+
+    def fetch(self, queryset) -> List[Dict[str, Any]]:
+        """``[{<field>: value, 'count': n}, ...]`` most common first"""
+        return list(
+            queryset.exclude(Q(**{f'{self.field}__isnull': True}) | Q(**{self.field: ''}))
+            .values(self.field)
+            .annotate(count=Count('id'))
+            .order_by('-count')[:self.limit]
+        )
+
+    def evaluate(self, top: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Args:
+            top: fetch() result
+
+        Returns:
+            dict: The insight, or None when no system has a value
+        """
+        if not top:
+            return None
+
+        first = top[0]
+        items = ', '.join('{} ({})'.format(row[self.field], row['count']) for row in top)
+        fields = {'value': first[self.field], 'count': first['count'], 'items': items}
+        return {
+            'id': self.id,
+            'category': self.category,
+            'severity': self.severity,
+            'title': self.title.format(**fields),
+            'description': self.description.format(**fields),
+            'recommendation': self.recommendation,
+            'metric': {'top': top},
+            'filter': self.filter,
+        }
+
+
+# ============================================================================
+# Registry (declaration order = display order within a severity)
+# ============================================================================
+
+INSIGHT_RULES: List[Any] = [
+    # === DOCUMENTATION ===
+    CountInsight(
+        'no_design_docs', 'documentation',
+        Q(has_design_documents=False),
+        title='{count} hệ thống chưa có tài liệu thiết kế',
+        description='{pct}% hệ thống thiếu tài liệu thiết kế, ảnh hưởng đến khả năng bảo trì và nâng cấp.',
+        recommendation='Ưu tiên bổ sung tài liệu cho các hệ thống mức độ quan trọng cao.',
+        filter={'type': 'no_design_docs'},
+        thresholds=[(50, 'warning')],
+    ),
+    CountInsight(
+        'no_arch_diagram', 'documentation',
+        Q(architecture__has_architecture_diagram=False) | Q(architecture__isnull=True),
+        title='{count} hệ thống chưa có sơ đồ kiến trúc',
+        description='{pct}% hệ thống thiếu sơ đồ kiến trúc, gây khó khăn trong việc đánh giá và tích hợp.',
+        recommendation='Xây dựng sơ đồ kiến trúc cho các hệ thống core trước.',
+        filter={'type': 'no_arch_diagram'},
+        thresholds=[(70, 'warning')],
+    ),
+    # === DEVOPS ===
+    CountInsight(
+        'no_cicd', 'devops',
+        Q(architecture__has_cicd=False) | Q(architecture__isnull=True),
+        title='{count} hệ thống chưa có CI/CD',
+        description='{pct}% hệ thống triển khai thủ công, tăng rủi ro lỗi và thời gian release.',
+        recommendation='Triển khai CI/CD pipeline cho các hệ thống có tần suất release cao.',
+        filter={'type': 'no_cicd'},
+        thresholds=[(80, 'warning')],
+    ),
+    CountInsight(
+        'no_api_gateway', 'integration',
+        Q(integration__has_api_gateway=False) | Q(integration__isnull=True),
+        title='{count} hệ thống chưa có API Gateway',
+        description='{pct}% hệ thống thiếu API Gateway, khó kiểm soát và bảo mật API.',
+        recommendation='Triển khai API Gateway tập trung theo kiến trúc tổng thể.',
+        filter={'type': 'no_api_gateway'},
+        thresholds=[(70, 'warning')],
+    ),
+    # === INFRASTRUCTURE ===
+    CountInsight(
+        'on_premise', 'infrastructure',
+        Q(hosting_platform='on_premise'),
+        title='{count} hệ thống còn on-premise',
+        description='{pct}% hệ thống chạy on-premise. Theo lộ trình chuyển đổi số, cần đánh giá khả năng di chuyển lên Cloud.',
+        recommendation='Lập kế hoạch Cloud migration theo giai đoạn 1 (2026).',
+        filter={'type': 'hosting_platform', 'value': 'on_premise'},
+    ),
+    CountInsight(
+        'cloud_ready', 'infrastructure',
+        Q(hosting_platform='cloud'),
+        title='{count} hệ thống đã lên Cloud',
+        description='{pct}% hệ thống đã triển khai trên Cloud, đáp ứng định hướng kiến trúc hiện đại.',
+        recommendation='Tiếp tục mở rộng và tối ưu hóa chi phí Cloud.',
+        filter={'type': 'hosting_platform', 'value': 'cloud'},
+        severity='success',
+    ),
+    # === TECHNOLOGY ===
+    TopValuesInsight(
+        'tech_distribution', 'technology', 'programming_language',
+        title='Ngôn ngữ phổ biến nhất: {value} ({count} hệ thống)',
+        description='Top 5: {items}',
+        recommendation='Xem xét chuẩn hóa công nghệ để dễ bảo trì và tìm nhân sự.',
+        filter={'type': 'technology'},
+    ),
+    TopValuesInsight(
+        'database_distribution', 'technology', 'database_name',
+        title='Database phổ biến nhất: {value} ({count} hệ thống)',
+        description='Top 5: {items}',
+        recommendation='Đánh giá khả năng hợp nhất database để giảm chi phí vận hành.',
+        filter={'type': 'database'},
+    ),
+    # === SECURITY ===
+    CountInsight(
+        'no_encryption', 'security',
+        Q(has_encryption=False),
+        title='{count} hệ thống chưa mã hóa dữ liệu',
+        description='{pct}% hệ thống chưa mã hóa dữ liệu at-rest, tiềm ẩn rủi ro bảo mật.',
+        recommendation='Ưu tiên triển khai mã hóa cho các hệ thống xử lý dữ liệu nhạy cảm.',
+        filter={'type': 'no_encryption'},
+        severity='warning',
+        thresholds=[(50, 'critical')],
+    ),
+    # === ASSESSMENT ===
+    # Only a missing assessment row counts as "not assessed" here
+    CountInsight(
+        'not_assessed', 'assessment',
+        Q(assessment__isnull=True),
+        title='{count} hệ thống chưa được đánh giá',
+        description='{pct}% hệ thống chưa có kết quả assessment, không thể lập kế hoạch tối ưu.',
+        recommendation='Hoàn thiện đánh giá để có cơ sở lập lộ trình nâng cấp.',
+        filter={'type': 'recommendation', 'value': 'unknown'},
+        thresholds=[(50, 'warning')],
+    ),
+    CountInsight(
+        'needs_replace', 'assessment',
+        Q(assessment__recommendation='replace'),
+        title='{count} hệ thống cần thay thế',
+        description='Các hệ thống này được đánh giá cần thay thế do lỗi thời hoặc không đáp ứng yêu cầu.',
+        recommendation='Lập kế hoạch thay thế và chuyển đổi dữ liệu.',
+        filter={'type': 'recommendation', 'value': 'replace'},
+        severity='critical',
+        with_percentage=False,
+    ),
+    CountInsight(
+        'needs_upgrade', 'assessment',
+        Q(assessment__recommendation='upgrade'),
+        title='{count} hệ thống cần nâng cấp',
+        description='Các hệ thống này cần nâng cấp để cải thiện hiệu năng hoặc tính năng.',
+        recommendation='Lập kế hoạch nâng cấp theo thứ tự ưu tiên.',
+        filter={'type': 'recommendation', 'value': 'upgrade'},
+        severity='warning',
+        with_percentage=False,
+    ),
+]
+
+
+def insight_buckets(rules: Sequence[Any]) -> List[Any]:
+    """aggregate_buckets specs for every CountInsight of ``rules`` (plus the total)"""
+    return [TOTAL] + [rule.spec() for rule in rules if isinstance(rule, CountInsight)]
+
+
+# GET /api/systems/insights/ - one aggregate query for all count rules
+INSIGHTS_BUCKETS = insight_buckets(INSIGHT_RULES)
+
+
+def evaluate_insights(queryset, rules: Sequence[Any] = None) -> Dict[str, Any]:
+    """
+    Evaluate ``rules`` (default: INSIGHT_RULES) against ``queryset``.
+
+    Cost: one aggregate query for all CountInsight rules plus one grouped
+    query per TopValuesInsight, independent of the number of systems.
+
+    Returns:
+        dict: {'insights': [...sorted by severity...], 'summary': {...}, 'total_systems': N}
+    """
+    if rules is None:
+        rules, specs = INSIGHT_RULES, INSIGHTS_BUCKETS
+    else:
+        specs = insight_buckets(rules)
+
+    buckets = aggregate_buckets(queryset, specs)
+    total_systems = buckets['total']
+
+    insights = []
+    for rule in rules:
+        if isinstance(rule, CountInsight):
+            insight = rule.evaluate(buckets)
+        else:
+            insight = rule.evaluate(rule.fetch(queryset)) if total_systems else None
+        if insight is not None:
+            insights.append(insight)
+
+    # Stable sort: declaration order is kept within a severity
+    insights.sort(key=lambda x: SEVERITY_ORDER.get(x['severity'], 99))
+
+    summary = {'total_insights': len(insights)}
+    for severity in SEVERITY_ORDER:
+        summary[severity] = sum(1 for i in insights if i['severity'] == severity)
+
+    return {
+        'insights': insights,
+        'summary': summary,
+        'total_systems': total_systems,
+    }
@@ -0,0 +1,285 @@
+"""
+LLM gateway for the AI assistant and policy generation.
+
+- Clients are pooled per process (async clients per event loop), so HTTP
+  keep-alive and TLS sessions survive across phases and requests.
+- Each phase has a timeout budget (PHASE_TIMEOUTS): the provider must start
+  answering within it, retries, back-off and failover included.
+- Transient errors (connection, timeout, 429, 5xx) are retried a bounded
+  number of times with full-jitter exponential back-off.
+- Every provider has a circuit breaker. OpenAI is tried first; when it is
+  failing (retries exhausted or breaker open) the phase fails over to Claude.
+
+Usage:
+    llm = LLMStream(system_prompt, messages, timeout=PHASE_TIMEOUTS['sql'])
+    async for text in llm:
+        ...
+    llm.model  # model that answered
+"""
+import asyncio
+import logging
+import random
+import threading
+import time
+import weakref
+from typing import Dict, List, Optional
+
+import anthropic
+import httpx
+import openai
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+OPENAI = 'openai'
+CLAUDE = 'claude'
+
+MODELS = {
+    OPENAI: 'gpt-5.2',
+    CLAUDE: 'claude-sonnet-4-20250514',
+}
+
+# Seconds a phase may wait for the provider to start answering
+PHASE_TIMEOUTS = {
+    'sql': 45.0,     # SQL generation (quick mode: SQL + answer template)
+    'review': 30.0,  # SQL / consistency reviews
+    'report': 60.0,  # Deep-mode report
+}
+
+RETRYABLE_ERRORS = (
+    openai.APIConnectionError,  # Includes APITimeoutError
+    openai.RateLimitError,
+    openai.InternalServerError,
+    anthropic.APIConnectionError,
+    anthropic.RateLimitError,
+    anthropic.InternalServerError,
+    TimeoutError,
+)
+
+
+class LLMUnavailableError(Exception):
+    """No configured provider could answer within the phase budget."""
+
+
+# ========== Client pool ==========
+
+_sync_clients: Dict[tuple, object] = {}
+_async_clients = weakref.WeakKeyDictionary()  # event loop -> {key: client}
+_clients_lock = threading.Lock()
+
+
+def _provider_settings(provider: str):
+    if provider == OPENAI:
+        return getattr(settings, 'OPENAI_API_KEY', None), getattr(settings, 'OPENAI_BASE_URL', None)
+    api_key = getattr(settings, 'CLAUDE_API_KEY', None) or getattr(settings, 'ANTHROPIC_API_KEY', None)
+    return api_key, getattr(settings, 'CLAUDE_BASE_URL', None)
+
+
+def _get_client(provider: str, api_key: Optional[str], asynchronous: bool):
+    default_key, base_url = _provider_settings(provider)
+    api_key = api_key or default_key
+    key = (provider, api_key, base_url)
+
+    if asynchronous:
+        pool = _async_clients.setdefault(asyncio.get_running_loop(), {})
+    else:
+        pool = _sync_clients
+
+    with _clients_lock:
+        client = pool.get(key)
+        if client is None:
+            if provider == OPENAI:
+                client_class = openai.AsyncOpenAI if asynchronous else openai.OpenAI
+            else:
+                client_class = anthropic.AsyncAnthropic if asynchronous else anthropic.Anthropic
+            client = client_class(
+                api_key=api_key,
+                base_url=base_url,
+                timeout=httpx.Timeout(60.0, connect=getattr(settings, 'LLM_CONNECT_TIMEOUT', 5.0)),
+                max_retries=getattr(settings, 'LLM_MAX_RETRIES', 2),
+            )
+            pool[key] = client
+    return client
+
+
+def get_openai_client(api_key: Optional[str] = None, asynchronous: bool = False):
+    """Pooled OpenAI client (SDK retries enabled); never close it."""
+    return _get_client(OPENAI, api_key, asynchronous)
+
+
+def get_claude_client(api_key: Optional[str] = None, asynchronous: bool = False):
+    """Pooled Anthropic client (SDK retries enabled); never close it."""
+    return _get_client(CLAUDE, api_key, asynchronous)
+
+
+def configured_providers() -> List[str]:
+    """Providers with an API key, in failover order."""
+    return [provider for provider in (OPENAI, CLAUDE) if _provider_settings(provider)[0]]
+
+
+# ========== Circuit breaker ==========
+
+class CircuitBreaker:
+    """
+    Closed until ``LLM_BREAKER_THRESHOLD`` consecutive failures, then open
+    (calls are skipped) for ``LLM_BREAKER_COOLDOWN`` seconds, after which
+    one trial call is let through: success closes it, failure re-opens it.
+    """
+
+    def __init__(self, provider: str):
+        self.provider = provider
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < getattr(settings, 'LLM_BREAKER_COOLDOWN', 30):
+                return False
+            self.opened_at = time.monotonic()  # Half-open: this call is the trial
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.failures >= getattr(settings, 'LLM_BREAKER_THRESHOLD', 5):
+                if self.opened_at is None:
+                    logger.warning(f"LLM circuit breaker opened for {self.provider} after {self.failures} failures")
+                self.opened_at = time.monotonic()
+
+
+breakers = {provider: CircuitBreaker(provider) for provider in (OPENAI, CLAUDE)}
+
+
+def reset_circuit_breakers() -> None:
+    for breaker in breakers.values():
+        breaker.record_success()
+
+
+def retry_delay(attempt: int) -> float:
+    """Full-jitter exponential back-off before retry number ``attempt`` (0-based)."""
+    return random.uniform(0, getattr(settings, 'LLM_RETRY_BASE_DELAY', 0.5) * 2 ** attempt)
+
+
+# ========== Streaming completion ==========
+
+class LLMStream:
+    """
+    Async iterator over the completion text of one phase.
+
+    ``provider`` and ``model`` tell who answered once text started flowing.
+    Errors after the first chunk are raised as is (text already sent cannot
+    be replayed); LLMUnavailableError means no provider started in time.
+    """
+
+    def __init__(self, system_prompt: str, messages: List[Dict], timeout: float = PHASE_TIMEOUTS['sql'],
+                 effort: str = 'low', max_output_tokens: int = 8192, max_tokens: int = 4096):
+        self.system_prompt = system_prompt
+        self.messages = messages
+        self.timeout = timeout
+        self.effort = effort
+        self.max_output_tokens = max_output_tokens  # OpenAI (reasoning included)
+        self.max_tokens = max_tokens  # Claude
+        self.provider = None
+        self.model = None
+
+    def __aiter__(self):
+        return self._stream()
+
+    async def _stream(self):
+        deadline = time.monotonic() + self.timeout
+        providers = [provider for provider in configured_providers() if breakers[provider].allow()]
+        if not providers:
+            raise LLMUnavailableError('AI service not configured or all providers are failing')
+
+        last_error = None
+        for index, provider in enumerate(providers):
+            breaker = breakers[provider]
+            # Leave a fair share of the budget to the providers after this one
+            provider_deadline = time.monotonic() + (deadline - time.monotonic()) / (len(providers) - index)
+            max_retries = getattr(settings, 'LLM_MAX_RETRIES', 2)
+
+            for attempt in range(max_retries + 1):
+                remaining = provider_deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    chunks = await self._open(provider, remaining)
+                except RETRYABLE_ERRORS as e:
+                    last_error = e
+                    breaker.record_failure()
+                    logger.warning(f"LLM {provider} attempt {attempt + 1} failed: {e!r}")
+                    if attempt < max_retries:
+                        await asyncio.sleep(min(retry_delay(attempt), max(provider_deadline - time.monotonic(), 0)))
+                    continue
+
+                self.provider, self.model = provider, MODELS[provider]
+                try:
+                    async for text in chunks:
+                        yield text
+                except RETRYABLE_ERRORS:
+                    breaker.record_failure()
+                    raise
+                finally:
+                    await chunks.aclose()
+                breaker.record_success()
+                return
+
+            if index + 1 < len(providers):
+                logger.warning(f"LLM failing over from {provider} to {providers[index + 1]}")
+
+        raise LLMUnavailableError(f'No LLM provider answered within {self.timeout:.0f}s: {last_error!r}')
+
+    async def _open(self, provider: str, remaining: float):
+        """Send the request; returns the text chunks once the response has started."""
+        options = {
+            'max_retries': 0,  # Retries are ours, bounded by the phase budget
+            'timeout': httpx.Timeout(self.timeout, connect=min(getattr(settings, 'LLM_CONNECT_TIMEOUT', 5.0), remaining)),
+        }
+
+        if provider == OPENAI:
+            client = get_openai_client(asynchronous=True).with_options(**options)
+            async with asyncio.timeout(remaining):
+                stream = await client.responses.create(
+                    model=MODELS[OPENAI],
+                    reasoning={'effort': self.effort},
+                    input=[{'role': 'developer', 'content': self.system_prompt}, *self.messages],
+                    max_output_tokens=self.max_output_tokens,
+                    stream=True,
+                )
+            return self._openai_text(stream)
+
+        client = get_claude_client(asynchronous=True).with_options(**options)
+        manager = client.messages.stream(
+            model=MODELS[CLAUDE],
+            max_tokens=self.max_tokens,
+            system=self.system_prompt,
+            messages=self.messages,
+        )
+        async with asyncio.timeout(remaining):
+            stream = await manager.__aenter__()
+        return self._claude_text(manager, stream)
+
+    @staticmethod
+    async def _openai_text(stream):
+        try:
+            async for event in stream:
+                if event.type == 'response.output_text.delta':
+                    yield event.delta
+        finally:
+            await stream.close()  # Hands the connection back to the pool
+
+    @staticmethod
+    async def _claude_text(manager, stream):
+        try:
+            async for text in stream.text_stream:
+                yield text
+        finally:
+            await manager.__aexit__(None, None, None)
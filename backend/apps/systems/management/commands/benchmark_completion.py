@@ -0,0 +1,174 @@
+"""
+Django management command to benchmark the completion calculators.
+
+Compares calculate_system_completion_percentage() (one call per model
+instance, relations select_related) with compute_completion_batch()
+(values_list rows scored by a compiled column plan) on synthetic systems
+with randomly filled fields. Data is created inside a transaction that is
+rolled back, so the command is safe to run against a development database.
+
+Usage:
+    python manage.py benchmark_completion
+    python manage.py benchmark_completion --sizes 1000 10000 50000 --repeat 3
+"""
+import random
+import time
+from datetime import date
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models, transaction
+
+from apps.organizations.models import Organization
+from apps.systems.models import (
+    System,
+    SystemArchitecture,
+    SystemAssessment,
+    SystemDataInfo,
+    SystemOperations,
+)
+from apps.systems.utils import (
+    calculate_system_completion_percentage,
+    compute_completion_batch,
+    get_completion_plan,
+    COMPLETION_RELATED_FIELDS,
+)
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _random_value(field, rng):
+    """A random value for a model field, biased towards the filled/empty edge cases"""
+    candidates = [None] if field.null else []
+
+    if field.choices:
+        candidates += [value for value, _label in field.choices]
+        if isinstance(field, (models.CharField, models.TextField)):
+            candidates += ['', '   ']
+    elif isinstance(field, models.EmailField):
+        candidates += ['', 'it@mst.gov.vn']
+    elif isinstance(field, (models.CharField, models.TextField)):
+        candidates += ['', '   ', ' \t\n', 'Giá trị', 'cloud']
+    elif isinstance(field, models.JSONField):
+        candidates += [[], {}, ['a'], [''], {'k': 'v'}, '', ' \n', 'text', 0, False]
+    elif isinstance(field, models.BooleanField):
+        candidates += [True, False]
+    elif isinstance(field, models.DecimalField):
+        candidates += [Decimal('0'), Decimal('12.50')]
+    elif isinstance(field, models.IntegerField):
+        candidates += [0, 42]
+    elif isinstance(field, models.DateField):
+        candidates += [date(2024, 1, 15)]
+    else:
+        return None
+
+    return rng.choice(candidates)
+
+
+def _random_fields(model, lookups, rng):
+    values = {}
+    for lookup in lookups:
+        field = model._meta.get_field(lookup)
+        if field.is_relation:
+            continue
+        value = _random_value(field, rng)
+        if value is None and not field.null:
+            continue
+        values[field.attname] = value
+    return values
+
+
+def build_random_systems(org, count, seed=0, batch_size=2000):
+    """
+    Bulk-create ``count`` systems (and ~half of each completion relation)
+    with every field read by the completion rules randomly filled or empty.
+
+    Bulk creation bypasses signals, so stored completion is left stale.
+
+    Returns:
+        list: Primary keys of the created systems
+    """
+    rng = random.Random(seed)
+    plan = get_completion_plan()
+
+    # Lookups read by the rules, grouped by the model that holds them
+    fields_by_relation = {relation: [] for relation in ('',) + COMPLETION_RELATED_FIELDS}
+    for lookup in plan.columns[1:]:
+        relation, _sep, field_name = lookup.rpartition('__')
+        fields_by_relation[relation].append(field_name)
+
+    related_models = {
+        'architecture': SystemArchitecture,
+        'data_info': SystemDataInfo,
+        'operations': SystemOperations,
+        'assessment': SystemAssessment,
+    }
+
+    system_ids = []
+    for start in range(0, count, batch_size):
+        systems = []
+        for index in range(start, min(start + batch_size, count)):
+            values = _random_fields(System, fields_by_relation[''], rng)
+            values.setdefault('system_name', f'Benchmark {index}')
+            values['system_code'] = f'BENCH-{index}'
+            systems.append(System(org=org, **values))
+        systems = System.objects.bulk_create(systems)
+        system_ids.extend(system.pk for system in systems)
+
+        for relation, model in related_models.items():
+            model.objects.bulk_create([
+                model(system=system, **_random_fields(model, fields_by_relation[relation], rng))
+                for system in systems
+                if rng.random() < 0.5
+            ])
+
+    return system_ids
+
+
+class Command(BaseCommand):
+    help = 'Benchmark per-instance vs batch completion percentage calculation'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000],
+                            help='Number of systems per run (default: 1000 10000 50000)')
+        parser.add_argument('--repeat', type=int, default=1,
+                            help='Timed repetitions per size; the best run is reported')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'{"systems":>8}  {"per-instance (s)":>16}  {"batch (s)":>10}  {"speedup":>8}')
+        for size in options['sizes']:
+            try:
+                with transaction.atomic():
+                    self._run(size, options['repeat'], options['seed'])
+                    raise _Rollback
+            except _Rollback:
+                pass
+
+    def _run(self, size, repeat, seed):
+        org = Organization.objects.create(name=f'Benchmark {size}', code=f'BENCH{size}')
+        build_random_systems(org, size, seed=seed)
+        queryset = System.objects.filter(org=org)
+
+        instance_time, batch_time = float('inf'), float('inf')
+        for _ in range(repeat):
+            started = time.perf_counter()
+            expected = {
+                system.pk: calculate_system_completion_percentage(system)
+                for system in queryset.select_related(*COMPLETION_RELATED_FIELDS).iterator(chunk_size=2000)
+            }
+            instance_time = min(instance_time, time.perf_counter() - started)
+
+            started = time.perf_counter()
+            actual = compute_completion_batch(queryset)
+            batch_time = min(batch_time, time.perf_counter() - started)
+
+        if actual != expected:
+            mismatched = [pk for pk in expected if expected[pk] != actual.get(pk)]
+            raise CommandError(f'Batch results differ for {len(mismatched)} systems, e.g. {mismatched[:5]}')
+
+        self.stdout.write(
+            f'{size:>8}  {instance_time:>16.3f}  {batch_time:>10.3f}  {instance_time / batch_time:>7.1f}x'
+        )
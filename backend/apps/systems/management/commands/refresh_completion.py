@@ -0,0 +1,94 @@
+"""
+Django management command to backfill and verify stored completion data.
+
+System.completion_percentage / completion_status and the roadmap maturity
+fields (roadmap_score / roadmap_phase / roadmap_improvements) are maintained
+by signals on every save. Bulk writes (queryset.update, raw SQL, restores) bypass signals,
+so run this command after such operations or to check for drift.
+
+Usage:
+    python manage.py refresh_completion            # recompute and store
+    python manage.py refresh_completion --verify   # report drift, no writes
+    python manage.py refresh_completion --org 5
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.systems.models import System
+from apps.systems.utils import (
+    COMPLETION_RELATED_FIELDS,
+    ROADMAP_RELATED_FIELDS,
+    calculate_roadmap_maturity,
+    get_completion_snapshot,
+)
+
+
+class Command(BaseCommand):
+    help = 'Backfill and verify stored completion percentage and roadmap maturity of systems'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verify', action='store_true',
+                            help='Only compare stored values with recomputed ones (no writes)')
+        parser.add_argument('--org', type=int, help='Limit to one organization ID')
+        parser.add_argument('--include-deleted', action='store_true',
+                            help='Also process soft-deleted systems')
+        parser.add_argument('--chunk-size', type=int, default=500,
+                            help='Rows fetched per database round-trip (default: 500)')
+
+    def handle(self, *args, **options):
+        queryset = System.objects.select_related(
+            *COMPLETION_RELATED_FIELDS, *ROADMAP_RELATED_FIELDS
+        ).order_by('pk')
+        if not options['include_deleted']:
+            queryset = queryset.filter(is_deleted=False)
+        if options['org']:
+            queryset = queryset.filter(org_id=options['org'])
+
+        verify = options['verify']
+        checked = 0
+        mismatched = []
+
+        for system in queryset.iterator(chunk_size=options['chunk_size']):
+            checked += 1
+            snapshot = get_completion_snapshot(system)
+            maturity = calculate_roadmap_maturity(system)
+
+            if (system.completion_percentage == snapshot['percentage']
+                    and system.completion_status == snapshot['status']
+                    and system.roadmap_score == maturity['score']
+                    and system.roadmap_phase == maturity['phase']
+                    and system.roadmap_improvements == maturity['improvements']):
+                continue
+
+            mismatched.append((
+                system.pk,
+                (system.completion_percentage, system.roadmap_score, system.roadmap_phase),
+                (snapshot['percentage'], maturity['score'], maturity['phase']),
+            ))
+            if not verify:
+                System.objects.filter(pk=system.pk).update(
+                    completion_percentage=snapshot['percentage'],
+                    completion_status=snapshot['status'],
+                    roadmap_score=maturity['score'],
+                    roadmap_phase=maturity['phase'],
+                    roadmap_improvements=maturity['improvements'],
+                )
+
+        for system_id, stored, expected in mismatched[:50]:
+            self.stdout.write(
+                f'  System {system_id}: stored {stored[0]}% / score {stored[1]} / phase {stored[2]}'
+                f' → computed {expected[0]}% / score {expected[1]} / phase {expected[2]}'
+            )
+        if len(mismatched) > 50:
+            self.stdout.write(f'  ... and {len(mismatched) - 50} more')
+
+        if verify:
+            if mismatched:
+                raise CommandError(
+                    f'{len(mismatched)}/{checked} systems have stale completion or roadmap data. '
+                    f'Run "python manage.py refresh_completion" to fix.'
+                )
+            self.stdout.write(self.style.SUCCESS(f'All {checked} systems are up to date'))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'Checked {checked} systems, updated {len(mismatched)}'
+            ))
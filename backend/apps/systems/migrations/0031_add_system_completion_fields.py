@@ -0,0 +1,181 @@
+# Generated manually - Persist completion percentage on System
+
+from django.db import migrations, models
+
+
+# Frozen copy of the completion rules in utils.py at the time of this
+# migration: later changes to utils.py must not change what it computes.
+REQUIRED_FIELDS_MAP = {
+    'tab1': ['org', 'system_name', 'system_name_en', 'purpose', 'status', 'criticality_level', 'scope', 'system_group'],
+    'tab2': ['business_objectives', 'business_processes', 'user_types', 'annual_users'],
+    'tab3': ['programming_language', 'framework', 'database_name', 'hosting_platform', 'architecture_type', 'backend_tech', 'frontend_tech', 'mobile_app'],
+    'tab4': ['data_sources', 'data_types', 'data_classification_type', 'data_volume', 'storage_size_gb', 'file_storage_size_gb', 'growth_rate_percent', 'file_storage_type', 'record_count', 'secondary_databases'],
+    'tab5': ['data_exchange_method'],
+    'tab6': ['authentication_method', 'has_encryption', 'has_audit_log', 'security_level'],
+    'tab7': ['server_configuration', 'backup_plan', 'storage_capacity', 'disaster_recovery_plan'],
+    'tab8': ['business_owner', 'technical_owner', 'responsible_phone', 'responsible_email', 'support_level', 'users_mau', 'users_dau'],
+    'tab9': ['integration_readiness', 'blockers'],
+}
+CONDITIONAL_FIELDS_MAP = {
+    'cloud_provider': 'hosting_type',
+    'cicd_tool': 'has_cicd',
+    'automated_testing_tools': 'has_automated_testing',
+    'layered_architecture_details': 'has_layered_architecture',
+    'data_catalog_notes': 'has_data_catalog',
+    'mdm_notes': 'has_mdm',
+}
+RELATION_FIELDS = {
+    'tab3': ('architecture', ['architecture_type', 'architecture_description', 'backend_tech', 'frontend_tech', 'mobile_app', 'database_type', 'database_model', 'hosting_type']),
+    'tab4': ('data_info', ['storage_size_gb', 'file_storage_size_gb', 'growth_rate_percent', 'file_storage_type', 'record_count', 'secondary_databases', 'data_types']),
+    'tab8': ('operations', ['support_level']),
+}
+RELATED_FIELDS = ('architecture', 'data_info', 'operations', 'assessment')
+
+
+def is_filled(value):
+    if value is None:
+        return False
+    if isinstance(value, str):
+        return bool(value.strip())
+    if isinstance(value, (list, dict)):
+        return len(value) > 0
+    return True
+
+
+def percentage(filled, required):
+    if required == 0:
+        return 100.0
+    return round((filled / required) * 100.0, 1)
+
+
+def field_value(system, tab_key, field_name):
+    if field_name == 'org':
+        return system.org_id
+    if tab_key == 'tab9':
+        owner = getattr(system, 'assessment', None)
+    elif field_name in RELATION_FIELDS.get(tab_key, (None, []))[1]:
+        owner = getattr(system, RELATION_FIELDS[tab_key][0], None)
+    else:
+        owner = system
+    return getattr(owner, field_name, None) if owner is not None else None
+
+
+def completion_snapshot(system):
+    """{'percentage', 'status'} as stored on System"""
+    tabs = {}
+    incomplete = []
+    filled = required = 0
+
+    for tab_key, field_names in REQUIRED_FIELDS_MAP.items():
+        tab_filled = 0
+        for field_name in field_names:
+            if is_filled(field_value(system, tab_key, field_name)):
+                tab_filled += 1
+            else:
+                incomplete.append(field_name)
+        tab_required = len(field_names)
+        required += tab_required
+        filled += tab_filled
+
+        if tab_key == 'tab1' and system.is_go_live is not None:
+            tab_required += 1
+            tab_filled += 1
+            if system.is_go_live is True:
+                tab_required += 1
+                tab_filled += is_filled(system.go_live_date)
+        tabs[tab_key] = {
+            'required': tab_required,
+            'filled': tab_filled,
+            'percentage': percentage(tab_filled, tab_required),
+            'complete': tab_filled == tab_required and tab_required > 0,
+        }
+
+    conditional_required = 0
+    for field_name, condition_field in CONDITIONAL_FIELDS_MAP.items():
+        if field_name == 'cloud_provider':
+            architecture = getattr(system, 'architecture', None)
+            if architecture is not None and architecture.hosting_type == 'cloud':
+                required += 1
+                if is_filled(architecture.cloud_provider):
+                    filled += 1
+                else:
+                    incomplete.append(field_name)
+            continue
+        if getattr(system, condition_field, False) is True:
+            required += 1
+            if is_filled(getattr(system, field_name, None)):
+                filled += 1
+            else:
+                incomplete.append(field_name)
+        # Reported total counts the condition on System itself (truthy)
+        if getattr(system, condition_field, False):
+            conditional_required += 1
+
+    if system.is_go_live is not None:
+        required += 1
+        filled += 1
+        if system.is_go_live is True:
+            required += 1
+            if is_filled(system.go_live_date):
+                filled += 1
+            else:
+                incomplete.append('go_live_date')
+
+    total_required = sum(len(fields) for fields in REQUIRED_FIELDS_MAP.values()) + conditional_required
+    return {
+        'percentage': percentage(filled, required),
+        'status': {
+            'tabs': tabs,
+            'incomplete_fields': incomplete,
+            'total_required_fields': total_required,
+            'filled_fields': total_required - len(incomplete),
+        },
+    }
+
+
+def backfill_completion(apps, schema_editor):
+    """Compute completion for existing systems"""
+    System = apps.get_model('systems', 'System')
+    for system in System.objects.select_related(*RELATED_FIELDS).iterator(chunk_size=500):
+        snapshot = completion_snapshot(system)
+        System.objects.filter(pk=system.pk).update(
+            completion_percentage=snapshot['percentage'],
+            completion_status=snapshot['status'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('systems', '0030_add_policy_generated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='system',
+            name='completion_percentage',
+            field=models.FloatField(
+                db_index=True,
+                default=0.0,
+                editable=False,
+                help_text='Tỷ lệ hoàn thành (%) - tự động tính khi lưu hệ thống',
+                verbose_name='Completion Percentage'
+            ),
+        ),
+        migrations.AddField(
+            model_name='system',
+            name='completion_status',
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text='Per-tab completion status, incomplete fields and filled/required counts',
+                verbose_name='Completion Status'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='system',
+            index=models.Index(fields=['org', 'completion_percentage'], name='systems_org_id_c108ef_idx'),
+        ),
+        migrations.RunPython(backfill_completion, migrations.RunPython.noop),
+    ]
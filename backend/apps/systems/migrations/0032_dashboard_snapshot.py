@@ -0,0 +1,31 @@
+# Generated manually - Materialized strategic dashboard snapshots
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('systems', '0031_add_system_completion_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('section', models.CharField(help_text='Strategic dashboard action name, e.g. strategic_stats', max_length=50, unique=True, verbose_name='Section')),
+                ('data', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='Response payload of the section', verbose_name='Data')),
+                ('data_version', models.BigIntegerField(default=0, help_text='Dashboard data version the payload was computed from', verbose_name='Data Version')),
+                ('generated_at', models.DateTimeField(verbose_name='Generated At')),
+                ('duration_ms', models.IntegerField(default=0, verbose_name='Duration (ms)')),
+            ],
+            options={
+                'verbose_name': 'Dashboard Snapshot',
+                'verbose_name_plural': 'Dashboard Snapshots',
+                'db_table': 'dashboard_snapshots',
+                'ordering': ['section'],
+            },
+        ),
+    ]
@@ -0,0 +1,104 @@
+# Generated manually - Persist roadmap maturity score and phase on System
+
+from django.db import migrations, models
+
+
+# Frozen copy of utils.ROADMAP_CRITERIA at the time of this migration:
+# (phase, action, detail, relation or None, boolean field, points)
+ROADMAP_CRITERIA = [
+    (1, 'API Gateway', 'Triển khai API Gateway tập trung', 'integration', 'has_api_gateway', 15),
+    (1, 'Data Encryption', 'Triển khai mã hóa dữ liệu', None, 'has_encryption', 10),
+    (2, 'CI/CD Pipeline', 'Triển khai CI/CD tự động', 'architecture', 'has_cicd', 15),
+    (2, 'Documentation', 'Hoàn thiện tài liệu thiết kế', None, 'has_design_documents', 10),
+    (2, 'Architecture Diagram', 'Xây dựng sơ đồ kiến trúc', 'architecture', 'has_architecture_diagram', 10),
+    (2, 'Observability', 'Triển khai Monitoring & Logging', None, 'has_audit_log', 10),
+    (3, 'Data Encryption', 'Mã hóa dữ liệu at-rest', 'security', 'has_data_encryption_at_rest', 10),
+]
+HOSTING_POINTS = {'cloud': 20, 'hybrid': 10}
+
+
+def roadmap_maturity(system):
+    """{'score', 'phase', 'improvements'} as stored on System"""
+    score = HOSTING_POINTS.get(system.hosting_platform, 0)
+    improvements = [] if score else [{'phase': 1, 'action': 'Cloud Migration', 'detail': 'Di chuyển lên Cloud hoặc Hybrid'}]
+
+    for phase, action, detail, relation, field, points in ROADMAP_CRITERIA:
+        owner = getattr(system, relation, None) if relation else system
+        if owner is not None and getattr(owner, field):
+            score += points
+        else:
+            improvements.append({'phase': phase, 'action': action, 'detail': detail})
+
+    return {
+        'score': score,
+        'phase': min((i['phase'] for i in improvements), default=4),
+        'improvements': improvements,
+    }
+
+
+def backfill_roadmap(apps, schema_editor):
+    """Score existing systems"""
+    System = apps.get_model('systems', 'System')
+    for system in System.objects.select_related('architecture', 'integration', 'security').iterator(chunk_size=500):
+        maturity = roadmap_maturity(system)
+        System.objects.filter(pk=system.pk).update(
+            roadmap_score=maturity['score'],
+            roadmap_phase=maturity['phase'],
+            roadmap_improvements=maturity['improvements'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('systems', '0032_dashboard_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='system',
+            name='roadmap_score',
+            field=models.PositiveSmallIntegerField(
+                default=0,
+                editable=False,
+                help_text='Điểm trưởng thành chuyển đổi số (0-100) - tự động tính khi lưu hệ thống',
+                verbose_name='Roadmap Maturity Score'
+            ),
+        ),
+        migrations.AddField(
+            model_name='system',
+            name='roadmap_phase',
+            field=models.PositiveSmallIntegerField(
+                choices=[
+                    (1, 'Giai đoạn 1: Xây móng'),
+                    (2, 'Giai đoạn 2: Chuẩn hóa'),
+                    (3, 'Giai đoạn 3: Tối ưu hóa'),
+                    (4, 'Hoàn thành'),
+                ],
+                default=1,
+                editable=False,
+                help_text='Giai đoạn lộ trình cần thực hiện tiếp theo (4 = hoàn thành)',
+                verbose_name='Roadmap Phase'
+            ),
+        ),
+        migrations.AddField(
+            model_name='system',
+            name='roadmap_improvements',
+            field=models.JSONField(
+                blank=True,
+                default=list,
+                editable=False,
+                help_text='Improvements still needed: [{phase, action, detail}]',
+                verbose_name='Roadmap Improvements'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='system',
+            index=models.Index(fields=['roadmap_phase', 'roadmap_score'], name='systems_roadmap_827bda_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='system',
+            index=models.Index(fields=['org', 'roadmap_phase'], name='systems_org_id_85ac29_idx'),
+        ),
+        migrations.RunPython(backfill_roadmap, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated manually - Background export jobs
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('systems', '0033_add_system_roadmap_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('export_format', models.CharField(choices=[('xlsx', 'Excel (.xlsx)')], default='xlsx', max_length=10, verbose_name='Format')),
+                ('params', models.JSONField(default=dict, help_text='Filters (search, org, status) and org_scope of the requesting user', verbose_name='Parameters')),
+                ('cache_key', models.CharField(db_index=True, max_length=64, verbose_name='Cache Key')),
+                ('status', models.CharField(choices=[('pending', 'Đang chờ'), ('running', 'Đang xuất'), ('success', 'Hoàn thành'), ('failed', 'Lỗi')], default='pending', max_length=20, verbose_name='Status')),
+                ('rows_processed', models.IntegerField(default=0, verbose_name='Rows Processed')),
+                ('rows_total', models.IntegerField(blank=True, null=True, verbose_name='Rows Total')),
+                ('file_path', models.CharField(blank=True, help_text='Artifact path relative to settings.EXPORT_ROOT', max_length=500, verbose_name='File Path')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+                ('task_id', models.CharField(blank=True, max_length=255, verbose_name='Task ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Started At')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Finished At')),
+                ('user', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='export_jobs', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Export Job',
+                'verbose_name_plural': 'Export Jobs',
+                'db_table': 'export_jobs',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated manually - Per-(org, year) system code counters
+
+import re
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+CODE_PATTERN = re.compile(r'^SYS-.+-(\d{4})-(\d+)$')
+
+
+def seed_counters(apps, schema_editor):
+    """Start every (org, year) counter at the highest number already used"""
+    System = apps.get_model('systems', 'System')
+    SystemCodeCounter = apps.get_model('systems', 'SystemCodeCounter')
+
+    last_numbers = defaultdict(int)
+    codes = System.objects.exclude(system_code='').values_list('org_id', 'system_code')
+    for org_id, code in codes.iterator(chunk_size=2000):
+        match = CODE_PATTERN.match(code or '')
+        if match:
+            key = (org_id, int(match.group(1)))
+            last_numbers[key] = max(last_numbers[key], int(match.group(2)))
+
+    SystemCodeCounter.objects.bulk_create([
+        SystemCodeCounter(org_id=org_id, year=year, last_number=number)
+        for (org_id, year), number in last_numbers.items()
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0001_initial'),
+        ('systems', '0034_export_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SystemCodeCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveIntegerField(verbose_name='Year')),
+                ('last_number', models.PositiveIntegerField(default=0, verbose_name='Last Number')),
+                ('org', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='system_code_counters', to='organizations.organization', verbose_name='Organization')),
+            ],
+            options={
+                'verbose_name': 'System Code Counter',
+                'verbose_name_plural': 'System Code Counters',
+                'db_table': 'system_code_counters',
+                'unique_together': {('org', 'year')},
+            },
+        ),
+        migrations.RunPython(seed_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated manually - Drop the unused DashboardSnapshot.data_version
+# (refresh_snapshots bumps the data version instead)
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('systems', '0035_system_code_counter'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='dashboardsnapshot',
+            name='data_version',
+        ),
+    ]
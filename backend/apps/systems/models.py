@@ -1,7 +1,56 @@
-from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, models, transaction
+from django.db.models import Case, CharField, F, Q, Value, When
 from django.utils.translation import gettext_lazy as _
 
 
+# Assessment recommendations that dashboards report as their own bucket.
+# Anything else (no assessment row, empty, 'other', custom text) is 'unknown'.
+RECOMMENDATION_BUCKETS = ['keep', 'upgrade', 'replace', 'merge']
+
+
+def recommendation_bucket_q(bucket):
+    """
+    Q object selecting systems whose assessment falls into ``bucket``.
+
+    'unknown' matches systems without an assessment row as well as those whose
+    recommendation is not one of RECOMMENDATION_BUCKETS. Any other value is
+    matched literally against assessment.recommendation.
+    """
+    if bucket == 'unknown':
+        return Q(assessment__isnull=True) | ~Q(assessment__recommendation__in=RECOMMENDATION_BUCKETS)
+    return Q(assessment__recommendation=bucket)
+
+
+class SystemQuerySet(models.QuerySet):
+    """QuerySet helpers shared by dashboard endpoints"""
+
+    def with_recommendation_bucket(self):
+        """Annotate each system with ``recommendation_bucket`` computed in SQL"""
+        return self.annotate(
+            recommendation_bucket=Case(
+                When(
+                    assessment__recommendation__in=RECOMMENDATION_BUCKETS,
+                    then=F('assessment__recommendation'),
+                ),
+                default=Value('unknown'),
+                output_field=CharField(),
+            )
+        )
+
+    def in_recommendation_bucket(self, bucket):
+        """Filter systems by recommendation bucket (see recommendation_bucket_q)"""
+        return self.filter(recommendation_bucket_q(bucket))
+
+    def with_completion(self, name='completion'):
+        """
+        Annotate each system with its completion percentage computed in SQL
+        from the current field values (see utils.completion_expression)
+        """
+        from .utils import completion_expression
+        return self.annotate(**{name: completion_expression(self.model)})
+
+
 class System(models.Model):
     """Hệ thống/Ứng dụng - Core entity"""
 
@@ -378,6 +427,52 @@ class System(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Completion tracking - maintained by signals (see utils.refresh_system_completion)
+    # Backfill/verify: python manage.py refresh_completion [--verify]
+    completion_percentage = models.FloatField(
+        default=0.0,
+        db_index=True,
+        editable=False,
+        verbose_name=_('Completion Percentage'),
+        help_text='Tỷ lệ hoàn thành (%) - tự động tính khi lưu hệ thống'
+    )
+    completion_status = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name=_('Completion Status'),
+        help_text='Per-tab completion status, incomplete fields and filled/required counts'
+    )
+
+    # Roadmap maturity - maintained by signals (see utils.refresh_system_roadmap)
+    # Backfill/verify: python manage.py refresh_completion [--verify]
+    ROADMAP_PHASE_CHOICES = [
+        (1, 'Giai đoạn 1: Xây móng'),
+        (2, 'Giai đoạn 2: Chuẩn hóa'),
+        (3, 'Giai đoạn 3: Tối ưu hóa'),
+        (4, 'Hoàn thành'),
+    ]
+    roadmap_score = models.PositiveSmallIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_('Roadmap Maturity Score'),
+        help_text='Điểm trưởng thành chuyển đổi số (0-100) - tự động tính khi lưu hệ thống'
+    )
+    roadmap_phase = models.PositiveSmallIntegerField(
+        choices=ROADMAP_PHASE_CHOICES,
+        default=1,
+        editable=False,
+        verbose_name=_('Roadmap Phase'),
+        help_text='Giai đoạn lộ trình cần thực hiện tiếp theo (4 = hoàn thành)'
+    )
+    roadmap_improvements = models.JSONField(
+        default=list,
+        blank=True,
+        editable=False,
+        verbose_name=_('Roadmap Improvements'),
+        help_text='Improvements still needed: [{phase, action, detail}]'
+    )
+
     # ======================================================================
     # SECTION 7.5: Data Governance (Phase 3)
     # ======================================================================
@@ -446,6 +541,8 @@ class System(models.Model):
         help_text='Free-form notes for Operations tab'
     )
 
+    objects = SystemQuerySet.as_manager()
+
     class Meta:
         db_table = 'systems'
         ordering = ['-created_at']
@@ -453,6 +550,9 @@ class System(models.Model):
         indexes = [
             models.Index(fields=['org', 'status']),
             models.Index(fields=['system_code']),
+            models.Index(fields=['org', 'completion_percentage']),
+            models.Index(fields=['roadmap_phase', 'roadmap_score']),
+            models.Index(fields=['org', 'roadmap_phase']),
         ]
         verbose_name = _('System')
         verbose_name_plural = _('Systems')
@@ -462,34 +562,15 @@ class System(models.Model):
         Auto-generate system code in format: SYS-{ORG_CODE}-{YYYY}-{XXXX}
         Example: SYS-SKHCN-HN-2026-0001
 
-        Uses MAX of existing system_code numbers to avoid duplicates
-        when systems are deleted or there are gaps in the sequence.
+        The number comes from the per-(org, year) SystemCodeCounter, which
+        is incremented atomically, so concurrent creates in several workers
+        never receive the same code. Each call consumes a number.
         """
         from django.utils import timezone
-        import re
 
-        org_code = self.org.code if hasattr(self.org, 'code') else f"ORG{self.org.id}"
         year = timezone.now().year
-        prefix = f"SYS-{org_code}-{year}-"
-
-        # Find max system_code number for this org and year
-        existing_codes = System.objects.filter(
-            org=self.org,
-            system_code__startswith=prefix
-        ).values_list('system_code', flat=True)
-
-        max_num = 0
-        pattern = re.compile(rf'^SYS-{re.escape(org_code)}-{year}-(\d+)$')
-
-        for code in existing_codes:
-            match = pattern.match(code)
-            if match:
-                num = int(match.group(1))
-                if num > max_num:
-                    max_num = num
-
-        next_num = max_num + 1
-        return f"SYS-{org_code}-{year}-{next_num:04d}"
+        number = SystemCodeCounter.allocate(self.org, year)
+        return format_system_code(self.org, year, number)
 
     def save(self, *args, **kwargs):
         """Override save to auto-generate system_code if not provided"""
@@ -501,6 +582,85 @@ class System(models.Model):
         return f"{self.system_code} - {self.system_name}"
 
 
+def system_code_prefix(org, year: int) -> str:
+    org_code = org.code if hasattr(org, 'code') else f"ORG{org.id}"
+    return f"SYS-{org_code}-{year}-"
+
+
+def format_system_code(org, year: int, number: int) -> str:
+    return f"{system_code_prefix(org, year)}{number:04d}"
+
+
+class SystemCodeCounter(models.Model):
+    """
+    Last allocated system code number per organization and year.
+
+    Rows are seeded from the existing codes by migration 0035 and, for a
+    new (org, year), from the codes of that org on first use.
+    """
+
+    org = models.ForeignKey(
+        'organizations.Organization',
+        on_delete=models.CASCADE,
+        related_name='system_code_counters',
+        verbose_name=_('Organization')
+    )
+    year = models.PositiveIntegerField(verbose_name=_('Year'))
+    last_number = models.PositiveIntegerField(default=0, verbose_name=_('Last Number'))
+
+    class Meta:
+        db_table = 'system_code_counters'
+        unique_together = [['org', 'year']]
+        verbose_name = _('System Code Counter')
+        verbose_name_plural = _('System Code Counters')
+
+    def __str__(self):
+        return f"{self.org_id}/{self.year}: {self.last_number}"
+
+    @classmethod
+    def allocate(cls, org, year: int, count: int = 1) -> int:
+        """
+        Reserve ``count`` consecutive numbers for (org, year).
+
+        The counter is incremented with a single UPDATE ... SET last_number =
+        last_number + count, which row-locks it until the transaction ends,
+        so the value read back afterwards belongs to this caller alone. The
+        first allocation of a year seeds the row from the org's existing
+        codes; if another worker seeds it concurrently, the unique
+        constraint makes this caller fall back to the increment.
+
+        Returns:
+            int: The first reserved number
+        """
+        counter = cls.objects.filter(org=org, year=year)
+        with transaction.atomic():
+            if not counter.update(last_number=F('last_number') + count):
+                seed = max_existing_code_number(org, year)
+                try:
+                    with transaction.atomic():
+                        cls.objects.create(org=org, year=year, last_number=seed + count)
+                    return seed + 1
+                except IntegrityError:
+                    counter.update(last_number=F('last_number') + count)
+            return counter.values_list('last_number', flat=True).get() - count + 1
+
+
+def max_existing_code_number(org, year: int) -> int:
+    """Highest XXXX among the org's SYS-{ORG_CODE}-{year}-XXXX codes (0 if none)"""
+    import re
+
+    prefix = system_code_prefix(org, year)
+    pattern = re.compile(rf'^{re.escape(prefix)}(\d+)$')
+    numbers = [
+        int(match.group(1))
+        for match in map(pattern.match, System.objects.filter(
+            org=org, system_code__startswith=prefix
+        ).values_list('system_code', flat=True))
+        if match
+    ]
+    return max(numbers, default=0)
+
+
 class SystemArchitecture(models.Model):
     """PHẦN 2/B.3: Kiến trúc & Công nghệ"""
 
@@ -1610,6 +1770,116 @@ class SystemIntegrationConnection(models.Model):
         return f"{self.source_system} → {self.target_system} ({self.get_integration_method_display()})"
 
 
+class DashboardSnapshot(models.Model):
+    """
+    Materialized strategic dashboard section (one row per section).
+
+    Refreshed by tasks.refresh_dashboard_snapshots (debounced after data
+    changes and on a schedule); read by the strategic stats actions when
+    settings.DASHBOARD_SNAPSHOTS_ENABLED is on.
+    """
+
+    section = models.CharField(
+        max_length=50,
+        unique=True,
+        verbose_name=_('Section'),
+        help_text='Strategic dashboard action name, e.g. strategic_stats'
+    )
+    data = models.JSONField(
+        default=dict,
+        encoder=DjangoJSONEncoder,
+        verbose_name=_('Data'),
+        help_text='Response payload of the section'
+    )
+    generated_at = models.DateTimeField(verbose_name=_('Generated At'))
+    duration_ms = models.IntegerField(
+        default=0,
+        verbose_name=_('Duration (ms)')
+    )
+
+    class Meta:
+        db_table = 'dashboard_snapshots'
+        ordering = ['section']
+        verbose_name = _('Dashboard Snapshot')
+        verbose_name_plural = _('Dashboard Snapshots')
+
+    def __str__(self):
+        return f"{self.section} @ {self.generated_at}"
+
+
+class ExportJob(models.Model):
+    """
+    Background .xlsx export of the system report (tasks.run_export_job).
+
+    ``cache_key`` identifies the artifact: export format + visible scope +
+    filters + data watermark. A finished job whose artifact is still on disk
+    is returned again for an identical request instead of re-exporting.
+    """
+
+    STATUS_CHOICES = [
+        ('pending', 'Đang chờ'),
+        ('running', 'Đang xuất'),
+        ('success', 'Hoàn thành'),
+        ('failed', 'Lỗi'),
+    ]
+
+    FORMAT_CHOICES = [
+        ('xlsx', 'Excel (.xlsx)'),
+    ]
+
+    user = models.ForeignKey(
+        'accounts.User',
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='export_jobs',
+        verbose_name=_('User')
+    )
+    export_format = models.CharField(
+        max_length=10,
+        choices=FORMAT_CHOICES,
+        default='xlsx',
+        verbose_name=_('Format')
+    )
+    params = models.JSONField(
+        default=dict,
+        verbose_name=_('Parameters'),
+        help_text='Filters (search, org, status) and org_scope of the requesting user'
+    )
+    cache_key = models.CharField(
+        max_length=64,
+        db_index=True,
+        verbose_name=_('Cache Key')
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='pending',
+        verbose_name=_('Status')
+    )
+    rows_processed = models.IntegerField(default=0, verbose_name=_('Rows Processed'))
+    rows_total = models.IntegerField(null=True, blank=True, verbose_name=_('Rows Total'))
+    file_path = models.CharField(
+        max_length=500,
+        blank=True,
+        verbose_name=_('File Path'),
+        help_text='Artifact path relative to settings.EXPORT_ROOT'
+    )
+    error = models.TextField(blank=True, verbose_name=_('Error'))
+    task_id = models.CharField(max_length=255, blank=True, verbose_name=_('Task ID'))
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_('Created At'))
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name=_('Started At'))
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name=_('Finished At'))
+
+    class Meta:
+        db_table = 'export_jobs'
+        ordering = ['-created_at']
+        verbose_name = _('Export Job')
+        verbose_name_plural = _('Export Jobs')
+
+    def __str__(self):
+        return f"Export #{self.pk} ({self.export_format}, {self.status})"
+
+
 class AIConversation(models.Model):
     """AI Assistant Conversation - Chat history for strategic dashboard"""
 
@@ -36,7 +36,8 @@ class PolicyGenerator:
         if not OPENAI_AVAILABLE:
             raise ImportError("OpenAI package is required for policy generation")
 
-        self.client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+        from .llm_gateway import get_openai_client
+        self.client = get_openai_client()  # Pooled, shared with the AI assistant
         self.model = getattr(settings, 'POLICY_GENERATION_MODEL', 'gpt-4')
 
     def generate_from_feedback(self, feedback: AIResponseFeedback) -> Optional[Dict]:
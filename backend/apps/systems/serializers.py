@@ -1,3 +1,4 @@
+from django.utils import timezone
 from rest_framework import serializers
 from .models import (
     System,
@@ -14,6 +15,7 @@ from .models import (
     SystemIntegrationConnection,  # P0.8 Phase 1 - Section 5
     AIConversation,
     AIMessage,
+    ExportJob,
 )
 from apps.organizations.models import Organization
 
@@ -226,6 +228,10 @@ class SystemIntegrationConnectionSerializer(serializers.ModelSerializer):
     # Fix: Allow custom text for fields with 'other' option
     integration_method = FlexibleChoiceField(max_length=10000, required=False, allow_blank=True)
 
+    # Writable so nested updates can match submitted items to stored rows
+    # (see diff_integration_connections)
+    id = serializers.IntegerField(required=False)
+
     class Meta:
         model = SystemIntegrationConnection
         fields = [
@@ -252,7 +258,8 @@ class SystemListSerializer(serializers.ModelSerializer):
     org_name = serializers.CharField(source='org.name', read_only=True)
     status_display = serializers.CharField(source='get_status_display', read_only=True)
     criticality_display = serializers.CharField(source='get_criticality_level_display', read_only=True)
-    completion_percentage = serializers.SerializerMethodField()
+    # Stored on System and kept in sync by signals (see utils.refresh_system_completion)
+    completion_percentage = serializers.FloatField(read_only=True)
 
     class Meta:
         model = System
@@ -277,12 +284,56 @@ class SystemListSerializer(serializers.ModelSerializer):
             'created_at',
             'updated_at',
             'completion_percentage',
+            'roadmap_score',
+            'roadmap_phase',
         ]
 
-    def get_completion_percentage(self, obj):
-        """Calculate completion percentage for the system"""
-        from .utils import calculate_system_completion_percentage
-        return calculate_system_completion_percentage(obj)
+
+# Nested relations of SystemDetailSerializer that ?expand= controls
+SYSTEM_DETAIL_ONE_TO_ONE = (
+    'architecture', 'data_info', 'operations', 'integration', 'assessment',
+    'cost', 'vendor', 'infrastructure', 'security',
+)
+SYSTEM_DETAIL_MANY = ('attachments', 'integration_connections')
+SYSTEM_DETAIL_RELATIONS = SYSTEM_DETAIL_ONE_TO_ONE + SYSTEM_DETAIL_MANY
+
+
+def _split_param(value):
+    """'a, b,,c' -> {'a', 'b', 'c'}; None when the parameter is absent"""
+    if value is None:
+        return None
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+def parse_sparse_fieldset(query_params):
+    """
+    Read ?fields= / ?expand= for SystemDetailSerializer.
+
+    - neither: every field and every relation (default, unchanged output)
+    - fields=a,b: only those fields; relations listed there are expanded
+    - expand=x,y: every scalar field plus only relations x, y (expand= for none)
+    - both: the listed fields plus the expanded relations
+
+    Returns:
+        tuple: (fields set or None for all, relations set to expand)
+
+    Raises:
+        ValidationError: Unknown relation in ?expand=
+    """
+    fields = _split_param(query_params.get('fields'))
+    expand = _split_param(query_params.get('expand'))
+
+    if expand is not None:
+        unknown = expand - set(SYSTEM_DETAIL_RELATIONS)
+        if unknown:
+            raise serializers.ValidationError({
+                'expand': f"Không hỗ trợ mở rộng: {', '.join(sorted(unknown))}. "
+                          f"Chọn từ: {', '.join(SYSTEM_DETAIL_RELATIONS)}"
+            })
+
+    if fields is None and expand is None:
+        return None, set(SYSTEM_DETAIL_RELATIONS)
+    return fields, (expand or set()) | ((fields or set()) & set(SYSTEM_DETAIL_RELATIONS))
 
 
 class SystemDetailSerializer(serializers.ModelSerializer):
@@ -292,7 +343,8 @@ class SystemDetailSerializer(serializers.ModelSerializer):
     status_display = serializers.CharField(source='get_status_display', read_only=True)
     criticality_display = serializers.CharField(source='get_criticality_level_display', read_only=True)
     scope_display = serializers.CharField(source='get_scope_display', read_only=True)
-    completion_percentage = serializers.SerializerMethodField()
+    # Stored on System and kept in sync by signals (see utils.refresh_system_completion)
+    completion_percentage = serializers.FloatField(read_only=True)
 
     # Fix: Convert comma-separated string to array for frontend
     programming_language = CommaSeparatedListField(required=False)
@@ -323,10 +375,31 @@ class SystemDetailSerializer(serializers.ModelSerializer):
         model = System
         fields = '__all__'
 
-    def get_completion_percentage(self, obj):
-        """Calculate completion percentage for the system"""
-        from .utils import calculate_system_completion_percentage
-        return calculate_system_completion_percentage(obj)
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        """
+        Args:
+            fields: Field names to keep (None: all)
+            expand: Relations to keep (None: all), see parse_sparse_fieldset
+        """
+        super().__init__(*args, **kwargs)
+        if fields is None and expand is None:
+            return
+
+        expand = set(SYSTEM_DETAIL_RELATIONS) if expand is None else set(expand)
+        if fields is not None:
+            unknown = set(fields) - set(self.fields)
+            if unknown:
+                raise serializers.ValidationError({
+                    'fields': f"Trường không tồn tại: {', '.join(sorted(unknown))}"
+                })
+
+        for name in list(self.fields):
+            if name in SYSTEM_DETAIL_RELATIONS:
+                keep = name in expand
+            else:
+                keep = fields is None or name in fields
+            if not keep:
+                self.fields.pop(name)
 
     def to_representation(self, instance):
         """Customize representation based on form_level"""
@@ -426,7 +499,8 @@ class SystemCreateUpdateSerializer(serializers.ModelSerializer):
                 # Override any org value with user's organization
                 attrs['org'] = user.organization
             # If admin is creating without org specified, raise error
-            elif user.role == 'admin' and not attrs.get('org'):
+            # (updates keep the system's current org)
+            elif user.role == 'admin' and not attrs.get('org') and self.instance is None:
                 raise serializers.ValidationError({
                     'org': 'Admin phải chọn tổ chức khi tạo hệ thống.'
                 })
@@ -459,6 +533,7 @@ class SystemCreateUpdateSerializer(serializers.ModelSerializer):
 
         # P0.8 Phase 1 - Create Integration Connections (dynamic list)
         for conn_data in integration_connections_data:
+            conn_data = {attr: value for attr, value in conn_data.items() if attr != 'id'}
             SystemIntegrationConnection.objects.create(
                 system=system,
                 **conn_data
@@ -471,114 +546,201 @@ class SystemCreateUpdateSerializer(serializers.ModelSerializer):
             SystemInfrastructure.objects.create(system=system, **infrastructure_data)
             SystemSecurity.objects.create(system=system, **security_data)
 
+        # Nested saves refreshed the stored completion in the DB via signals
+        system.refresh_from_db(fields=[
+            'completion_percentage', 'completion_status',
+            'roadmap_score', 'roadmap_phase', 'roadmap_improvements',
+        ])
         return system
 
+    # validated_data key -> model of the one-to-one sub-models, in write order
+    LEVEL_1_RELATIONS = {
+        'architecture': SystemArchitecture,
+        'data_info': SystemDataInfo,
+        'operations': SystemOperations,
+        'integration': SystemIntegration,
+        'assessment': SystemAssessment,
+    }
+    # Only written for form_level == 2 systems
+    LEVEL_2_RELATIONS = {
+        'cost': SystemCost,
+        'vendor': SystemVendor,
+        'infrastructure': SystemInfrastructure,
+        'security': SystemSecurity,
+    }
+
     def update(self, instance, validated_data):
-        """Update System and nested related models"""
-        import logging
-        logger = logging.getLogger(__name__)
+        """
+        Update System and nested related models, writing only what changed.
+
+        The frontend autosaves the whole form, so most calls change few or
+        no values: every row is compared with the submitted values first and
+        saved with update_fields=<changed columns> only when something
+        differs; untouched sub-models are not written at all. Integration
+        connections are matched by identity (see diff_integration_connections)
+        and upserted / deleted instead of being replaced wholesale.
+        """
+        nested = {
+            name: validated_data.pop(name, None)
+            for name in (*self.LEVEL_1_RELATIONS, *self.LEVEL_2_RELATIONS)
+        }
+        integration_connections_data = validated_data.pop('integration_connections', None)
 
-        # DEBUG: Log what data was received
-        logger.info(f"🔍 UPDATE called for System {instance.id}")
-        logger.info(f"🔍 validated_data keys: {list(validated_data.keys())}")
+        system_changed = apply_changes(instance, validated_data)
+        if system_changed:
+            save_changes(instance, system_changed)
+        changed = bool(system_changed)
 
-        # Extract nested data (now using relationship names due to source parameter)
-        architecture_data = validated_data.pop('architecture', None)
-        data_info_data = validated_data.pop('data_info', None)
-        operations_data = validated_data.pop('operations', None)
-        integration_data = validated_data.pop('integration', None)
-        assessment_data = validated_data.pop('assessment', None)
-        integration_connections_data = validated_data.pop('integration_connections', None)  # P0.8 Phase 1
-        cost_data = validated_data.pop('cost', None)
-        vendor_data = validated_data.pop('vendor', None)
-        infrastructure_data = validated_data.pop('infrastructure', None)
-        security_data = validated_data.pop('security', None)
-
-        # DEBUG: Log extracted architecture data
-        if architecture_data is not None:
-            logger.info(f"🔍 architecture_data extracted: {architecture_data}")
-
-        # Update System fields
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
-
-        # Update Level 1 related models
-        if architecture_data is not None:
-            arch, created = SystemArchitecture.objects.get_or_create(system=instance)
-            logger.info(f"🔍 SystemArchitecture {'created' if created else 'retrieved'} for system {instance.id}")
-
-            for attr, value in architecture_data.items():
-                logger.info(f"🔍 Setting {attr} = {value}")
-                setattr(arch, attr, value)
-
-            arch.save()
-            logger.info(f"✅ SystemArchitecture saved for system {instance.id}")
-            logger.info(f"✅ Saved values - backend_tech: {arch.backend_tech}, frontend_tech: {arch.frontend_tech}, api_style: {arch.api_style}")
-
-        if data_info_data is not None:
-            data_info, _ = SystemDataInfo.objects.get_or_create(system=instance)
-            for attr, value in data_info_data.items():
-                setattr(data_info, attr, value)
-            data_info.save()
-
-        if operations_data is not None:
-            ops, _ = SystemOperations.objects.get_or_create(system=instance)
-            for attr, value in operations_data.items():
-                setattr(ops, attr, value)
-            ops.save()
-
-        if integration_data is not None:
-            integration, _ = SystemIntegration.objects.get_or_create(system=instance)
-            for attr, value in integration_data.items():
-                setattr(integration, attr, value)
-            integration.save()
-
-        if assessment_data is not None:
-            assessment, _ = SystemAssessment.objects.get_or_create(system=instance)
-            for attr, value in assessment_data.items():
-                setattr(assessment, attr, value)
-            assessment.save()
-
-        # P0.8 Phase 1 - Update Integration Connections
-        if integration_connections_data is not None:
-            # Delete old connections
-            instance.integration_connections.all().delete()
-            # Create new connections
-            for conn_data in integration_connections_data:
-                SystemIntegrationConnection.objects.create(
-                    system=instance,
-                    **conn_data
-                )
-
-        # Update Level 2 related models if form_level == 2
+        relations = dict(self.LEVEL_1_RELATIONS)
         if instance.form_level == 2:
-            if cost_data is not None:
-                cost, _ = SystemCost.objects.get_or_create(system=instance)
-                for attr, value in cost_data.items():
-                    setattr(cost, attr, value)
-                cost.save()
-
-            if vendor_data is not None:
-                vendor, _ = SystemVendor.objects.get_or_create(system=instance)
-                for attr, value in vendor_data.items():
-                    setattr(vendor, attr, value)
-                vendor.save()
-
-            if infrastructure_data is not None:
-                infra, _ = SystemInfrastructure.objects.get_or_create(system=instance)
-                for attr, value in infrastructure_data.items():
-                    setattr(infra, attr, value)
-                infra.save()
-
-            if security_data is not None:
-                sec, _ = SystemSecurity.objects.get_or_create(system=instance)
-                for attr, value in security_data.items():
-                    setattr(sec, attr, value)
-                sec.save()
+            relations.update(self.LEVEL_2_RELATIONS)
+        for name, model in relations.items():
+            if nested[name] is not None:
+                changed |= self._update_related(instance, name, model, nested[name])
+
+        if integration_connections_data is not None:
+            changed |= self._sync_integration_connections(instance, integration_connections_data)
+
+        if not changed:
+            return instance
 
+        if not system_changed:
+            # Sub-model edits still count as an update of the system
+            instance.updated_at = timezone.now()
+            System.objects.filter(pk=instance.pk).update(updated_at=instance.updated_at)
+
+        # Nested saves refreshed the stored completion in the DB via signals
+        instance.refresh_from_db(fields=[
+            'completion_percentage', 'completion_status',
+            'roadmap_score', 'roadmap_phase', 'roadmap_improvements',
+        ])
         return instance
 
+    def _update_related(self, instance, name, model, values):
+        """Create the sub-model row if missing, else save its changed columns"""
+        try:
+            related = getattr(instance, name)
+        except model.DoesNotExist:
+            setattr(instance, name, model.objects.create(system=instance, **values))
+            return True
+
+        changed = apply_changes(related, values)
+        if changed:
+            save_changes(related, changed)
+        return bool(changed)
+
+    def _sync_integration_connections(self, instance, connections_data):
+        to_update, to_create, to_delete = diff_integration_connections(
+            list(instance.integration_connections.all()), connections_data
+        )
+        for connection, changed in to_update:
+            save_changes(connection, changed)
+        for values in to_create:
+            SystemIntegrationConnection.objects.create(system=instance, **values)
+        if to_delete:
+            # Queryset delete() still sends post_delete per row (cache version)
+            SystemIntegrationConnection.objects.filter(pk__in=[c.pk for c in to_delete]).delete()
+        return bool(to_update or to_create or to_delete)
+
+
+def apply_changes(obj, values):
+    """
+    Set the attributes of ``obj`` that differ from ``values``.
+
+    Returns:
+        list: Names of the fields that changed
+    """
+    changed = []
+    for attr, value in values.items():
+        if getattr(obj, attr) != value:
+            setattr(obj, attr, value)
+            changed.append(attr)
+    return changed
+
+
+def save_changes(obj, changed):
+    """save(update_fields=...) for the changed fields plus auto_now columns"""
+    auto_now = [
+        field.name for field in obj._meta.concrete_fields
+        if getattr(field, 'auto_now', False)
+    ]
+    obj.save(update_fields=[*changed, *(name for name in auto_now if name not in changed)])
+
+
+def diff_integration_connections(existing, connections_data):
+    """
+    Match submitted integration connections to the stored ones.
+
+    A submitted item is the stored connection with the same ``id`` or, when
+    it has no (known) id, the first unmatched stored connection with the
+    same source_system and target_system. Unmatched items are new; stored
+    connections nobody matched are deleted.
+
+    Args:
+        existing: SystemIntegrationConnection rows of one system
+        connections_data: Validated items of integration_connections_data
+
+    Returns:
+        tuple: (to_update [(connection, changed fields)], to_create [values],
+                to_delete [connection])
+    """
+    remaining = {connection.pk: connection for connection in existing}
+    to_update, to_create = [], []
+
+    for item in connections_data:
+        values = dict(item)
+        connection = remaining.pop(values.pop('id', None), None)
+        if connection is None:
+            key = (values.get('source_system'), values.get('target_system'))
+            match = next(
+                (c for c in remaining.values() if (c.source_system, c.target_system) == key),
+                None,
+            )
+            connection = remaining.pop(match.pk) if match else None
+
+        if connection is None:
+            to_create.append(values)
+            continue
+        changed = apply_changes(connection, values)
+        if changed:
+            to_update.append((connection, changed))
+
+    return to_update, to_create, list(remaining.values())
+
+
+# ========================================
+# Export Job Serializers
+# ========================================
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    """Background export job with progress (rows processed / total)"""
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    progress = serializers.SerializerMethodField()
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ExportJob
+        fields = [
+            'id', 'export_format', 'params', 'status', 'status_display',
+            'rows_processed', 'rows_total', 'progress', 'download_url',
+            'error', 'created_at', 'started_at', 'finished_at',
+        ]
+        read_only_fields = fields
+
+    def get_progress(self, obj):
+        """Percentage of rows written (100 once the job succeeded)"""
+        if obj.status == 'success':
+            return 100
+        if not obj.rows_total:
+            return 0
+        return round(obj.rows_processed / obj.rows_total * 100, 1)
+
+    def get_download_url(self, obj):
+        request = self.context.get('request')
+        if obj.status != 'success' or not request:
+            return None
+        return request.build_absolute_uri(f'/api/export-jobs/{obj.pk}/download/')
+
 
 # ========================================
 # AI Conversation Serializers
@@ -0,0 +1,107 @@
+"""
+Signal handlers for the systems app.
+
+- Keeps System.completion_percentage / completion_status and the roadmap
+  maturity fields in sync whenever a System or one of the sub-models read
+  by the completion / roadmap rules is saved.
+- Bumps the dashboard data version (see cache.py) on every write that can
+  change dashboard numbers, and schedules a debounced refresh of the
+  materialized dashboard snapshots when they are enabled.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.organizations.models import Organization
+from .cache import bump_data_version
+from .models import (
+    System,
+    SystemArchitecture,
+    SystemDataInfo,
+    SystemOperations,
+    SystemIntegration,
+    SystemAssessment,
+    SystemCost,
+    SystemVendor,
+    SystemInfrastructure,
+    SystemSecurity,
+    SystemIntegrationConnection,
+    Attachment,
+)
+from .utils import refresh_system_completion, refresh_system_roadmap
+
+# Models whose writes invalidate cached dashboard data
+DASHBOARD_DATA_MODELS = [
+    System,
+    SystemArchitecture,
+    SystemDataInfo,
+    SystemOperations,
+    SystemIntegration,
+    SystemAssessment,
+    SystemCost,
+    SystemVendor,
+    SystemInfrastructure,
+    SystemSecurity,
+    SystemIntegrationConnection,
+    Attachment,
+    Organization,
+]
+
+
+@receiver(post_save, sender=System)
+def update_completion_on_system_save(sender, instance, raw=False, **kwargs):
+    """Recompute completion after the System row itself changed"""
+    if raw:
+        return
+    percentage = refresh_system_completion(instance.pk)
+    if percentage is not None:
+        instance.completion_percentage = percentage
+    phase = refresh_system_roadmap(instance.pk)
+    if phase is not None:
+        instance.roadmap_phase = phase
+
+
+@receiver(post_save, sender=SystemArchitecture)
+@receiver(post_save, sender=SystemDataInfo)
+@receiver(post_save, sender=SystemOperations)
+@receiver(post_save, sender=SystemAssessment)
+@receiver(post_delete, sender=SystemArchitecture)
+@receiver(post_delete, sender=SystemDataInfo)
+@receiver(post_delete, sender=SystemOperations)
+@receiver(post_delete, sender=SystemAssessment)
+def update_completion_on_related_change(sender, instance, raw=False, **kwargs):
+    """Recompute completion of the parent System after a sub-model changed"""
+    if raw:
+        return
+    refresh_system_completion(instance.system_id)
+
+
+@receiver(post_save, sender=SystemArchitecture)
+@receiver(post_save, sender=SystemIntegration)
+@receiver(post_save, sender=SystemSecurity)
+@receiver(post_delete, sender=SystemArchitecture)
+@receiver(post_delete, sender=SystemIntegration)
+@receiver(post_delete, sender=SystemSecurity)
+def update_roadmap_on_related_change(sender, instance, raw=False, **kwargs):
+    """Recompute roadmap maturity of the parent System after a sub-model changed"""
+    if raw:
+        return
+    refresh_system_roadmap(instance.system_id)
+
+
+def invalidate_dashboard_cache(sender, instance, **kwargs):
+    """
+    Bump the dashboard data version now and again once the transaction commits,
+    so a dashboard computed mid-transaction is not cached under the new version
+    """
+    bump_data_version()
+    transaction.on_commit(bump_data_version)
+    if settings.DASHBOARD_SNAPSHOTS_ENABLED:
+        from .snapshots import schedule_snapshot_refresh
+        transaction.on_commit(schedule_snapshot_refresh)
+
+
+for model in DASHBOARD_DATA_MODELS:
+    post_save.connect(invalidate_dashboard_cache, sender=model, dispatch_uid=f'dashboard_cache_save_{model.__name__}')
+    post_delete.connect(invalidate_dashboard_cache, sender=model, dispatch_uid=f'dashboard_cache_delete_{model.__name__}')
@@ -0,0 +1,98 @@
+"""
+Materialized strategic dashboard snapshots.
+
+Each strategic section payload (see SystemViewSet.DASHBOARD_SECTIONS) is
+stored as one DashboardSnapshot row, so with DASHBOARD_SNAPSHOTS_ENABLED the
+stats endpoints read a single row instead of scanning systems and joins.
+
+Refresh:
+- After data changes: signals call schedule_snapshot_refresh() on commit;
+  writes within DASHBOARD_SNAPSHOT_DEBOUNCE seconds share one task run.
+- On a schedule: CELERY_BEAT_SCHEDULE['refresh-dashboard-snapshots']
+  (skipped while snapshots are disabled).
+- Manually: refresh_snapshots() (e.g. from `manage.py shell`).
+
+Every refresh bumps the data version (cache.py), so the cached section
+payloads and ETags computed from the previous rows are not served again.
+"""
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .cache import bump_data_version
+from .models import DashboardSnapshot, System
+
+logger = logging.getLogger(__name__)
+
+PENDING_REFRESH_KEY = 'systems:snapshot_refresh_pending'
+
+
+def refresh_snapshots(sections: Optional[List[str]] = None) -> Dict[str, int]:
+    """
+    Recompute and store snapshot rows.
+
+    Args:
+        sections: Section names to refresh (default: all)
+
+    Returns:
+        dict: {section: duration_ms}
+    """
+    from .views import SystemViewSet
+
+    viewset = SystemViewSet()
+    sections = sections or list(SystemViewSet.DASHBOARD_SECTIONS)
+    queryset = System.objects.filter(is_deleted=False)
+
+    durations = {}
+    for section in sections:
+        started = time.perf_counter()
+        data = getattr(viewset, SystemViewSet.DASHBOARD_SECTIONS[section])(queryset)
+        duration_ms = int((time.perf_counter() - started) * 1000)
+
+        DashboardSnapshot.objects.update_or_create(
+            section=section,
+            defaults={
+                'data': data,
+                'generated_at': timezone.now(),
+                'duration_ms': duration_ms,
+            },
+        )
+        durations[section] = duration_ms
+
+    # Payloads cached (and ETags issued) from the previous rows are stale now
+    bump_data_version()
+    return durations
+
+
+def read_snapshot(section: str) -> Optional[Dict[str, Any]]:
+    """Snapshot payload plus 'generated_at' (ISO 8601), or None if never generated"""
+    snapshot = DashboardSnapshot.objects.filter(section=section).only('data', 'generated_at').first()
+    if snapshot is None:
+        return None
+    return {**snapshot.data, 'generated_at': snapshot.generated_at.isoformat()}
+
+
+def schedule_snapshot_refresh() -> None:
+    """
+    Enqueue one debounced refresh task.
+
+    The first write opens a window of DASHBOARD_SNAPSHOT_DEBOUNCE seconds and
+    schedules the task at its end; later writes in the window are absorbed.
+    The task clears the marker before computing, so writes made while it
+    runs schedule a new run.
+    """
+    from .tasks import refresh_dashboard_snapshots
+
+    debounce = getattr(settings, 'DASHBOARD_SNAPSHOT_DEBOUNCE', 30)
+    try:
+        if not cache.add(PENDING_REFRESH_KEY, 1, timeout=debounce + 60):
+            return
+        refresh_dashboard_snapshots.apply_async(countdown=debounce)
+    except Exception as e:
+        # Broker or cache unavailable: the scheduled refresh catches up
+        cache.delete(PENDING_REFRESH_KEY)
+        logger.warning(f"Could not schedule dashboard snapshot refresh: {e}")
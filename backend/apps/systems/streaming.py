@@ -0,0 +1,82 @@
+"""
+Streamed downloads that stay streamed under ASGI.
+
+Under ASGI (gunicorn + uvicorn workers) Django reads a StreamingHttpResponse
+with a sync iterator to the end with ``sync_to_async(list)`` before sending
+anything, so a large export would be built in memory and the first byte
+would only go out once the last row is read. Sync views therefore hand
+their iterators and files to the helpers below: under ASGI they are read
+off the event loop in batches by an async iterator; under WSGI (runserver,
+the test client) they are left as they are, and streamed as before.
+
+Usage:
+    response = StreamingHttpResponse(streaming_content(request, rows, batch_size=2000))
+    return stream_file(request, FileResponse(open(path, 'rb')))
+
+Attachments (MEDIA_URL) served by Django in development go through
+serve_media for the same reason.
+"""
+from functools import partial
+from itertools import islice
+from typing import AsyncIterator, Iterable
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.views.static import serve
+
+# Bytes read from a file per thread hop when it is served under ASGI
+FILE_BLOCK_SIZE = 64 * 1024
+
+
+def is_asgi(request) -> bool:
+    """Whether ``request`` (Django or DRF request) is served by the ASGI handler"""
+    return isinstance(getattr(request, '_request', request), ASGIRequest)
+
+
+async def iterate_in_thread(iterator: Iterable, batch_size: int = 1) -> AsyncIterator:
+    """
+    Async iterator over the sync ``iterator``, fetching ``batch_size`` items
+    per ``sync_to_async`` call.
+
+    Calls are thread-sensitive, so a database cursor behind the iterator
+    (``.iterator()``) is always used from the thread that opened it. The
+    iterator is closed when the async iterator is, e.g. when the client
+    disconnects.
+    """
+    iterator = iter(iterator)
+    next_batch = sync_to_async(lambda: list(islice(iterator, batch_size)))
+    try:
+        while True:
+            batch = await next_batch()
+            if not batch:
+                return
+            for item in batch:
+                yield item
+    finally:
+        close = getattr(iterator, 'close', None)
+        if close is not None:
+            await sync_to_async(close)()
+
+
+def streaming_content(request, iterator: Iterable, batch_size: int = 1):
+    """Content for a StreamingHttpResponse: ``iterator``, made async under ASGI"""
+    if is_asgi(request):
+        return iterate_in_thread(iterator, batch_size)
+    return iterator
+
+
+def stream_file(request, response):
+    """
+    Under ASGI, read the file of a FileResponse in FILE_BLOCK_SIZE blocks
+    off the event loop. Headers (Content-Length, Content-Disposition) are
+    kept and the file is still closed with the response.
+    """
+    filelike = getattr(response, 'file_to_stream', None)
+    if filelike is not None and is_asgi(request):
+        response.streaming_content = iterate_in_thread(iter(partial(filelike.read, FILE_BLOCK_SIZE), b''))
+    return response
+
+
+def serve_media(request, path, document_root=None, show_indexes=False):
+    """django.views.static.serve, streamed with stream_file under ASGI"""
+    return stream_file(request, serve(request, path, document_root, show_indexes))
@@ -152,3 +152,67 @@ def regenerate_all_policies():
         'skipped': skip_count,
         'errors': error_count,
     }
+
+
+@shared_task
+def refresh_dashboard_snapshots(sections=None):
+    """
+    Recompute materialized strategic dashboard snapshots
+
+    Triggered (debounced) after data changes and by Celery beat; a no-op
+    while settings.DASHBOARD_SNAPSHOTS_ENABLED is off.
+
+    Args:
+        sections: Optional list of section names (default: all)
+    """
+    from django.conf import settings
+    from django.core.cache import cache
+    from .snapshots import PENDING_REFRESH_KEY, refresh_snapshots
+
+    cache.delete(PENDING_REFRESH_KEY)
+    if not settings.DASHBOARD_SNAPSHOTS_ENABLED:
+        return {'status': 'skipped', 'reason': 'DASHBOARD_SNAPSHOTS_ENABLED is off'}
+    durations = refresh_snapshots(sections)
+    logger.info(f"Refreshed dashboard snapshots: {durations}")
+    return {'status': 'success', 'durations_ms': durations}
+
+
+@shared_task
+def run_export_job(job_id: int):
+    """
+    Build the artifact of a background export job (exports.ExportJob)
+
+    Progress is written to the job row while the task runs and polled via
+    GET /api/export-jobs/{id}/.
+
+    Args:
+        job_id: ID of the ExportJob to run
+    """
+    from .exports import build_export_artifact
+    from .models import ExportJob
+
+    try:
+        job = ExportJob.objects.get(id=job_id)
+    except ExportJob.DoesNotExist:
+        logger.error(f"Export job {job_id} not found")
+        return {'status': 'error', 'error': 'job_not_found', 'job_id': job_id}
+
+    if job.status != 'pending':
+        # Picked up after it was failed as stale (exports.fail_stale_jobs)
+        logger.warning(f"Export job {job_id} is {job.status}, not running it")
+        return {'status': 'skipped', 'job_id': job_id}
+
+    job = build_export_artifact(job)
+    logger.info(f"Export job {job_id} finished: {job.status}, {job.rows_processed} rows")
+    return {'status': job.status, 'job_id': job_id, 'rows': job.rows_processed}
+
+
+@shared_task
+def prune_export_artifacts():
+    """Delete export artifacts and jobs older than settings.EXPORT_ARTIFACT_MAX_AGE"""
+    from django.conf import settings
+    from .exports import prune_export_artifacts as prune
+
+    deleted = prune(settings.EXPORT_ARTIFACT_MAX_AGE)
+    logger.info(f"Pruned {deleted} export artifacts")
+    return {'status': 'success', 'deleted': deleted}
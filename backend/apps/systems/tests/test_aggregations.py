@@ -0,0 +1,204 @@
+"""
+Tests for the single-pass dashboard aggregation helpers.
+"""
+from django.db.models import Q
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.organizations.models import Organization
+from apps.systems.aggregations import (
+    Distribution,
+    Flag,
+    Total,
+    aggregate_buckets,
+    RECOMMENDATION_DISTRIBUTION,
+)
+from apps.systems.insights import INSIGHTS_BUCKETS
+from apps.systems.models import System, SystemArchitecture, SystemAssessment
+
+
+class AggregateBucketsTestCase(TestCase):
+    """Test aggregate_buckets against hand-counted fixtures."""
+
+    def setUp(self):
+        self.org = Organization.objects.create(name='Org A', code='ORGA')
+        System.objects.create(org=self.org, system_name='S1', status='operating',
+                              criticality_level='high', hosting_platform='cloud')
+        System.objects.create(org=self.org, system_name='S2', status='operating',
+                              criticality_level='low', has_encryption=True)
+        System.objects.create(org=self.org, system_name='S3', status='stopped',
+                              criticality_level='high', api_provided_count=3)
+        System.objects.create(org=self.org, system_name='S4', status='pilot',
+                              is_deleted=True)
+
+    def test_distribution_flag_and_total(self):
+        """All specs are evaluated and collected under their keys."""
+        queryset = System.objects.filter(is_deleted=False)
+        result = aggregate_buckets(queryset, [
+            Total('total'),
+            Distribution('status', 'status', ['operating', 'pilot', 'stopped']),
+            Distribution('criticality', 'criticality_level', ['high', 'low']),
+            Flag('cloud', Q(hosting_platform='cloud')),
+        ])
+
+        self.assertEqual(result['total'], 3)
+        self.assertEqual(result['status'], {'operating': 2, 'pilot': 0, 'stopped': 1})
+        self.assertEqual(list(result['status'].keys()), ['operating', 'pilot', 'stopped'])
+        self.assertEqual(result['criticality'], {'high': 2, 'low': 1})
+        self.assertEqual(result['cloud'], 1)
+
+    def test_single_query(self):
+        """Any number of buckets costs exactly one query."""
+        queryset = System.objects.filter(is_deleted=False)
+        with self.assertNumQueries(1):
+            aggregate_buckets(queryset, INSIGHTS_BUCKETS)
+
+    def test_related_flags_count_missing_rows(self):
+        """Flags on one-to-one relations treat a missing row as not configured."""
+        system = System.objects.get(system_name='S1')
+        SystemArchitecture.objects.create(system=system, has_architecture_diagram=True, has_cicd=True)
+
+        result = aggregate_buckets(System.objects.filter(is_deleted=False), INSIGHTS_BUCKETS)
+
+        self.assertEqual(result['total'], 3)
+        self.assertEqual(result['no_arch_diagram'], 2)
+        self.assertEqual(result['no_cicd'], 2)
+        self.assertEqual(result['no_api_gateway'], 3)
+        self.assertEqual(result['no_encryption'], 2)
+        self.assertEqual(result['cloud_ready'], 1)
+
+
+class RecommendationBucketTestCase(TestCase):
+    """Test the SQL recommendation classifier."""
+
+    def setUp(self):
+        self.org = Organization.objects.create(name='Org A', code='ORGA')
+        recommendations = {
+            'keep-1': 'keep',
+            'replace-1': 'replace',
+            'replace-2': 'replace',
+            'blank': '',
+            'other': 'other',
+            'custom': 'Chuyển sang nền tảng dùng chung',
+        }
+        for name, recommendation in recommendations.items():
+            system = System.objects.create(org=self.org, system_name=name)
+            SystemAssessment.objects.create(system=system, recommendation=recommendation)
+        System.objects.create(org=self.org, system_name='no-assessment')
+
+    def test_distribution(self):
+        """No assessment row, blank and non-standard values are all 'unknown'."""
+        result = aggregate_buckets(System.objects.all(), [RECOMMENDATION_DISTRIBUTION])
+        self.assertEqual(result['recommendation_distribution'], {
+            'keep': 1, 'upgrade': 0, 'replace': 2, 'merge': 0, 'unknown': 4,
+        })
+
+    def test_in_recommendation_bucket(self):
+        names = set(System.objects.in_recommendation_bucket('unknown').values_list('system_name', flat=True))
+        self.assertEqual(names, {'blank', 'other', 'custom', 'no-assessment'})
+
+        names = set(System.objects.in_recommendation_bucket('replace').values_list('system_name', flat=True))
+        self.assertEqual(names, {'replace-1', 'replace-2'})
+
+    def test_with_recommendation_bucket(self):
+        buckets = dict(System.objects.with_recommendation_bucket().values_list('system_name', 'recommendation_bucket'))
+        self.assertEqual(buckets['keep-1'], 'keep')
+        self.assertEqual(buckets['custom'], 'unknown')
+        self.assertEqual(buckets['no-assessment'], 'unknown')
+
+    def test_drilldown_uses_same_classification(self):
+        client = APIClient()
+        client.force_authenticate(user=User.objects.create_user(username='leader', password='x', role='leader'))
+
+        response = client.get('/api/systems/drilldown/', {'filter_type': 'recommendation', 'filter_value': 'unknown'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 4)
+
+
+class StrategicStatsResponseTestCase(TestCase):
+    """The strategic endpoints keep their response contract."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.leader = User.objects.create_user(username='leader', password='x', role='leader')
+        self.org = Organization.objects.create(name='Org A', code='ORGA')
+        System.objects.create(org=self.org, system_name='S1', status='operating', scope='org_wide')
+        System.objects.create(org=self.org, system_name='S2', status='testing', api_consumed_count=2)
+
+    def test_strategic_stats(self):
+        self.client.force_authenticate(user=self.leader)
+        response = self.client.get('/api/systems/strategic_stats/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['overview']['total_systems'], 2)
+        self.assertEqual(response.data['status_distribution'], {
+            'operating': 1, 'pilot': 0, 'testing': 1, 'stopped': 0, 'replacing': 0,
+        })
+        self.assertEqual(response.data['scope_distribution']['org_wide'], 1)
+        self.assertEqual(response.data['integration']['with_integration'], 1)
+        self.assertEqual(response.data['integration']['total_api_consumed'], 2)
+
+    def test_statistics(self):
+        self.client.force_authenticate(user=self.leader)
+        response = self.client.get('/api/systems/statistics/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total'], 2)
+        self.assertEqual(response.data['by_status']['operating'], 1)
+        self.assertEqual(response.data['by_form_level'], {'level_1': 2, 'level_2': 0})
+
+
+class InvestmentStatsTestCase(TestCase):
+    """investment_stats rolls costs up per organization without a per-org loop."""
+
+    def setUp(self):
+        from decimal import Decimal
+        from apps.systems.models import SystemCost
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.create_user(username='leader', password='x', role='leader'))
+
+        org_a = Organization.objects.create(name='Org A', code='ORGA')
+        org_b = Organization.objects.create(name='Org B', code='ORGB')
+        Organization.objects.create(name='Org C', code='ORGC')
+
+        a1 = System.objects.create(org=org_a, system_name='A1', users_total=100)
+        a2 = System.objects.create(org=org_a, system_name='A2')
+        System.objects.create(org=org_a, system_name='A3')
+        b1 = System.objects.create(org=org_b, system_name='B1', users_total=100)
+        deleted = System.objects.create(org=org_b, system_name='B2', is_deleted=True)
+
+        SystemCost.objects.create(system=a1, initial_investment=Decimal('1000'), development_cost=Decimal('400'))
+        SystemCost.objects.create(system=a2, initial_investment=Decimal('500'), annual_license_cost=Decimal('50'))
+        SystemCost.objects.create(system=b1, annual_personnel_cost=Decimal('70'))
+        SystemCost.objects.create(system=deleted, initial_investment=Decimal('9999'))
+
+    def test_response_contract(self):
+        response = self.client.get('/api/systems/investment_stats/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total_investment'], 1500.0)
+        self.assertEqual(response.data['cost_breakdown'], {
+            'development': 400.0,
+            'license': 50.0,
+            'maintenance': 0,
+            'infrastructure': 0,
+            'personnel': 70.0,
+        })
+        self.assertEqual(
+            [(o['org_name'], o['system_count'], o['total_cost']) for o in response.data['by_organization']],
+            [('Org A', 3, 1500.0), ('Org B', 1, 0)],
+        )
+        self.assertEqual(response.data['cost_efficiency'], {'avg_cost_per_user': 7.5, 'total_users': 200})
+
+    def test_query_count_independent_of_org_count(self):
+        for index in range(5):
+            org = Organization.objects.create(name=f'Extra {index}', code=f'EX{index}')
+            System.objects.create(org=org, system_name=f'X{index}')
+
+        # auth is forced, so only the ETag watermark and the two dashboard
+        # queries hit the database
+        with self.assertNumQueries(3):
+            self.client.get('/api/systems/investment_stats/')
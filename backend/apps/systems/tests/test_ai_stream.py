@@ -0,0 +1,199 @@
+"""
+Tests for the async AI assistant SSE stream (GET /api/systems/ai_query_stream/).
+"""
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.accounts.models import User
+from apps.organizations.models import Organization
+from apps.systems.llm_gateway import reset_circuit_breakers
+from apps.systems.models import AIRequestLog, System
+from apps.systems.views import JSONStringStream, with_keep_alive
+
+
+COUNT_SQL = 'SELECT COUNT(*) as count FROM systems WHERE is_deleted = false'
+
+
+class FakeAsyncOpenAI:
+    """
+    Stands in for openai.AsyncOpenAI: streams ``output`` in small
+    output_text deltas once ``gate`` is set.
+    """
+
+    gate = None
+    calls = 0
+    output = json.dumps({'sql': COUNT_SQL, 'answer': 'Bộ KH&CN hiện có {{count}} hệ thống CNTT.'})
+
+    def __init__(self, **kwargs):
+        self.responses = self
+
+    def with_options(self, **kwargs):
+        return self
+
+    async def create(self, stream=False, **kwargs):
+        FakeAsyncOpenAI.calls += 1
+        await self.gate.wait()
+        return FakeStream(self.output)
+
+
+class FakeStream:
+
+    def __init__(self, output):
+        self.events = self._events(output)
+
+    def __aiter__(self):
+        return self.events
+
+    async def close(self):
+        await self.events.aclose()
+
+    async def _events(self, output):
+        yield SimpleNamespace(type='response.created')
+        for start in range(0, len(output), 8):
+            yield SimpleNamespace(type='response.output_text.delta', delta=output[start:start + 8])
+        yield SimpleNamespace(type='response.completed')
+
+
+def parse_events(body):
+    events = []
+    for block in body.decode('utf-8').strip().split('\n\n'):
+        lines = dict(line.split(': ', 1) for line in block.split('\n'))
+        events.append((lines['event'], json.loads(lines['data'])))
+    return events
+
+
+@override_settings(OPENAI_API_KEY='test-key', CLAUDE_API_KEY=None)
+class AIQueryStreamTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        reset_circuit_breakers()
+        self.client = AsyncClient()
+        self.leader = User.objects.create_user(username='leader', password='x', role='leader')
+        self.token = str(AccessToken.for_user(self.leader))
+        org = Organization.objects.create(name='Org A', code='ORGA')
+        System.objects.create(org=org, system_name='S1')
+        System.objects.create(org=org, system_name='S2')
+
+    async def _stream(self, **params):
+        response = await self.client.get('/api/systems/ai_query_stream/', params)
+        self.assertTrue(response.is_async)
+        return parse_events(b''.join([chunk async for chunk in response.streaming_content]))
+
+    async def test_quick_mode_stream(self):
+        FakeAsyncOpenAI.gate = asyncio.Event()
+        FakeAsyncOpenAI.gate.set()
+
+        with mock.patch('openai.AsyncOpenAI', FakeAsyncOpenAI):
+            events = await self._stream(token=self.token, query='Có bao nhiêu hệ thống?', mode='quick')
+
+        names = [name for name, _ in events]
+        self.assertEqual(
+            [name for name in names if name != 'delta'],
+            ['phase_start', 'phase_complete', 'phase_start', 'phase_complete', 'complete'],
+        )
+        # Answer text arrives in several deltas before phase 1 completes
+        deltas = [data for name, data in events if name == 'delta']
+        self.assertGreater(len(deltas), 1)
+        self.assertLess(names.index('delta'), names.index('phase_complete'))
+        self.assertEqual(''.join(d['text'] for d in deltas), 'Bộ KH&CN hiện có {{count}} hệ thống CNTT.')
+        complete = events[-1][1]
+        self.assertEqual(complete['response']['main_answer'], 'Bộ KH&CN hiện có 2 hệ thống CNTT.')
+        self.assertEqual(complete['data']['total_rows'], 2)
+
+        log = await AIRequestLog.objects.aget(user=self.leader)
+        self.assertEqual([r['model'] for r in log.llm_requests], ['gpt-5.2'])
+        self.assertIsNotNone(log.completed_at)
+
+    async def test_deep_mode_streams_report(self):
+        FakeAsyncOpenAI.gate = asyncio.Event()
+        FakeAsyncOpenAI.gate.set()
+        output = json.dumps({
+            'thinking': {'plan': 'Đếm hệ thống'},
+            'sql': COUNT_SQL,
+            'response': {'greeting': 'Báo cáo anh/chị,', 'main_answer': 'Bộ có **2** hệ thống.'},
+            'is_consistent': True,
+        })
+
+        with mock.patch('openai.AsyncOpenAI', FakeAsyncOpenAI), \
+                mock.patch.object(FakeAsyncOpenAI, 'output', output):
+            events = await self._stream(token=self.token, query='Có bao nhiêu hệ thống?', mode='deep')
+
+        deltas = [data for name, data in events if name == 'delta']
+        self.assertEqual({d['field'] for d in deltas}, {'main_answer'})
+        self.assertEqual(''.join(d['text'] for d in deltas), 'Bộ có **2** hệ thống.')
+        self.assertEqual(events[-1][0], 'complete')
+        self.assertEqual(events[-1][1]['response']['main_answer'], 'Bộ có **2** hệ thống.')
+
+    async def test_other_requests_served_while_stream_waits(self):
+        FakeAsyncOpenAI.gate = asyncio.Event()
+        admin = await User.objects.acreate(username='admin', role='admin')
+        auth = {'Authorization': f'Bearer {AccessToken.for_user(admin)}'}
+
+        with mock.patch('openai.AsyncOpenAI', FakeAsyncOpenAI):
+            streams = [
+                asyncio.ensure_future(self._stream(token=self.token, query=f'Câu hỏi {index}'))
+                for index in range(3)
+            ]
+            await asyncio.sleep(0.1)
+
+            # Every stream is parked on the LLM call; CRUD still answers
+            response = await self.client.get('/api/systems/', headers=auth)
+            self.assertEqual(response.status_code, 200)
+            self.assertFalse(any(stream.done() for stream in streams))
+
+            FakeAsyncOpenAI.gate.set()
+            results = await asyncio.gather(*streams)
+
+        self.assertTrue(all(events[-1][0] == 'complete' for events in results))
+
+    async def test_missing_token(self):
+        events = await self._stream(query='Có bao nhiêu hệ thống?')
+
+        self.assertEqual(events, [('error', {'error': 'Token required'})])
+
+
+class StreamHelpersTestCase(TestCase):
+
+    def test_json_string_stream(self):
+        document = json.dumps({'sql': 'SELECT "answer"', 'answer': 'Dòng 1\n"trích dẫn" 😀', 'x': 1})
+
+        for size in (1, 3, 7):
+            stream = JSONStringStream('answer')
+            text = ''.join(stream.feed(document[i:i + size]) for i in range(0, len(document), size))
+            self.assertEqual(text, 'Dòng 1\n"trích dẫn" 😀')
+            self.assertTrue(stream.done)
+
+    async def test_with_keep_alive(self):
+        async def slow_chunks():
+            yield 'a'
+            await asyncio.sleep(0.05)
+            yield 'b'
+
+        items = [item async for item in with_keep_alive(slow_chunks(), interval=0.01)]
+
+        self.assertEqual([item for item in items if item is not None], ['a', 'b'])
+        self.assertIn(None, items)
+
+    async def test_closing_stream_closes_source(self):
+        closed = asyncio.Event()
+
+        async def endless():
+            try:
+                while True:
+                    await asyncio.sleep(10)
+                    yield 'never'
+            finally:
+                closed.set()
+
+        items = with_keep_alive(endless(), interval=0.01)
+        self.assertIsNone(await items.__anext__())
+        await items.aclose()
+
+        self.assertTrue(closed.is_set())
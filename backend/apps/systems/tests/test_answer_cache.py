@@ -0,0 +1,129 @@
+"""
+Tests for the AI assistant answer cache (apps/systems/answer_cache.py).
+"""
+import asyncio
+import json
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.accounts.models import User
+from apps.organizations.models import Organization
+from apps.systems.answer_cache import answer_cache_key, normalize_query
+from apps.systems.models import CustomPolicy, System
+from apps.systems.tests.test_ai_stream import COUNT_SQL, FakeAsyncOpenAI, parse_events
+
+
+class NormalizeQueryTestCase(TestCase):
+
+    def test_normalize_query(self):
+        self.assertEqual(normalize_query('  Bộ có bao nhiêu HỆ THỐNG?? '), 'bo co bao nhieu he thong')
+        self.assertEqual(normalize_query('Đơn vị:  Văn phòng Bộ, KH&CN'), 'don vi van phong bo kh cn')
+
+    def test_key_depends_on_mode_and_policies(self):
+        key = answer_cache_key('Bộ có bao nhiêu hệ thống?', 'quick', '')
+
+        self.assertEqual(key, answer_cache_key('bo co bao nhieu he thong', 'quick', ''))
+        self.assertNotEqual(key, answer_cache_key('Bộ có bao nhiêu hệ thống?', 'deep', ''))
+        self.assertNotEqual(key, answer_cache_key('Bộ có bao nhiêu hệ thống?', 'quick', 'policy'))
+
+
+@override_settings(OPENAI_API_KEY='test-key', CLAUDE_API_KEY=None, AI_ANSWER_CACHE_ENABLED=True)
+class AnswerCacheStreamTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = AsyncClient()
+        self.leader = User.objects.create_user(username='leader', password='x', role='leader')
+        self.token = str(AccessToken.for_user(self.leader))
+        self.org = Organization.objects.create(name='Org A', code='ORGA')
+        System.objects.create(org=self.org, system_name='S1')
+        System.objects.create(org=self.org, system_name='S2')
+        FakeAsyncOpenAI.gate = asyncio.Event()
+        FakeAsyncOpenAI.gate.set()
+        FakeAsyncOpenAI.calls = 0
+        patcher = mock.patch('openai.AsyncOpenAI', FakeAsyncOpenAI)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def _ask(self, query, **params):
+        response = await self.client.get(
+            '/api/systems/ai_query_stream/', {'token': self.token, 'query': query, **params}
+        )
+        return parse_events(b''.join([chunk async for chunk in response.streaming_content]))
+
+    async def test_repeated_question_served_from_cache(self):
+        first = await self._ask('Bộ có bao nhiêu hệ thống?')
+        self.assertEqual(FakeAsyncOpenAI.calls, 1)
+
+        events = await self._ask('  bo co bao nhieu HE THONG ')
+
+        self.assertEqual(FakeAsyncOpenAI.calls, 1)
+        self.assertEqual([name for name, _ in events], ['complete'])
+        self.assertTrue(events[0][1]['cached'])
+        self.assertEqual(events[0][1]['query'], 'bo co bao nhieu HE THONG')
+        self.assertEqual(events[0][1]['response']['main_answer'], first[-1][1]['response']['main_answer'])
+
+    async def test_data_change_reruns_cached_sql(self):
+        await self._ask('Bộ có bao nhiêu hệ thống?')
+        await System.objects.acreate(org=self.org, system_name='S3')
+
+        events = await self._ask('Bộ có bao nhiêu hệ thống?')
+
+        self.assertEqual(FakeAsyncOpenAI.calls, 1)
+        phase_1 = next(data for name, data in events if name == 'phase_complete' and data['phase'] == 1)
+        self.assertEqual((phase_1['sql'], phase_1['cached']), (COUNT_SQL, True))
+        self.assertEqual(events[-1][1]['response']['main_answer'], 'Bộ KH&CN hiện có 3 hệ thống CNTT.')
+
+        # The refreshed answer is cached for the new data version
+        events = await self._ask('Bộ có bao nhiêu hệ thống?')
+        self.assertEqual([name for name, _ in events], ['complete'])
+
+    async def test_policy_change_misses(self):
+        await self._ask('Bộ có bao nhiêu hệ thống?')
+        await sync_to_async(CustomPolicy.objects.create)(
+            category='accuracy', rule='Luôn kiểm tra lại SQL', priority='high', created_by=self.leader,
+        )
+
+        await self._ask('Bộ có bao nhiêu hệ thống?')
+
+        self.assertEqual(FakeAsyncOpenAI.calls, 2)
+
+    async def test_disabled_without_shared_cache(self):
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}):
+            await self._ask('Bộ có bao nhiêu hệ thống?')
+            await self._ask('Bộ có bao nhiêu hệ thống?')
+
+        self.assertEqual(FakeAsyncOpenAI.calls, 2)
+
+    async def test_follow_up_not_cached(self):
+        context = json.dumps({'previous_query': 'Hệ thống nào dùng Java?'})
+        await self._ask('Bộ có bao nhiêu hệ thống?', context=context)
+        await self._ask('Bộ có bao nhiêu hệ thống?', context=context)
+
+        self.assertEqual(FakeAsyncOpenAI.calls, 2)
+
+    async def test_deep_mode_cache(self):
+        output = json.dumps({
+            'thinking': {'plan': 'Đếm hệ thống'},
+            'sql': COUNT_SQL,
+            'response': {'greeting': 'Báo cáo anh/chị,', 'main_answer': 'Bộ có **2** hệ thống.'},
+            'is_consistent': True,
+        })
+
+        with mock.patch.object(FakeAsyncOpenAI, 'output', output):
+            await self._ask('Bộ có bao nhiêu hệ thống?', mode='deep')
+            calls = FakeAsyncOpenAI.calls
+            events = await self._ask('Bộ có bao nhiêu hệ thống?', mode='deep')
+            self.assertEqual([name for name, _ in events], ['complete'])
+            self.assertEqual(FakeAsyncOpenAI.calls, calls)
+
+            # New data: SQL generation is skipped, the report is rewritten
+            await System.objects.acreate(org=self.org, system_name='S3')
+            events = await self._ask('Bộ có bao nhiêu hệ thống?', mode='deep')
+
+        self.assertEqual(FakeAsyncOpenAI.calls, calls + 2)  # Phase 3 report + Phase 4 review
+        self.assertEqual(events[-1][1]['data']['rows'], [{'count': 3}])
@@ -0,0 +1,114 @@
+"""
+Tests for streamed downloads served by the ASGI handler (apps/systems/streaming.py).
+"""
+import asyncio
+import io
+import json
+import os
+import shutil
+import tempfile
+import warnings
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.core.handlers.asgi import ASGIHandler
+from django.test import TransactionTestCase, override_settings
+from openpyxl import load_workbook
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.accounts.models import User
+from apps.organizations.models import Organization
+from apps.systems import exports
+from apps.systems.models import ExportJob, System
+from apps.systems.streaming import FILE_BLOCK_SIZE
+
+
+class ASGIStreamingTestCase(TransactionTestCase):
+    """
+    Requests go through ASGIHandler as under uvicorn; views run in its
+    thread-sensitive executor, hence TransactionTestCase.
+    """
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='x', role='admin')
+        self.org = Organization.objects.create(name='Org A', code='ORGA')
+        for index in range(3):
+            System.objects.create(org=self.org, system_name=f'S{index}')
+        self.events = []
+
+    def _get(self, path, query_string=b''):
+        """Send a GET through ASGIHandler; returns (status, headers, body)"""
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+            'method': 'GET', 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+            'query_string': query_string, 'root_path': '',
+            'headers': [
+                (b'host', b'testserver'),
+                (b'authorization', f'Bearer {AccessToken.for_user(self.admin)}'.encode()),
+            ],
+            'client': ('127.0.0.1', 50000), 'server': ('testserver', 80),
+        }
+        messages = []
+
+        async def receive():
+            if not messages:
+                messages.append(None)
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+            await asyncio.Future()  # The client never disconnects
+
+        async def send(message):
+            if message['type'] == 'http.response.body' and message.get('body'):
+                self.events.append('sent')
+            messages.append(message)
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            async_to_sync(ASGIHandler())(scope, receive, send)
+        # Django falls back to buffering sync iterators with this warning
+        self.assertFalse([w for w in caught if 'synchronous iterators' in str(w.message)])
+
+        start = next(message for message in messages[1:] if message['type'] == 'http.response.start')
+        body = b''.join(message.get('body', b'') for message in messages[1:] if message['type'] == 'http.response.body')
+        return start['status'], dict(start['headers']), body
+
+    def test_flat_export_sends_first_rows_before_reading_the_rest(self):
+        stream_flat_export = exports.stream_flat_export
+
+        def logged(*args, **kwargs):
+            for line in stream_flat_export(*args, **kwargs):
+                self.events.append('read')
+                yield line
+            self.events.append('exhausted')
+
+        with mock.patch.object(exports, 'stream_flat_export', logged), \
+                mock.patch.object(exports, 'EXPORT_CHUNK_SIZE', 1):
+            status, _headers, body = self._get('/api/systems/export_data/', b'format=ndjson')
+
+        self.assertEqual(status, 200)
+        self.assertEqual([json.loads(line)['system_name'] for line in body.splitlines()], ['S0', 'S1', 'S2'])
+        # Each row goes out before the next one is read
+        self.assertEqual(self.events, ['read', 'sent'] * 3 + ['exhausted'])
+
+    def test_export_xlsx(self):
+        status, headers, body = self._get('/api/systems/export_xlsx/')
+
+        self.assertEqual(status, 200)
+        self.assertEqual(int(headers[b'Content-Length']), len(body))
+        systems = [row[1] for row in load_workbook(io.BytesIO(body))['3. Danh sách HT'].iter_rows(min_row=2, values_only=True)]
+        self.assertEqual(systems, ['S0', 'S1', 'S2'])
+
+    def test_export_job_download_reads_file_in_blocks(self):
+        export_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, export_root, ignore_errors=True)
+        content = os.urandom(FILE_BLOCK_SIZE * 2 + 10)
+        with open(os.path.join(export_root, 'artifact.xlsx'), 'wb') as artifact:
+            artifact.write(content)
+        job = ExportJob.objects.create(user=self.admin, cache_key='k', status='success', file_path='artifact.xlsx')
+
+        with override_settings(EXPORT_ROOT=export_root):
+            status, headers, body = self._get(f'/api/export-jobs/{job.pk}/download/')
+
+        self.assertEqual(status, 200)
+        self.assertEqual(headers[b'Content-Length'], str(len(content)).encode())
+        self.assertEqual(body, content)
+        self.assertEqual(self.events, ['sent'] * 3)
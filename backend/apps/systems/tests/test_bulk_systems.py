@@ -0,0 +1,139 @@
+"""
+Tests for bulk create/update (POST /api/systems/bulk/).
+"""
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.organizations.models import Organization
+from apps.systems.cache import get_data_version
+from apps.systems.models import (
+    System,
+    SystemArchitecture,
+    SystemCost,
+    SystemIntegrationConnection,
+)
+from apps.systems.utils import calculate_system_completion_percentage
+
+
+class BulkSystemsTestCase(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(username='admin', password='x', role='admin')
+        self.client.force_authenticate(user=self.admin)
+        self.org = Organization.objects.create(name='Org A', code='ORGA')
+        self.other_org = Organization.objects.create(name='Org B', code='ORGB')
+        self.url = '/api/systems/bulk/'
+        self.connection_fields = {'data_objects': 'Hồ sơ', 'frequency': 'batch_daily'}
+
+    def _payload(self, name, **extra):
+        return {'org': self.org.id, 'system_name': name, **extra}
+
+    def test_create(self):
+        response = self.client.post(self.url, [
+            self._payload('S1', architecture_data={'backend_tech': ['python']}),
+            self._payload('S2', form_level=2, cost_data={'initial_investment': '1000'},
+                          integration_connections_data=[{'source_system': 'S2', 'target_system': 'X', **self.connection_fields}]),
+        ], format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['created'], response.data['errors']), (2, 0))
+        codes = [result['system_code'] for result in response.data['results']]
+        self.assertEqual(codes[1][-4:], '0002')
+        self.assertEqual(codes[0][:-4], codes[1][:-4])
+
+        s1 = System.objects.get(system_name='S1')
+        s2 = System.objects.get(system_name='S2')
+        self.assertEqual(s1.architecture.backend_tech, 'python')
+        # Level 1 sub-models always exist, level 2 only for form_level 2
+        self.assertTrue(hasattr(s1, 'assessment'))
+        self.assertFalse(SystemCost.objects.filter(system=s1).exists())
+        self.assertEqual(str(s2.cost.initial_investment), '1000.00')
+        self.assertEqual(s2.integration_connections.get().target_system, 'X')
+
+        # Stored derived values match the per-system calculation
+        s1 = System.objects.select_related('architecture', 'data_info', 'operations', 'assessment').get(pk=s1.pk)
+        self.assertEqual(s1.completion_percentage, calculate_system_completion_percentage(s1))
+        self.assertIsNotNone(s1.roadmap_phase)
+
+    def test_update_and_errors(self):
+        system = System.objects.create(org=self.org, system_name='Old')
+        SystemArchitecture.objects.create(system=system, backend_tech='java')
+        SystemIntegrationConnection.objects.create(system=system, source_system='Old', target_system='A')
+        version = get_data_version()
+
+        response = self.client.post(self.url, {'systems': [
+            {'id': system.id, 'system_name': 'New', 'architecture_data': {'frontend_tech': ['react']},
+             'integration_connections_data': [{'source_system': 'New', 'target_system': 'B', **self.connection_fields}]},
+            {'id': 999999, 'system_name': 'Missing'},
+            {'system_name': 'No org'},
+            {'id': system.id, 'system_name': 'Twice'},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [result['status'] for result in response.data['results']],
+            ['updated', 'error', 'error', 'error'],
+        )
+        self.assertIn('id', response.data['results'][1]['errors'])
+        self.assertIn('org', response.data['results'][2]['errors'])
+
+        system.refresh_from_db()
+        self.assertEqual(system.system_name, 'New')
+        self.assertEqual(system.architecture.backend_tech, 'java')
+        self.assertEqual(system.architecture.frontend_tech, 'react')
+        self.assertEqual(list(system.integration_connections.values_list('target_system', flat=True)), ['B'])
+        self.assertNotEqual(get_data_version(), version)
+
+    def test_atomic(self):
+        response = self.client.post(f'{self.url}?atomic=true', [
+            self._payload('S1'),
+            {'system_name': 'No org'},
+        ], format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([r['status'] for r in response.data['results']], ['skipped', 'error'])
+        self.assertFalse(System.objects.exists())
+
+    def test_org_user_scope(self):
+        foreign = System.objects.create(org=self.other_org, system_name='Foreign')
+        self.client.force_authenticate(
+            user=User.objects.create_user(username='org', password='x', role='org_user', organization=self.org)
+        )
+
+        response = self.client.post(self.url, [
+            {'system_name': 'Mine', 'org': self.other_org.id},
+            {'id': foreign.id, 'system_name': 'Hijacked'},
+        ], format='json')
+
+        self.assertEqual([r['status'] for r in response.data['results']], ['created', 'error'])
+        self.assertEqual(System.objects.get(system_name='Mine').org, self.org)
+        foreign.refresh_from_db()
+        self.assertEqual(foreign.system_name, 'Foreign')
+
+    def test_leader_forbidden(self):
+        self.client.force_authenticate(user=User.objects.create_user(username='leader', password='x', role='leader'))
+
+        response = self.client.post(self.url, [self._payload('S1')], format='json')
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_writes_are_set_based(self):
+        """Write queries do not grow with the number of systems."""
+        def write_queries(count, prefix):
+            payload = [
+                self._payload(f'{prefix}{index}', form_level=2, architecture_data={'has_cicd': True},
+                              integration_connections_data=[{'source_system': 'a', 'target_system': 'b', **self.connection_fields}])
+                for index in range(count)
+            ]
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(self.url, payload, format='json')
+            self.assertEqual(response.data['created'], count)
+            return [q['sql'] for q in queries if q['sql'].startswith(('INSERT', 'UPDATE', 'DELETE'))]
+
+        # One statement per table (SQLite may split a large INSERT into
+        # batches because of its bound-parameter limit)
+        self.assertLessEqual(len(write_queries(20, 'b')), len(write_queries(2, 'a')) + 2)
@@ -0,0 +1,246 @@
+"""
+Tests for the persisted System.completion_percentage / completion_status.
+"""
+import importlib
+from io import StringIO
+
+from django.apps import apps
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.organizations.models import Organization
+from apps.systems.models import System, SystemArchitecture, SystemAssessment
+from apps.systems.utils import calculate_system_completion_percentage
+
+
+def expected_completion(system):
+    return calculate_system_completion_percentage(System.objects.get(pk=system.pk))
+
+
+class CompletionSignalsTestCase(TestCase):
+    """Stored completion follows saves of System and its sub-models."""
+
+    def setUp(self):
+        self.org = Organization.objects.create(name='Org A', code='ORGA')
+        self.system = System.objects.create(
+            org=self.org, system_name='S1', purpose='Quản lý', business_owner='A'
+        )
+
+    def test_system_save_stores_completion(self):
+        self.system.refresh_from_db()
+        self.assertGreater(self.system.completion_percentage, 0)
+        self.assertEqual(self.system.completion_percentage, expected_completion(self.system))
+        self.assertEqual(
+            self.system.completion_status['total_required_fields'] - len(self.system.completion_status['incomplete_fields']),
+            self.system.completion_status['filled_fields'],
+        )
+
+    def test_sub_model_save_and_delete_refresh_completion(self):
+        before = System.objects.get(pk=self.system.pk).completion_percentage
+
+        architecture = SystemArchitecture.objects.create(
+            system=self.system, backend_tech='Django', frontend_tech='React', hosting_type='cloud',
+        )
+        after_create = System.objects.get(pk=self.system.pk).completion_percentage
+        self.assertGreater(after_create, before)
+        self.assertEqual(after_create, expected_completion(self.system))
+
+        architecture.delete()
+        self.assertEqual(System.objects.get(pk=self.system.pk).completion_percentage, before)
+
+    def test_assessment_update_refreshes_completion(self):
+        assessment = SystemAssessment.objects.create(system=self.system)
+        assessment.recommendation = 'keep'
+        assessment.save()
+
+        stored = System.objects.get(pk=self.system.pk).completion_percentage
+        self.assertEqual(stored, expected_completion(self.system))
+
+
+class RefreshCompletionCommandTestCase(TestCase):
+    """refresh_completion backfills and --verify detects drift."""
+
+    def setUp(self):
+        org = Organization.objects.create(name='Org A', code='ORGA')
+        self.system = System.objects.create(org=org, system_name='S1', purpose='Quản lý')
+        # Bulk update bypasses signals
+        System.objects.filter(pk=self.system.pk).update(completion_percentage=0.0, completion_status={})
+
+    def test_verify_reports_drift_without_writing(self):
+        with self.assertRaises(CommandError):
+            call_command('refresh_completion', '--verify', stdout=StringIO())
+        self.assertEqual(System.objects.get(pk=self.system.pk).completion_percentage, 0.0)
+
+    def test_backfill_fixes_drift(self):
+        call_command('refresh_completion', stdout=StringIO())
+        self.assertEqual(
+            System.objects.get(pk=self.system.pk).completion_percentage,
+            expected_completion(self.system),
+        )
+        call_command('refresh_completion', '--verify', stdout=StringIO())
+
+
+class CompletionStatsEndpointTestCase(TestCase):
+    """completion_stats filters, orders and paginates in the database."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.create_user(username='admin', password='x', role='admin'))
+        org_a = Organization.objects.create(name='Org A', code='ORGA')
+        Organization.objects.create(name='Org B', code='ORGB')
+        for name, percentage in [('Low', 10.0), ('Mid', 60.0), ('Full', 100.0)]:
+            system = System.objects.create(org=org_a, system_name=name)
+            System.objects.filter(pk=system.pk).update(
+                completion_percentage=percentage,
+                completion_status={'incomplete_fields': [], 'filled_fields': 1, 'total_required_fields': 1},
+            )
+
+    def test_range_filter_and_ordering(self):
+        response = self.client.get('/api/systems/completion_stats/', {
+            'completion_min': 50, 'ordering': '-completion_percentage',
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([s['system_name'] for s in response.data['results']], ['Full', 'Mid'])
+        self.assertEqual(response.data['summary']['avg_completion_all'], 80.0)
+        self.assertEqual(response.data['summary']['systems_100_percent'], 1)
+        organizations = {o['name']: o for o in response.data['summary']['organizations']}
+        self.assertEqual(organizations['Org A']['system_count'], 2)
+        self.assertEqual(organizations['Org B']['system_count'], 0)
+
+    def test_invalid_range_filter(self):
+        response = self.client.get('/api/systems/completion_stats/', {'completion_min': 'abc'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('completion_min', response.data)
+
+    def test_pagination(self):
+        response = self.client.get('/api/systems/completion_stats/', {
+            'page': 1, 'page_size': 2, 'ordering': 'completion_percentage',
+        })
+
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual([s['system_name'] for s in response.data['results']], ['Low', 'Mid'])
+        self.assertIsNotNone(response.data['next'])
+
+    def test_list_filter_and_ordering(self):
+        response = self.client.get('/api/systems/', {'completion_max': 60, 'ordering': 'completion_percentage'})
+
+        self.assertEqual([s['system_name'] for s in response.data['results']], ['Low', 'Mid'])
+        self.assertEqual(response.data['results'][0]['completion_percentage'], 10.0)
+
+
+class CompletionBatchTestCase(TestCase):
+    """compute_completion_batch matches the per-instance calculator exactly."""
+
+    def setUp(self):
+        from apps.systems.management.commands.benchmark_completion import build_random_systems
+
+        self.org = Organization.objects.create(name='Org A', code='ORGA')
+        build_random_systems(self.org, 300, seed=7)
+
+    def test_matches_per_instance_calculation(self):
+        from apps.systems.utils import COMPLETION_RELATED_FIELDS, compute_completion_batch
+
+        queryset = System.objects.filter(org=self.org)
+        expected = {
+            system.pk: calculate_system_completion_percentage(system)
+            for system in queryset.select_related(*COMPLETION_RELATED_FIELDS)
+        }
+
+        with self.assertNumQueries(1):
+            actual = compute_completion_batch(queryset)
+
+        self.assertEqual(actual, expected)
+        self.assertEqual(
+            [repr(actual[pk]) for pk in expected],
+            [repr(expected[pk]) for pk in expected],
+        )
+        # The random fixtures exercise the go-live and cloud special cases
+        self.assertTrue(queryset.filter(is_go_live=True).exists())
+        self.assertTrue(queryset.filter(architecture__hosting_type='cloud').exists())
+
+    def test_empty_queryset(self):
+        from apps.systems.utils import compute_completion_batch
+
+        self.assertEqual(compute_completion_batch(System.objects.none()), {})
+
+
+    def test_migration_backfill_matches_utils(self):
+        """The frozen copy in migration 0031 stores what utils.py computes."""
+        migration = importlib.import_module('apps.systems.migrations.0031_add_system_completion_fields')
+        from apps.systems.utils import COMPLETION_RELATED_FIELDS, get_completion_snapshot
+
+        expected = [
+            (snapshot['percentage'], snapshot['status'])
+            for snapshot in map(get_completion_snapshot, System.objects.select_related(*COMPLETION_RELATED_FIELDS).order_by('pk'))
+        ]
+
+        migration.backfill_completion(apps, None)
+
+        self.assertEqual(
+            list(System.objects.order_by('pk').values_list('completion_percentage', 'completion_status')),
+            expected,
+        )
+
+
+class CompletionExpressionTestCase(TestCase):
+    """The SQL completion expression agrees with the Python rules."""
+
+    def test_matches_python_on_random_systems(self):
+        from apps.systems.management.commands.benchmark_completion import build_random_systems
+        from apps.systems.utils import COMPLETION_RELATED_FIELDS
+
+        for seed in range(5):
+            org = Organization.objects.create(name=f'Org {seed}', code=f'ORG{seed}')
+            build_random_systems(org, 100, seed=seed)
+            queryset = System.objects.filter(org=org)
+
+            expected = {
+                system.pk: calculate_system_completion_percentage(system)
+                for system in queryset.select_related(*COMPLETION_RELATED_FIELDS)
+            }
+            actual = dict(queryset.with_completion().values_list('pk', 'completion'))
+
+            mismatched = {pk: (expected[pk], actual[pk]) for pk in expected if expected[pk] != actual[pk]}
+            self.assertEqual(mismatched, {}, f'seed={seed}')
+
+    def test_rounding_matches_python(self):
+        """SQL rounds like float round(): 15/48 = 31.25% gives 31.2 on both sides."""
+        from django.db.models import Value
+        from apps.systems.utils import percentage_expression, round_percentage
+
+        org = Organization.objects.create(name='Org A', code='ORGA')
+        System.objects.create(org=org, system_name='S1')
+
+        for required in (16, 32, 48, 49, 50, 56, 64, 80):
+            pairs = [(filled, required) for filled in range(required + 1)]
+            actual = System.objects.annotate(**{
+                f'p{filled}': percentage_expression(Value(filled), Value(required), max_required=80)
+                for filled, required in pairs
+            }).values_list(*[f'p{filled}' for filled, _required in pairs]).get()
+            self.assertEqual(list(actual), [round_percentage(*pair) for pair in pairs], required)
+
+        self.assertEqual(
+            [round_percentage(filled, 48) for filled in (3, 15, 27, 33)],
+            [6.2, 31.2, 56.2, 68.8],
+        )
+
+    def test_filter_and_order_by_completion(self):
+        org = Organization.objects.create(name='Org A', code='ORGA')
+        empty = System.objects.create(org=org, system_name='Empty')
+        fuller = System.objects.create(
+            org=org, system_name='Fuller', purpose='Quản lý', business_owner='A', is_go_live=False,
+        )
+
+        ordered = list(System.objects.with_completion().order_by('-completion').values_list('pk', flat=True))
+        self.assertEqual(ordered, [fuller.pk, empty.pk])
+
+        threshold = expected_completion(fuller)
+        self.assertEqual(
+            list(System.objects.with_completion().filter(completion__gte=threshold).values_list('pk', flat=True)),
+            [fuller.pk],
+        )
@@ -0,0 +1,104 @@
+"""
+Tests for GET /api/systems/dashboard_bundle/.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.organizations.models import Organization
+from apps.systems.models import System, SystemAssessment
+
+
+def create_fixtures():
+    org_a = Organization.objects.create(name='Org A', code='ORGA')
+    org_b = Organization.objects.create(name='Org B', code='ORGB')
+    s1 = System.objects.create(org=org_a, system_name='S1', status='operating', api_provided_count=2)
+    System.objects.create(org=org_a, system_name='S2', status='stopped')
+    System.objects.create(org=org_b, system_name='S3', status='operating', hosting_platform='cloud')
+    SystemAssessment.objects.create(system=s1, recommendation='replace', performance_rating=4)
+
+
+class DashboardBundleTestCase(TestCase):
+    """The bundle returns exactly what the standalone actions return."""
+
+    def setUp(self):
+        cache.clear()
+        create_fixtures()
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.create_user(username='leader', password='x', role='leader'))
+
+    def test_sections_match_standalone_actions(self):
+        response = self.client.get('/api/systems/dashboard_bundle/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data['sections']), {
+            'strategic_stats', 'investment_stats', 'integration_stats', 'optimization_stats',
+            'monitoring_stats', 'insights', 'roadmap_stats',
+        })
+        cache.clear()
+        for name, payload in response.data['sections'].items():
+            standalone = self.client.get(f'/api/systems/{name}/')
+            self.assertEqual(payload, standalone.data, name)
+
+    def test_requested_sections_and_metadata(self):
+        response = self.client.get('/api/systems/dashboard_bundle/', {'sections': 'insights,strategic_stats'})
+
+        self.assertEqual(list(response.data['sections']), ['insights', 'strategic_stats'])
+        meta = response.data['meta']
+        self.assertEqual(set(meta['sections']), {'insights', 'strategic_stats'})
+        self.assertFalse(meta['sections']['insights']['cached'])
+        self.assertGreaterEqual(meta['total_duration_ms'], 0)
+
+        # The second call is served from the per-section cache
+        again = self.client.get('/api/systems/dashboard_bundle/', {'sections': 'insights'})
+        self.assertTrue(again.data['meta']['sections']['insights']['cached'])
+
+    def test_shares_cache_with_standalone_action(self):
+        self.client.get('/api/systems/monitoring_stats/')
+        response = self.client.get('/api/systems/dashboard_bundle/', {'sections': 'monitoring_stats'})
+        self.assertTrue(response.data['meta']['sections']['monitoring_stats']['cached'])
+
+    def test_unknown_section(self):
+        response = self.client.get('/api/systems/dashboard_bundle/', {'sections': 'insights,nope'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('insights', response.data['available_sections'])
+
+    def test_forbidden_for_org_user(self):
+        self.client.force_authenticate(user=User.objects.create_user(username='unit', password='x', role='org_user'))
+        response = self.client.get('/api/systems/dashboard_bundle/')
+        self.assertEqual(response.status_code, 403)
+
+
+class DashboardBundleParallelTestCase(TransactionTestCase):
+    """Outside a transaction, sections are computed on the thread pool."""
+
+    def setUp(self):
+        cache.clear()
+        create_fixtures()
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.create_user(username='leader', password='x', role='leader'))
+
+    def test_parallel_matches_sequential(self):
+        response = self.client.get('/api/systems/dashboard_bundle/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(response.data['meta']['workers'], 1)
+        self.assertEqual(response.data['sections']['strategic_stats']['overview']['total_systems'], 3)
+        self.assertEqual(response.data['sections']['optimization_stats']['recommendations']['replace'], 1)
+
+    def test_pool_shared_across_requests(self):
+        from apps.systems.views import get_dashboard_executor
+
+        with mock.patch('apps.systems.views.ThreadPoolExecutor', wraps=ThreadPoolExecutor) as pool_class:
+            for _ in range(3):
+                self.client.get('/api/systems/dashboard_bundle/')
+
+        # At most the lazily created process-wide pool, never one per request
+        self.assertLessEqual(pool_class.call_count, 1)
+        self.assertIs(get_dashboard_executor(), get_dashboard_executor())
+        self.assertEqual(get_dashboard_executor()._max_workers, settings.DASHBOARD_BUNDLE_MAX_WORKERS)
@@ -0,0 +1,164 @@
+"""
+Tests for the versioned dashboard cache.
+"""
+import time
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.organizations.models import Organization
+from apps.systems.cache import bump_data_version, get_data_version
+from apps.systems.models import System, SystemCost, SystemIntegrationConnection
+
+
+class DataVersionTestCase(TestCase):
+    """Writes to dashboard models bump the data version."""
+
+    def setUp(self):
+        cache.clear()
+        self.org = Organization.objects.create(name='Org A', code='ORGA')
+        self.system = System.objects.create(org=self.org, system_name='S1')
+
+    def assertBumps(self, write):
+        before = get_data_version()
+        write()
+        self.assertGreater(get_data_version(), before)
+
+    def test_system_and_sub_model_writes(self):
+        self.assertBumps(lambda: System.objects.create(org=self.org, system_name='S2'))
+        self.assertBumps(lambda: SystemCost.objects.create(system=self.system))
+        self.assertBumps(lambda: self.system.delete())
+
+    def test_integration_connection_and_organization_writes(self):
+        self.assertBumps(lambda: SystemIntegrationConnection.objects.create(
+            system=self.system, source_system='S1', target_system='LGSP',
+            data_objects='Hồ sơ', integration_method='api_rest',
+        ))
+        self.assertBumps(lambda: Organization.objects.create(name='Org B', code='ORGB'))
+
+    def test_bump_recovers_from_evicted_version(self):
+        cache.clear()
+        bump_data_version()
+        self.assertGreater(get_data_version(), 1)
+
+    def test_evicted_version_reseeded_from_clock(self):
+        cache.clear()
+        self.assertGreaterEqual(get_data_version(), int(time.time()) - 1)
+
+
+DUMMY_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+
+@override_settings(CACHES=DUMMY_CACHES)
+class NoSharedCacheTestCase(TestCase):
+    """Without a shared cache nothing is cached nor answered with 304."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.create_user(username='leader', password='x', role='leader'))
+        self.org = Organization.objects.create(name='Org A', code='ORGA')
+        System.objects.create(org=self.org, system_name='S1', status='operating')
+
+    def test_dashboard_not_cached(self):
+        self.assertEqual(get_data_version(), 0)
+
+        response = self.client.get('/api/systems/strategic_stats/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('X-Cache', response)
+
+    def test_no_conditional_get(self):
+        response = self.client.get('/api/systems/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response)
+
+
+class CachedDashboardTestCase(TestCase):
+    """Strategic endpoints are served from cache until data changes."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.leader = User.objects.create_user(username='leader', password='x', role='leader')
+        self.org = Organization.objects.create(name='Org A', code='ORGA')
+        System.objects.create(org=self.org, system_name='S1', status='operating')
+
+    def test_hit_until_write(self):
+        self.client.force_authenticate(user=self.leader)
+
+        first = self.client.get('/api/systems/strategic_stats/')
+        self.assertEqual(first['X-Cache'], 'MISS')
+
+        # Only the ETag watermark query runs
+        with self.assertNumQueries(1):
+            second = self.client.get('/api/systems/strategic_stats/')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.data, first.data)
+
+        System.objects.create(org=self.org, system_name='S2', status='operating')
+        third = self.client.get('/api/systems/strategic_stats/')
+        self.assertEqual(third['X-Cache'], 'MISS')
+        self.assertEqual(third.data['overview']['total_systems'], 2)
+
+    def test_key_includes_role(self):
+        org_user = User.objects.create_user(username='unit', password='x', role='org_user', organization=self.org)
+        self.client.force_authenticate(user=self.leader)
+        self.client.get('/api/systems/insights/')
+
+        self.client.force_authenticate(user=org_user)
+        response = self.client.get('/api/systems/insights/')
+
+        self.assertEqual(response.status_code, 403)
+        self.assertNotIn('X-Cache', response)
+
+
+class ConditionalGetTestCase(TestCase):
+    """ETag / Last-Modified and 304 responses on read-heavy endpoints."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.org = Organization.objects.create(name='Org A', code='ORGA')
+        self.system = System.objects.create(org=self.org, system_name='S1')
+        self.admin = User.objects.create_user(username='admin', password='x', role='admin')
+        self.client.force_authenticate(user=self.admin)
+
+    def test_list_not_modified_until_write(self):
+        first = self.client.get('/api/systems/')
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first['ETag'].startswith('"'))
+        self.assertIn('Last-Modified', first)
+
+        with self.assertNumQueries(1):
+            second = self.client.get('/api/systems/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+        System.objects.create(org=self.org, system_name='S2')
+        third = self.client.get('/api/systems/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(third.status_code, 200)
+        self.assertNotEqual(third['ETag'], first['ETag'])
+
+    def test_detail_changes_with_sub_model(self):
+        url = f'/api/systems/{self.system.pk}/'
+        etag = self.client.get(url)['ETag']
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        SystemCost.objects.create(system=self.system)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_etag_depends_on_query_string(self):
+        etag = self.client.get('/api/systems/completion_stats/')['ETag']
+        response = self.client.get('/api/systems/completion_stats/', {'ordering': '-system_name'},
+                                   HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_unit_progress(self):
+        url = '/api/systems/dashboard/unit-progress/'
+        etag = self.client.get(url, {'org_id': self.org.pk})['ETag']
+        self.assertEqual(self.client.get(url, {'org_id': self.org.pk}, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        # Error responses carry no validators
+        self.assertNotIn('ETag', self.client.get(url))
@@ -0,0 +1,108 @@
+"""
+Tests for the materialized strategic dashboard snapshots.
+"""
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.organizations.models import Organization
+from apps.systems.models import DashboardSnapshot, System, SystemAssessment
+from apps.systems.snapshots import read_snapshot, refresh_snapshots, schedule_snapshot_refresh
+from apps.systems.tasks import refresh_dashboard_snapshots
+from apps.systems.views import SystemViewSet
+
+
+class DashboardSnapshotTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.org = Organization.objects.create(name='Org A', code='ORGA')
+        s1 = System.objects.create(org=self.org, system_name='S1', status='operating', hosting_platform='cloud')
+        System.objects.create(org=self.org, system_name='S2', status='stopped', hosting_platform='on_premise')
+        SystemAssessment.objects.create(system=s1, recommendation='keep')
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.create_user(username='leader', password='x', role='leader'))
+
+    def test_refresh_stores_every_section(self):
+        durations = refresh_snapshots()
+
+        self.assertEqual(set(durations), set(SystemViewSet.DASHBOARD_SECTIONS))
+        self.assertEqual(DashboardSnapshot.objects.count(), len(SystemViewSet.DASHBOARD_SECTIONS))
+
+        snapshot = read_snapshot('strategic_stats')
+        self.assertIn('generated_at', snapshot)
+        self.assertEqual(snapshot['hosting_distribution']['cloud'], 1)
+        self.assertEqual(snapshot['hosting_distribution']['on_premise'], 1)
+
+    def test_snapshot_matches_live_payload(self):
+        live = json.loads(self.client.get('/api/systems/strategic_stats/').content)
+        refresh_snapshots(['strategic_stats'])
+
+        with override_settings(DASHBOARD_SNAPSHOTS_ENABLED=True):
+            cache.clear()
+            served = json.loads(self.client.get('/api/systems/strategic_stats/').content)
+
+        self.assertIn('generated_at', served)
+        served.pop('generated_at')
+        self.assertEqual(served, live)
+
+    @override_settings(DASHBOARD_SNAPSHOTS_ENABLED=True)
+    def test_endpoint_reads_snapshot(self):
+        refresh_snapshots(['strategic_stats'])
+        # Not refreshed yet: the change is only visible after the task runs
+        System.objects.filter(system_name='S2').update(status='operating')
+        cache.clear()
+
+        with self.assertNumQueries(2):  # ETag watermark + snapshot row
+            response = self.client.get('/api/systems/strategic_stats/')
+        self.assertEqual(response.data['status_distribution']['operating'], 1)
+
+    @override_settings(DASHBOARD_SNAPSHOTS_ENABLED=True)
+    def test_missing_snapshot_falls_back_to_live(self):
+        response = self.client.get('/api/systems/insights/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('generated_at', response.data)
+
+    @override_settings(DASHBOARD_SNAPSHOTS_ENABLED=True)
+    def test_refresh_invalidates_cached_section(self):
+        refresh_snapshots(['strategic_stats'])
+        System.objects.create(org=self.org, system_name='S3', status='operating')
+        first = self.client.get('/api/systems/strategic_stats/')
+        self.assertEqual(first.data['overview']['total_systems'], 2)  # Snapshot not refreshed yet
+
+        refresh_snapshots(['strategic_stats'])
+
+        second = self.client.get('/api/systems/strategic_stats/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second['X-Cache'], 'MISS')
+        self.assertEqual(second.data['overview']['total_systems'], 3)
+
+    def test_task_skipped_while_disabled(self):
+        result = refresh_dashboard_snapshots()
+
+        self.assertEqual(result['status'], 'skipped')
+        self.assertFalse(DashboardSnapshot.objects.exists())
+
+    def test_debounced_schedule(self):
+        with mock.patch.object(refresh_dashboard_snapshots, 'apply_async') as apply_async:
+            schedule_snapshot_refresh()
+            schedule_snapshot_refresh()
+            schedule_snapshot_refresh()
+            self.assertEqual(apply_async.call_count, 1)
+
+            # The task clears the pending marker, so the next write schedules again
+            refresh_dashboard_snapshots()
+            schedule_snapshot_refresh()
+            self.assertEqual(apply_async.call_count, 2)
+
+    @override_settings(DASHBOARD_SNAPSHOTS_ENABLED=True)
+    def test_data_change_schedules_refresh(self):
+        with mock.patch.object(refresh_dashboard_snapshots, 'apply_async') as apply_async:
+            with self.captureOnCommitCallbacks(execute=True):
+                System.objects.create(org=self.org, system_name='S3')
+        self.assertEqual(apply_async.call_count, 1)
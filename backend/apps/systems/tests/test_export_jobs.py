@@ -0,0 +1,152 @@
+"""
+Tests for background export jobs (/api/export-jobs/).
+"""
+import io
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from openpyxl import load_workbook
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.organizations.models import Organization
+from apps.systems.exports import write_systems_workbook
+from apps.systems.models import ExportJob, System
+from apps.systems.tasks import prune_export_artifacts, run_export_job
+
+
+class ExportJobTestCase(TestCase):
+
+    def setUp(self):
+        self.export_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.export_root, ignore_errors=True)
+        settings_override = override_settings(EXPORT_ROOT=self.export_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.client = APIClient()
+        self.admin = User.objects.create_user(username='admin', password='x', role='admin')
+        self.client.force_authenticate(user=self.admin)
+        self.org = Organization.objects.create(name='Org A', code='ORGA')
+        System.objects.create(org=self.org, system_name='S1', status='operating')
+        System.objects.create(org=self.org, system_name='S2', status='pilot')
+
+    def _start(self, data=None):
+        # Queuing happens on commit; the test runs the task itself instead
+        with self.captureOnCommitCallbacks(execute=False):
+            return self.client.post('/api/export-jobs/', data or {}, format='json')
+
+    def test_start_progress_and_download(self):
+        response = self._start({'status': 'operating'})
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['status'], 'pending')
+        self.assertEqual(response.data['params'], {'status': 'operating', 'org_scope': 'all'})
+        job_id = response.data['id']
+
+        run_export_job(job_id)
+
+        response = self.client.get(f'/api/export-jobs/{job_id}/')
+        self.assertEqual(response.data['status'], 'success')
+        self.assertEqual((response.data['rows_processed'], response.data['rows_total']), (1, 1))
+        self.assertEqual(response.data['progress'], 100)
+        self.assertTrue(response.data['download_url'].endswith(f'/api/export-jobs/{job_id}/download/'))
+
+        response = self.client.get(f'/api/export-jobs/{job_id}/download/')
+        self.assertEqual(response.status_code, 200)
+        wb = load_workbook(io.BytesIO(b''.join(response.streaming_content)))
+        systems = [row[1] for row in wb['3. Danh sách HT'].iter_rows(min_row=2, values_only=True)]
+        self.assertEqual(systems, ['S1'])
+
+    def test_identical_export_reuses_job(self):
+        job_id = self._start().data['id']
+
+        response = self._start()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['id'], job_id)
+
+        run_export_job(job_id)
+        self.assertEqual(self._start().data['id'], job_id)
+
+        # Different filters or changed data need a new artifact
+        self.assertNotEqual(self._start({'search': 'S2'}).data['id'], job_id)
+        System.objects.create(org=self.org, system_name='S3')
+        self.assertNotEqual(self._start().data['id'], job_id)
+
+    def test_missing_artifact_is_not_reused(self):
+        job_id = self._start().data['id']
+        run_export_job(job_id)
+        shutil.rmtree(self.export_root)
+
+        self.assertEqual(self.client.get(f'/api/export-jobs/{job_id}/download/').status_code, 410)
+        self.assertNotEqual(self._start().data['id'], job_id)
+
+    @override_settings(EXPORT_JOB_TIMEOUT=60)
+    def test_stale_job_is_failed_and_not_reused(self):
+        pending_id = self._start().data['id']
+        long_ago = timezone.now() - timedelta(minutes=5)
+        ExportJob.objects.filter(pk=pending_id).update(created_at=long_ago)
+
+        running_id = self._start().data['id']
+        self.assertNotEqual(running_id, pending_id)
+        ExportJob.objects.filter(pk=running_id).update(status='running', started_at=long_ago)
+
+        self.assertNotEqual(self._start().data['id'], running_id)
+        for job in ExportJob.objects.filter(pk__in=[pending_id, running_id]):
+            self.assertEqual(job.status, 'failed')
+            self.assertIsNotNone(job.finished_at)
+
+        # A stale job picked up late is not run
+        self.assertEqual(run_export_job(pending_id)['status'], 'skipped')
+
+    @override_settings(EXPORT_JOB_TIMEOUT=60, EXPORT_ARTIFACT_MAX_AGE=60)
+    def test_prune_removes_stale_jobs(self):
+        job_id = self._start().data['id']
+        fresh_id = self._start({'status': 'pilot'}).data['id']
+        ExportJob.objects.filter(pk=job_id).update(created_at=timezone.now() - timedelta(minutes=5))
+
+        prune_export_artifacts()  # Fails the stale job
+        ExportJob.objects.filter(pk=job_id).update(finished_at=timezone.now() - timedelta(minutes=5))
+        prune_export_artifacts()
+
+        self.assertEqual(list(ExportJob.objects.values_list('pk', flat=True)), [fresh_id])
+
+    def test_download_before_finished(self):
+        job_id = self._start().data['id']
+
+        response = self.client.get(f'/api/export-jobs/{job_id}/download/')
+
+        self.assertEqual(response.status_code, 409)
+
+    def test_org_user_scope(self):
+        admin_job_id = self._start().data['id']
+        other_org = Organization.objects.create(name='Org B', code='ORGB')
+        System.objects.create(org=other_org, system_name='B1')
+        self.client.force_authenticate(
+            user=User.objects.create_user(username='org', password='x', role='org_user', organization=other_org)
+        )
+
+        self.assertEqual(self.client.get(f'/api/export-jobs/{admin_job_id}/').status_code, 404)
+
+        job = ExportJob.objects.get(pk=self._start().data['id'])
+        self.assertEqual(job.params, {'org_scope': f'org{other_org.pk}'})
+        run_export_job(job.pk)
+        job.refresh_from_db()
+        self.assertEqual(job.rows_total, 1)
+
+    def test_unknown_format(self):
+        response = self._start({'export_format': 'pdf'})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_progress_reported_per_chunk(self):
+        System.objects.create(org=self.org, system_name='S3')
+        calls = []
+
+        write_systems_workbook(System.objects.all(), io.BytesIO(), chunk_size=2,
+                               progress=lambda done, total: calls.append((done, total)))
+
+        self.assertEqual(calls, [(0, 3), (2, 3), (3, 3)])
@@ -0,0 +1,83 @@
+"""
+Tests for export_data?format=ndjson|csv.
+"""
+import csv
+import io
+import json
+
+from django.http import StreamingHttpResponse
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.organizations.models import Organization
+from apps.systems.models import System, SystemArchitecture
+
+
+class FlatExportTestCase(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.create_user(username='admin', password='x', role='admin'))
+        self.org = Organization.objects.create(name='Org A', code='ORGA')
+        self.s1 = System.objects.create(org=self.org, system_name='Hệ thống 1', status='operating')
+        SystemArchitecture.objects.create(system=self.s1, backend_tech='python,java', has_cicd=True)
+        System.objects.create(org=self.org, system_name='Hệ thống 2', status='pilot')
+        System.objects.create(org=self.org, system_name='Deleted', is_deleted=True)
+
+    def _content(self, response):
+        self.assertIsInstance(response, StreamingHttpResponse)
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_ndjson(self):
+        response = self.client.get('/api/systems/export_data/', {'format': 'ndjson'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('application/x-ndjson'))
+        rows = [json.loads(line) for line in self._content(response).splitlines()]
+        self.assertEqual([row['system_name'] for row in rows], ['Hệ thống 1', 'Hệ thống 2'])
+        self.assertEqual(rows[0]['org_name'], 'Org A')
+        self.assertEqual(rows[0]['architecture__backend_tech'], 'python,java')
+        self.assertTrue(rows[0]['architecture__has_cicd'])
+        # Systems without the sub-model get empty columns, not a missing key
+        self.assertIsNone(rows[1]['architecture__backend_tech'])
+        self.assertIn('security__has_data_encryption_at_rest', rows[0])
+
+    def test_csv(self):
+        response = self.client.get('/api/systems/export_data/', {'format': 'csv', 'status': 'operating'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('.csv', response['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(self._content(response))))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['system_name'], 'Hệ thống 1')
+        self.assertEqual(rows[0]['architecture__backend_tech'], 'python,java')
+        self.assertEqual(rows[0]['cost__initial_investment'], '')
+
+    def test_sparse_columns(self):
+        response = self.client.get('/api/systems/export_data/', {
+            'format': 'csv', 'fields': 'id,system_name,architecture',
+        })
+
+        header = self._content(response).splitlines()[0].split(',')
+        self.assertEqual(header[:2], ['id', 'system_name'])
+        self.assertTrue(all(column.startswith('architecture__') for column in header[2:]))
+
+    def test_unknown_field_is_a_json_error(self):
+        response = self.client.get('/api/systems/export_data/', {'format': 'ndjson', 'fields': 'nope'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('fields', json.loads(response.content))
+
+    def test_single_query(self):
+        response = self.client.get('/api/systems/export_data/', {'format': 'ndjson'})
+
+        # Rows are read lazily while the body streams: one joined query
+        with self.assertNumQueries(1):
+            self._content(response)
+
+    def test_json_envelope_unchanged(self):
+        response = self.client.get('/api/systems/export_data/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 2)
@@ -0,0 +1,101 @@
+"""
+Tests for the declarative insight rule registry.
+"""
+from django.db.models import Q
+from django.test import SimpleTestCase, TestCase
+
+from apps.organizations.models import Organization
+from apps.systems.insights import (
+    INSIGHT_RULES,
+    CountInsight,
+    TopValuesInsight,
+    evaluate_insights,
+)
+from apps.systems.models import System, SystemArchitecture, SystemAssessment
+
+
+class InsightRuleTestCase(SimpleTestCase):
+    """Rules render from plain dicts - no HTTP, no database."""
+
+    def setUp(self):
+        self.rule = CountInsight(
+            'no_x', 'testing', Q(pk__isnull=True),
+            title='{count} hệ thống thiếu X',
+            description='{pct}% hệ thống thiếu X.',
+            recommendation='Bổ sung X.',
+            filter={'type': 'no_x'},
+            thresholds=[(80, 'critical'), (50, 'warning')],
+        )
+
+    def test_count_thresholds(self):
+        self.assertIsNone(self.rule.evaluate({'total': 10, 'no_x': 0}))
+        self.assertEqual(self.rule.evaluate({'total': 10, 'no_x': 3})['severity'], 'info')
+        self.assertEqual(self.rule.evaluate({'total': 10, 'no_x': 6})['severity'], 'warning')
+
+        insight = self.rule.evaluate({'total': 10, 'no_x': 9})
+        self.assertEqual(insight['severity'], 'critical')
+        self.assertEqual(insight['title'], '9 hệ thống thiếu X')
+        self.assertEqual(insight['description'], '90.0% hệ thống thiếu X.')
+        self.assertEqual(insight['metric'], {'count': 9, 'percentage': 90.0})
+
+    def test_top_values(self):
+        rule = TopValuesInsight(
+            'langs', 'technology', 'programming_language',
+            title='Phổ biến nhất: {value} ({count})',
+            description='Top: {items}',
+            recommendation='-',
+            filter={'type': 'technology'},
+        )
+        insight = rule.evaluate([
+            {'programming_language': 'Java', 'count': 4},
+            {'programming_language': 'Python', 'count': 2},
+        ])
+
+        self.assertEqual(insight['title'], 'Phổ biến nhất: Java (4)')
+        self.assertEqual(insight['description'], 'Top: Java (4), Python (2)')
+        self.assertIsNone(rule.evaluate([]))
+
+    def test_registry_ids_are_unique(self):
+        ids = [rule.id for rule in INSIGHT_RULES]
+        self.assertEqual(len(ids), len(set(ids)))
+
+
+class EvaluateInsightsTestCase(TestCase):
+
+    def setUp(self):
+        org = Organization.objects.create(name='Org A', code='ORGA')
+        s1 = System.objects.create(org=org, system_name='S1', hosting_platform='cloud',
+                                   programming_language='Java', has_encryption=True)
+        System.objects.create(org=org, system_name='S2', hosting_platform='on_premise',
+                              programming_language='Java')
+        System.objects.create(org=org, system_name='S3', database_name='PostgreSQL')
+        SystemArchitecture.objects.create(system=s1, has_cicd=True, has_architecture_diagram=True)
+        SystemAssessment.objects.create(system=s1, recommendation='replace')
+
+    def test_payload(self):
+        result = evaluate_insights(System.objects.all())
+        insights = {i['id']: i for i in result['insights']}
+
+        self.assertEqual(result['total_systems'], 3)
+        self.assertEqual(insights['no_encryption']['severity'], 'critical')
+        self.assertEqual(insights['needs_replace']['metric'], {'count': 1})
+        self.assertEqual(insights['no_cicd']['metric'], {'count': 2, 'percentage': 66.7})
+        self.assertEqual(insights['tech_distribution']['title'], 'Ngôn ngữ phổ biến nhất: Java (2 hệ thống)')
+        self.assertNotIn('needs_upgrade', insights)
+        self.assertEqual(
+            [i['severity'] for i in result['insights']],
+            sorted((i['severity'] for i in result['insights']),
+                   key=['critical', 'warning', 'info', 'success'].index),
+        )
+        self.assertEqual(result['summary']['total_insights'], len(result['insights']))
+
+    def test_count_rules_share_one_query(self):
+        extra = [
+            CountInsight(f'extra_{i}', 'testing', Q(status='operating'), '{count}', '{pct}', '-', {})
+            for i in range(10)
+        ]
+        top_value_rules = sum(1 for rule in INSIGHT_RULES if isinstance(rule, TopValuesInsight))
+
+        with self.assertNumQueries(1 + top_value_rules):
+            evaluate_insights(System.objects.all(), INSIGHT_RULES + extra)
+
@@ -0,0 +1,125 @@
+"""
+Tests for keyset (cursor) pagination on /api/systems/ and drilldown.
+"""
+import base64
+import datetime
+import json
+
+from django.test import TestCase
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from apps.accounts.models import User
+from apps.organizations.models import Organization
+from apps.systems.models import System
+from config.pagination import KeysetPagination
+
+
+class KeysetPaginationTestCase(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.create_user(username='leader', password='x', role='leader'))
+        self.org = Organization.objects.create(name='Org A', code='ORGA')
+        for index in range(25):
+            System.objects.create(
+                org=self.org,
+                system_name=f'S{index:02d}',
+                status='operating' if index % 2 else 'stopped',
+                # Duplicates and NULLs exercise the id tie-breaker
+                go_live_date=datetime.date(2020, 1, 1 + index % 3) if index % 4 else None,
+            )
+        # Equal created_at values must not skip or repeat rows
+        System.objects.filter(system_name__in=['S03', 'S04', 'S05']).update(
+            created_at=System.objects.get(system_name='S03').created_at
+        )
+
+    def collect(self, url, params, key='results'):
+        names, pages = [], 0
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            names += [row['system_name'] for row in response.data[key]]
+            pages += 1
+            if not response.data['next']:
+                return names, pages, response
+            response = self.client.get(response.data['next'])
+
+    def test_page_number_mode_unchanged(self):
+        response = self.client.get('/api/systems/', {'page_size': 10, 'page': 3})
+
+        self.assertEqual(response.data['count'], 25)
+        self.assertEqual(len(response.data['results']), 5)
+
+    def test_cursor_mode_walks_every_row_once(self):
+        for ordering in ['-created_at', 'created_at', 'system_name', '-go_live_date', 'go_live_date', 'id']:
+            names, pages, response = self.collect(
+                '/api/systems/', {'pagination': 'cursor', 'page_size': 7, 'ordering': ordering}
+            )
+            expected = [
+                s.system_name for s in System.objects.order_by(
+                    *(['pk'] if ordering == 'id' else [ordering, ('-pk' if ordering.startswith('-') else 'pk')])
+                )
+            ]
+            if 'go_live_date' in ordering:
+                # NULLs sort as the largest value
+                nulls = [s.system_name for s in System.objects.filter(go_live_date__isnull=True).order_by(
+                    '-pk' if ordering.startswith('-') else 'pk')]
+                dated = [name for name in expected if name not in nulls]
+                expected = nulls + dated if ordering.startswith('-') else dated + nulls
+            self.assertEqual(names, expected, ordering)
+            self.assertEqual(pages, 4)
+            self.assertNotIn('count', response.data)
+
+    def test_one_query_per_page(self):
+        """A deep page costs one query: no COUNT(*), no OFFSET."""
+        factory = APIRequestFactory()
+        cursor = None
+        while True:
+            params = {'page_size': 4, **({'cursor': cursor} if cursor else {})}
+            paginator = KeysetPagination()
+            with self.assertNumQueries(1) as context:
+                paginator.paginate_queryset(System.objects.all(), Request(factory.get('/', params)))
+            sql = context.captured_queries[0]['sql'].upper()
+            self.assertNotIn('OFFSET', sql)
+            self.assertNotIn('COUNT(', sql)
+            cursor = paginator.next_cursor
+            if cursor is None:
+                break
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/systems/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
+
+        first = self.client.get('/api/systems/', {'pagination': 'cursor', 'ordering': 'system_name'})
+        response = self.client.get('/api/systems/', {'cursor': first.data['next_cursor'], 'ordering': '-created_at'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_tampered_cursor(self):
+        for ordering, value in [
+            ('-created_at', 'not-a-date'), ('-created_at', {'a': 1}), ('-created_at', [1]),
+            ('go_live_date', '2020-13-01'), ('system_name', 'S01'),
+        ]:
+            cursor = base64.urlsafe_b64encode(json.dumps([ordering, value, 1]).encode()).decode()
+            response = self.client.get('/api/systems/', {'cursor': cursor, 'ordering': ordering})
+            self.assertEqual(response.status_code, 200 if ordering == 'system_name' else 404, value)
+
+        cursor = base64.urlsafe_b64encode(json.dumps(['-created_at', None, [1]]).encode()).decode()
+        self.assertEqual(self.client.get('/api/systems/', {'cursor': cursor}).status_code, 404)
+
+    def test_drilldown_pages_past_100(self):
+        for index in range(130):
+            System.objects.create(org=self.org, system_name=f'X{index:03d}', status='pilot')
+
+        names, pages, response = self.collect(
+            '/api/systems/drilldown/', {'filter_type': 'status', 'filter_value': 'pilot'}, key='systems'
+        )
+
+        self.assertEqual(len(names), 130)
+        self.assertEqual(len(set(names)), 130)
+        self.assertEqual(pages, 2)
+        self.assertNotIn('count', response.data)
+
+        first = self.client.get('/api/systems/drilldown/', {'filter_type': 'status', 'filter_value': 'pilot'})
+        self.assertEqual(first.data['count'], 130)
+        self.assertEqual(len(first.data['systems']), 100)
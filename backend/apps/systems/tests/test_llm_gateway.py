@@ -0,0 +1,159 @@
+"""
+Tests for the LLM gateway against a local fake OpenAI/Anthropic server.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import openai
+from django.test import SimpleTestCase, override_settings
+
+from apps.systems import llm_gateway
+from apps.systems.llm_gateway import (
+    CLAUDE, OPENAI, LLMStream, LLMUnavailableError, breakers, reset_circuit_breakers,
+)
+
+
+def openai_events(text):
+    for start in range(0, len(text), 4):
+        yield 'response.output_text.delta', {'type': 'response.output_text.delta', 'delta': text[start:start + 4]}
+
+
+def claude_events(text):
+    yield 'message_start', {'type': 'message_start', 'message': {
+        'id': 'msg_1', 'type': 'message', 'role': 'assistant', 'model': 'claude', 'content': [],
+        'stop_reason': None, 'stop_sequence': None, 'usage': {'input_tokens': 1, 'output_tokens': 1},
+    }}
+    yield 'content_block_start', {'type': 'content_block_start', 'index': 0, 'content_block': {'type': 'text', 'text': ''}}
+    for start in range(0, len(text), 4):
+        yield 'content_block_delta', {'type': 'content_block_delta', 'index': 0, 'delta': {'type': 'text_delta', 'text': text[start:start + 4]}}
+    yield 'content_block_stop', {'type': 'content_block_stop', 'index': 0}
+    yield 'message_delta', {'type': 'message_delta', 'delta': {'stop_reason': 'end_turn', 'stop_sequence': None}, 'usage': {'output_tokens': 2}}
+    yield 'message_stop', {'type': 'message_stop'}
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like the real APIs
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.server.requests.append((self.path, self.client_address[1]))
+        script = self.server.scripts.get(self.path, [])
+        action = script.pop(0) if script else 'ok'
+
+        if action == 'hang':
+            time.sleep(1)
+        if isinstance(action, int):
+            body = json.dumps({'error': {'type': 'api_error', 'message': 'unavailable'}}).encode()
+            self.send_response(action)
+            self.send_header('Content-Type', 'application/json')
+        else:
+            events = openai_events if self.path == '/v1/responses' else claude_events
+            body = ''.join(
+                f"event: {name}\ndata: {json.dumps(data)}\n\n" for name, data in events(self.server.text[self.path])
+            ).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LLMGatewayTestCase(SimpleTestCase):
+    """
+    OpenAI and Claude are served by one local server; ``scripts`` queues a
+    status code or 'hang' per path for the next requests.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeLLMHandler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        base_url = f'http://127.0.0.1:{cls.server.server_address[1]}'
+        cls.settings_override = override_settings(
+            OPENAI_API_KEY='test-openai', OPENAI_BASE_URL=f'{base_url}/v1',
+            CLAUDE_API_KEY='test-claude', CLAUDE_BASE_URL=base_url,
+            LLM_MAX_RETRIES=2, LLM_RETRY_BASE_DELAY=0.01, LLM_BREAKER_THRESHOLD=3, LLM_BREAKER_COOLDOWN=30,
+        )
+        cls.settings_override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        reset_circuit_breakers()
+        self.server.requests = []
+        self.server.scripts = {}
+        self.server.text = {'/v1/responses': 'Trả lời từ OpenAI', '/v1/messages': 'Trả lời từ Claude'}
+
+    def paths(self):
+        return [path for path, _ in self.server.requests]
+
+    async def _complete(self, timeout=5.0):
+        llm = LLMStream('system', [{'role': 'user', 'content': 'Có bao nhiêu hệ thống?'}], timeout=timeout)
+        text = ''.join([chunk async for chunk in llm])
+        return text, llm.provider
+
+    async def test_streams_from_openai_over_pooled_connection(self):
+        first = await self._complete()
+        second = await self._complete()
+
+        self.assertEqual(first, ('Trả lời từ OpenAI', OPENAI))
+        self.assertEqual(second, first)
+        self.assertIs(llm_gateway.get_openai_client(asynchronous=True), llm_gateway.get_openai_client(asynchronous=True))
+        # Both phases went over the same keep-alive connection
+        self.assertEqual(len({port for _, port in self.server.requests}), 1)
+
+    async def test_transient_error_is_retried(self):
+        self.server.scripts['/v1/responses'] = [503]
+
+        self.assertEqual(await self._complete(), ('Trả lời từ OpenAI', OPENAI))
+        self.assertEqual(self.paths(), ['/v1/responses', '/v1/responses'])
+        self.assertEqual(breakers[OPENAI].failures, 0)
+
+    async def test_client_error_is_not_retried(self):
+        self.server.scripts['/v1/responses'] = [400]
+
+        with self.assertRaises(openai.BadRequestError):
+            await self._complete()
+        self.assertEqual(self.paths(), ['/v1/responses'])
+
+    async def test_fails_over_to_claude_and_opens_breaker(self):
+        self.server.scripts['/v1/responses'] = [500, 500, 500]
+
+        self.assertEqual(await self._complete(), ('Trả lời từ Claude', CLAUDE))
+        self.assertEqual(self.paths(), ['/v1/responses'] * 3 + ['/v1/messages'])
+
+        # Breaker is open: the next phase goes straight to Claude
+        self.server.requests = []
+        self.assertEqual(await self._complete(), ('Trả lời từ Claude', CLAUDE))
+        self.assertEqual(self.paths(), ['/v1/messages'])
+
+        # After the cool-down one trial call goes back to OpenAI
+        breakers[OPENAI].opened_at -= 60
+        self.assertEqual(await self._complete(), ('Trả lời từ OpenAI', OPENAI))
+        self.assertIsNone(breakers[OPENAI].opened_at)
+
+    async def test_slow_provider_bounded_by_phase_budget(self):
+        self.server.scripts['/v1/responses'] = ['hang'] * 3
+
+        started = time.monotonic()
+        self.assertEqual(await self._complete(timeout=0.6), ('Trả lời từ Claude', CLAUDE))
+        self.assertLess(time.monotonic() - started, 0.9)
+
+    async def test_all_providers_down(self):
+        self.server.scripts = {'/v1/responses': [503] * 3, '/v1/messages': [529] * 3}
+
+        with self.assertRaises(LLMUnavailableError):
+            await self._complete()
+        self.assertEqual(len(self.server.requests), 6)
@@ -0,0 +1,112 @@
+"""
+Tests for diff-based nested updates in SystemCreateUpdateSerializer.update.
+"""
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.organizations.models import Organization
+from apps.systems.models import System, SystemArchitecture, SystemIntegrationConnection
+
+
+def write_queries(queries):
+    return [q['sql'] for q in queries if q['sql'].startswith(('INSERT', 'UPDATE', 'DELETE'))]
+
+
+class NestedUpdateTestCase(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.create_user(username='admin', password='x', role='admin'))
+        self.org = Organization.objects.create(name='Org A', code='ORGA')
+        self.system = System.objects.create(org=self.org, system_name='S1', purpose='Quản lý')
+        SystemArchitecture.objects.create(system=self.system, backend_tech='python', has_cicd=False)
+        self.conn_a = SystemIntegrationConnection.objects.create(
+            system=self.system, source_system='S1', target_system='A', data_objects='Hồ sơ', frequency='batch_daily')
+        self.conn_b = SystemIntegrationConnection.objects.create(
+            system=self.system, source_system='S1', target_system='B', data_objects='Hồ sơ', frequency='batch_daily')
+        self.url = f'/api/systems/{self.system.id}/'
+
+    def _connection(self, target, **extra):
+        return {'source_system': 'S1', 'target_system': target, 'data_objects': 'Hồ sơ',
+                'frequency': 'batch_daily', **extra}
+
+    def _patch(self, data):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(self.url, data, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        return write_queries(queries)
+
+    def test_unchanged_autosave_writes_nothing(self):
+        updated_at = System.objects.get(pk=self.system.pk).updated_at
+
+        writes = self._patch({
+            'system_name': 'S1',
+            'purpose': 'Quản lý',
+            'architecture_data': {'backend_tech': ['python'], 'has_cicd': False},
+            'integration_connections_data': [
+                self._connection('A', id=self.conn_a.id),
+                self._connection('B', id=self.conn_b.id),
+            ],
+        })
+
+        self.assertEqual(writes, [])
+        self.assertEqual(System.objects.get(pk=self.system.pk).updated_at, updated_at)
+
+    def test_only_changed_columns_are_written(self):
+        writes = self._patch({'system_name': 'S1', 'architecture_data': {'backend_tech': ['python'], 'has_cicd': True}})
+
+        architecture_writes = [sql for sql in writes if 'system_architecture' in sql]
+        self.assertEqual(len(architecture_writes), 1)
+        self.assertIn('"has_cicd"', architecture_writes[0])
+        self.assertNotIn('"backend_tech"', architecture_writes[0])
+        self.assertTrue(SystemArchitecture.objects.get(system=self.system).has_cicd)
+        # Untouched System columns are not rewritten
+        self.assertFalse(any('"system_name"' in sql for sql in writes if sql.startswith('UPDATE "systems"')))
+
+    def test_system_fields_use_update_fields(self):
+        writes = self._patch({'purpose': 'Mới'})
+
+        system_writes = [sql for sql in writes if sql.startswith('UPDATE "systems" SET "purpose"')]
+        self.assertEqual(len(system_writes), 1)
+        self.assertNotIn('"system_name"', system_writes[0])
+        self.assertEqual(System.objects.get(pk=self.system.pk).purpose, 'Mới')
+
+    def test_connections_upserted_by_identity(self):
+        self._patch({'integration_connections_data': [
+            self._connection('A', id=self.conn_a.id, notes='Đã cập nhật'),
+            self._connection('C'),
+        ]})
+
+        connections = {c.target_system: c for c in self.system.integration_connections.all()}
+        self.assertEqual(set(connections), {'A', 'C'})
+        self.assertEqual(connections['A'].pk, self.conn_a.pk)
+        self.assertEqual(connections['A'].notes, 'Đã cập nhật')
+
+    def test_connections_matched_by_source_and_target_without_id(self):
+        self._patch({'integration_connections_data': [
+            self._connection('B', notes='x'),
+            self._connection('A'),
+        ]})
+
+        self.assertEqual(
+            set(self.system.integration_connections.values_list('pk', flat=True)),
+            {self.conn_a.pk, self.conn_b.pk},
+        )
+
+    def test_foreign_connection_id_is_not_reused(self):
+        other = System.objects.create(org=self.org, system_name='S2')
+        foreign = SystemIntegrationConnection.objects.create(
+            system=other, source_system='S2', target_system='Z', data_objects='x', frequency='batch_daily')
+
+        self._patch({'integration_connections_data': [self._connection('Z', id=foreign.pk)]})
+
+        foreign.refresh_from_db()
+        self.assertEqual(foreign.system_id, other.pk)
+        self.assertEqual(list(self.system.integration_connections.values_list('target_system', flat=True)), ['Z'])
+
+    def test_no_info_logging(self):
+        with self.assertNoLogs('apps.systems.serializers', level='INFO'):
+            self._patch({'architecture_data': {'has_cicd': True}})
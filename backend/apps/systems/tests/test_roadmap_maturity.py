@@ -0,0 +1,191 @@
+"""
+Tests for the stored roadmap maturity score / phase and roadmap_stats.
+"""
+import importlib
+import random
+
+from django.apps import apps
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.organizations.models import Organization
+from apps.systems.aggregations import ROADMAP_IMPROVEMENTS, aggregate_buckets
+from apps.systems.models import System, SystemArchitecture, SystemIntegration, SystemSecurity
+from apps.systems.utils import ROADMAP_CRITERIA
+
+
+def create_mature_system(org, name, **kwargs):
+    """System meeting every roadmap criterion"""
+    system = System.objects.create(
+        org=org, system_name=name, hosting_platform='cloud', has_encryption=True,
+        has_design_documents=True, has_audit_log=True, **kwargs
+    )
+    SystemIntegration.objects.create(system=system, has_api_gateway=True)
+    SystemArchitecture.objects.create(system=system, has_cicd=True, has_architecture_diagram=True)
+    SystemSecurity.objects.create(system=system, has_data_encryption_at_rest=True)
+    return system
+
+
+class RoadmapMaturityTestCase(TestCase):
+    """The stored score follows System and sub-model writes."""
+
+    def setUp(self):
+        self.org = Organization.objects.create(name='Org A', code='ORGA')
+
+    def test_new_system_is_phase_1(self):
+        system = System.objects.create(org=self.org, system_name='S1')
+        system.refresh_from_db()
+
+        self.assertEqual(system.roadmap_phase, 1)
+        self.assertEqual(system.roadmap_score, 0)
+        self.assertEqual(len(system.roadmap_improvements), len(ROADMAP_CRITERIA))
+
+    def test_fully_mature_system(self):
+        system = create_mature_system(self.org, 'S1')
+        system.refresh_from_db()
+
+        self.assertEqual(system.roadmap_phase, 4)
+        self.assertEqual(system.roadmap_score, 100)
+        self.assertEqual(system.roadmap_improvements, [])
+
+    def test_sub_model_changes_move_phase(self):
+        system = create_mature_system(self.org, 'S1')
+        SystemArchitecture.objects.filter(system=system).delete()
+        system.refresh_from_db()
+        self.assertEqual(system.roadmap_phase, 2)
+        self.assertEqual(system.roadmap_score, 75)
+
+        security = SystemSecurity.objects.get(system=system)
+        security.has_data_encryption_at_rest = False
+        security.save()
+        system.hosting_platform = 'hybrid'
+        system.save()
+        system.refresh_from_db()
+        self.assertEqual(system.roadmap_phase, 2)
+        self.assertEqual(system.roadmap_score, 55)
+        self.assertEqual(
+            [(i['phase'], i['action']) for i in system.roadmap_improvements],
+            [(2, 'CI/CD Pipeline'), (2, 'Architecture Diagram'), (3, 'Data Encryption')],
+        )
+
+    def test_sql_buckets_match_python_criteria(self):
+        create_mature_system(self.org, 'mature')
+        System.objects.create(org=self.org, system_name='bare')
+        partial = System.objects.create(org=self.org, system_name='partial', hosting_platform='hybrid', has_audit_log=True)
+        SystemArchitecture.objects.create(system=partial, has_cicd=True)
+
+        buckets = aggregate_buckets(System.objects.all(), [ROADMAP_IMPROVEMENTS])['improvements']
+
+        expected = {(phase, action): 0 for phase, action, _detail, _score in ROADMAP_CRITERIA}
+        for improvements in System.objects.values_list('roadmap_improvements', flat=True):
+            for improvement in improvements:
+                expected[(improvement['phase'], improvement['action'])] += 1
+        self.assertEqual(buckets, expected)
+
+    def test_sql_buckets_match_python_criteria_randomized(self):
+        """Every criterion's ``needed`` Q selects the systems it scores 0, over random data."""
+        rng = random.Random(0)
+        for index in range(60):
+            system = System.objects.create(
+                org=self.org, system_name=f'S{index}',
+                hosting_platform=rng.choice(['cloud', 'hybrid', 'on_premise', 'other', '']),
+                has_encryption=rng.random() < 0.5,
+                has_design_documents=rng.random() < 0.5,
+                has_audit_log=rng.random() < 0.5,
+            )
+            if rng.random() < 0.7:
+                SystemIntegration.objects.create(system=system, has_api_gateway=rng.random() < 0.5)
+            if rng.random() < 0.7:
+                SystemArchitecture.objects.create(
+                    system=system, has_cicd=rng.random() < 0.5, has_architecture_diagram=rng.random() < 0.5,
+                )
+            if rng.random() < 0.7:
+                SystemSecurity.objects.create(system=system, has_data_encryption_at_rest=rng.random() < 0.5)
+
+        systems = System.objects.select_related('architecture', 'integration', 'security')
+        for phase, action, _detail, criterion in ROADMAP_CRITERIA:
+            expected = {system.pk for system in systems if not criterion(system)}
+            actual = set(System.objects.filter(criterion.needed).values_list('pk', flat=True))
+            self.assertEqual(actual, expected, (phase, action))
+            self.assertTrue(0 < len(expected) < 60, (phase, action))
+
+        buckets = aggregate_buckets(System.objects.all(), [ROADMAP_IMPROVEMENTS])['improvements']
+        self.assertEqual(buckets, {
+            (phase, action): sum(1 for system in systems if not criterion(system))
+            for phase, action, _detail, criterion in ROADMAP_CRITERIA
+        })
+
+    def test_migration_backfill_matches_criteria(self):
+        """The frozen copy in migration 0033 scores like utils.ROADMAP_CRITERIA."""
+        migration = importlib.import_module('apps.systems.migrations.0033_add_system_roadmap_fields')
+        create_mature_system(self.org, 'mature')
+        System.objects.create(org=self.org, system_name='bare')
+        partial = System.objects.create(org=self.org, system_name='partial', hosting_platform='hybrid', has_audit_log=True)
+        SystemArchitecture.objects.create(system=partial, has_cicd=True)
+        expected = list(System.objects.order_by('pk').values_list('roadmap_score', 'roadmap_phase', 'roadmap_improvements'))
+        System.objects.update(roadmap_score=0, roadmap_phase=1, roadmap_improvements=[])
+
+        migration.backfill_roadmap(apps, None)
+
+        self.assertEqual(
+            list(System.objects.order_by('pk').values_list('roadmap_score', 'roadmap_phase', 'roadmap_improvements')),
+            expected,
+        )
+
+
+class RoadmapStatsTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.create_user(username='leader', password='x', role='leader'))
+        self.org = Organization.objects.create(name='Org A', code='ORGA')
+        self.other_org = Organization.objects.create(name='Org B', code='ORGB')
+
+        System.objects.create(org=self.org, system_name='low', criticality_level='low')
+        System.objects.create(org=self.org, system_name='high', criticality_level='high')
+        System.objects.create(org=self.other_org, system_name='other', criticality_level='medium')
+        create_mature_system(self.org, 'done')
+        System.objects.create(org=self.org, system_name='deleted', is_deleted=True)
+
+    def test_response(self):
+        response = self.client.get('/api/systems/roadmap_stats/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total_systems'], 4)
+        self.assertEqual(response.data['summary']['phase1']['count'], 3)
+        self.assertEqual(response.data['summary']['phase1']['percentage'], 75.0)
+        self.assertEqual(response.data['summary']['completed']['count'], 1)
+
+        phase1 = response.data['top_priorities']['phase1']
+        self.assertEqual([s['name'] for s in phase1], ['high', 'other', 'low'])
+        self.assertEqual(phase1[0]['org_name'], 'Org A')
+        self.assertEqual(phase1[0]['phase_label'], 'Giai đoạn 1: Xây móng')
+        self.assertEqual(len(phase1[0]['improvements_needed']), len(ROADMAP_CRITERIA))
+
+        actions = {a['action']: a for a in response.data['improvement_actions']}
+        # Phase 1 and phase 3 encryption are merged under the earliest phase
+        self.assertEqual(actions['Data Encryption'], {'action': 'Data Encryption', 'count': 6, 'phase': 1})
+        self.assertEqual(actions['Cloud Migration']['count'], 3)
+
+    def test_query_count_independent_of_system_count(self):
+        for index in range(20):
+            System.objects.create(org=self.org, system_name=f'X{index}')
+
+        # ETag watermark + aggregate + one top-N query per phase
+        with self.assertNumQueries(5):
+            self.client.get('/api/systems/roadmap_stats/')
+
+    def test_list_filters(self):
+        response = self.client.get('/api/systems/', {'roadmap_phase': 1, 'org': self.org.id})
+        self.assertEqual({s['system_name'] for s in response.data['results']}, {'low', 'high'})
+
+        response = self.client.get('/api/systems/', {'roadmap_score_min': 50})
+        self.assertEqual([s['system_name'] for s in response.data['results']], ['done'])
+        self.assertEqual(response.data['results'][0]['roadmap_score'], 100)
+
+        response = self.client.get('/api/systems/', {'roadmap_score_min': '5.5'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('roadmap_score_min', response.data)
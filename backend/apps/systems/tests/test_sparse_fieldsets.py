@@ -0,0 +1,64 @@
+"""
+Tests for ?fields= / ?expand= on system detail and export_data.
+"""
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.organizations.models import Organization
+from apps.systems.models import System, SystemArchitecture, SystemSecurity
+from apps.systems.serializers import SYSTEM_DETAIL_RELATIONS
+
+
+class SparseFieldsetTestCase(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.create_user(username='admin', password='x', role='admin'))
+        self.org = Organization.objects.create(name='Org A', code='ORGA')
+        self.system = System.objects.create(org=self.org, system_name='S1', form_level=2)
+        SystemArchitecture.objects.create(system=self.system, has_cicd=True)
+        SystemSecurity.objects.create(system=self.system, has_data_encryption_at_rest=True)
+        self.url = f'/api/systems/{self.system.id}/'
+
+    def test_default_is_unchanged(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        for name in SYSTEM_DETAIL_RELATIONS:
+            self.assertIn(name, response.data)
+        self.assertTrue(response.data['architecture']['has_cicd'])
+
+    def test_fields(self):
+        with self.assertNumQueries(2):  # ETag watermark + system row
+            response = self.client.get(self.url, {'fields': 'id,system_name,org_name'})
+
+        self.assertEqual(response.data, {'id': self.system.id, 'system_name': 'S1', 'org_name': 'Org A'})
+
+    def test_expand(self):
+        response = self.client.get(self.url, {'expand': 'security'})
+
+        self.assertIn('system_name', response.data)
+        self.assertTrue(response.data['security']['has_data_encryption_at_rest'])
+        for name in set(SYSTEM_DETAIL_RELATIONS) - {'security'}:
+            self.assertNotIn(name, response.data)
+
+    def test_fields_with_relation(self):
+        response = self.client.get(self.url, {'fields': 'id,architecture', 'expand': 'attachments'})
+
+        self.assertEqual(set(response.data), {'id', 'architecture', 'attachments'})
+
+    def test_unknown_names(self):
+        self.assertEqual(self.client.get(self.url, {'expand': 'nope'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'fields': 'id,nope'}).status_code, 400)
+
+    def test_export_data(self):
+        for index in range(5):
+            System.objects.create(org=self.org, system_name=f'X{index}')
+
+        # ETag watermark + rows + count; no per-relation queries
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/systems/export_data/', {'fields': 'id,system_name', 'expand': ''})
+
+        self.assertEqual(response.data['count'], 6)
+        self.assertEqual(set(response.data['results'][0]), {'id', 'system_name'})
@@ -0,0 +1,77 @@
+"""
+Tests for per-(org, year) system code allocation.
+"""
+import importlib
+from unittest import mock
+
+from django.apps import apps
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.organizations.models import Organization
+from apps.systems import models as system_models
+from apps.systems.models import System, SystemCodeCounter
+
+
+class SystemCodeCounterTestCase(TestCase):
+
+    def setUp(self):
+        self.org = Organization.objects.create(name='Org A', code='ORGA')
+        self.year = timezone.now().year
+        self.prefix = f'SYS-ORGA-{self.year}-'
+
+    def test_sequential_codes(self):
+        first = System.objects.create(org=self.org, system_name='S1')
+        second = System.objects.create(org=self.org, system_name='S2')
+
+        self.assertEqual(first.system_code, f'{self.prefix}0001')
+        self.assertEqual(second.system_code, f'{self.prefix}0002')
+        self.assertEqual(SystemCodeCounter.objects.get(org=self.org, year=self.year).last_number, 2)
+
+    def test_first_allocation_seeds_from_existing_codes(self):
+        System.objects.create(org=self.org, system_name='Legacy', system_code=f'{self.prefix}0041')
+
+        system = System.objects.create(org=self.org, system_name='New')
+
+        self.assertEqual(system.system_code, f'{self.prefix}0042')
+
+    def test_allocation_cost_does_not_depend_on_system_count(self):
+        for index in range(30):
+            System.objects.create(org=self.org, system_name=f'S{index}')
+
+        # SAVEPOINT, UPDATE counter, read back, RELEASE
+        with self.assertNumQueries(4):
+            number = SystemCodeCounter.allocate(self.org, self.year)
+        self.assertEqual(number, 31)
+
+    def test_block_allocation(self):
+        self.assertEqual(SystemCodeCounter.allocate(self.org, self.year, count=5), 1)
+        self.assertEqual(SystemCodeCounter.allocate(self.org, self.year), 6)
+
+    def test_concurrent_seed_falls_back_to_increment(self):
+        """Another worker creating the counter first does not yield a duplicate."""
+        def seeded_elsewhere(org, year):
+            SystemCodeCounter.objects.create(org=org, year=year, last_number=7)
+            return 0
+
+        with mock.patch.object(system_models, 'max_existing_code_number', seeded_elsewhere):
+            number = SystemCodeCounter.allocate(self.org, self.year)
+
+        self.assertEqual(number, 8)
+        self.assertEqual(SystemCodeCounter.objects.get(org=self.org, year=self.year).last_number, 8)
+
+    def test_migration_seeds_counters(self):
+        other = Organization.objects.create(name='Org B', code='ORGB')
+        System.objects.create(org=self.org, system_name='A', system_code='SYS-ORGA-2025-0003')
+        System.objects.create(org=self.org, system_name='B', system_code='SYS-OLDCODE-2025-0009')
+        System.objects.create(org=self.org, system_name='C', system_code='SYS-ORGA-2026-0002')
+        System.objects.create(org=other, system_name='D', system_code='SYS-ORGB-2025-0001')
+        System.objects.create(org=other, system_name='E', system_code='custom')
+
+        migration = importlib.import_module('apps.systems.migrations.0035_system_code_counter')
+        migration.seed_counters(apps, None)
+
+        self.assertEqual(
+            set(SystemCodeCounter.objects.values_list('org__code', 'year', 'last_number')),
+            {('ORGA', 2025, 9), ('ORGA', 2026, 2), ('ORGB', 2025, 1)},
+        )
@@ -0,0 +1,58 @@
+"""
+Query-count regression tests for GET /api/systems/.
+"""
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.organizations.models import Organization
+from apps.systems.models import Attachment, System, SystemArchitecture
+from apps.systems.serializers import SystemListSerializer
+from apps.systems.views import SYSTEM_LIST_FIELDS
+
+
+class SystemListQueryCountTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.orgs = [Organization.objects.create(name=f'Org {i}', code=f'ORG{i}') for i in range(5)]
+        # bulk_create: no signals, fast fixtures
+        System.objects.bulk_create([
+            System(org=cls.orgs[i % 5], system_name=f'S{i}', system_code=f'SYS-{i:04d}')
+            for i in range(1000)
+        ])
+        for system in System.objects.all()[:20]:
+            SystemArchitecture.objects.create(system=system, has_cicd=True)
+            Attachment.objects.create(system=system, file='attachments/x.pdf', filename='x.pdf', file_size=1)
+        cls.leader = User.objects.create_user(username='leader', password='x', role='leader')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.leader)
+
+    def test_full_page_constant_queries(self):
+        # ETag watermark + COUNT(*) + page rows (org joined)
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/systems/', {'page_size': 1000})
+        self.assertEqual(len(response.data['results']), 1000)
+        self.assertEqual(response.data['results'][0]['org_name'][:4], 'Org ')
+
+        with self.assertNumQueries(3):
+            self.client.get('/api/systems/', {'page_size': 10})
+
+    def test_cursor_page_constant_queries(self):
+        # ETag watermark + page rows
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/systems/', {'pagination': 'cursor', 'page_size': 1000})
+        self.assertEqual(len(response.data['results']), 1000)
+
+    def test_projection_covers_serializer(self):
+        """Every list field is loaded by only(): no deferred column fetches."""
+        model_fields = {f.name for f in System._meta.concrete_fields}
+        for name, field in SystemListSerializer().fields.items():
+            source = field.source
+            if source.startswith('get_') and source.endswith('_display'):
+                source = source[len('get_'):-len('_display')]
+            source = source.split('.')[0]
+            if source in model_fields:
+                self.assertIn(source, SYSTEM_LIST_FIELDS, name)
@@ -0,0 +1,76 @@
+"""
+Tests for the server-side .xlsx export (GET /api/systems/export_xlsx/).
+"""
+import io
+
+from django.test import TestCase
+from openpyxl import load_workbook
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.organizations.models import Organization
+from apps.systems.exports import XLSX_CONTENT_TYPE, write_systems_workbook
+from apps.systems.models import System
+
+
+class XlsxExportTestCase(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(username='admin', password='x', role='admin')
+        self.org_a = Organization.objects.create(name='Org A', code='ORGA')
+        self.org_b = Organization.objects.create(name='Org B', code='ORGB')
+        self.org_c = Organization.objects.create(name='Org C', code='ORGC')
+
+        for name, org, pct in [('A1', self.org_a, 90), ('A2', self.org_a, 70), ('B1', self.org_b, 20)]:
+            system = System.objects.create(org=org, system_name=name, criticality_level='high')
+            System.objects.filter(pk=system.pk).update(completion_percentage=pct)
+        System.objects.create(org=self.org_b, system_name='Deleted', is_deleted=True)
+
+    def _workbook(self, response):
+        return load_workbook(io.BytesIO(b''.join(response.streaming_content)))
+
+    def test_download(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get('/api/systems/export_xlsx/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], XLSX_CONTENT_TYPE)
+        self.assertIn('attachment; filename="Bao-cao-CDS-', response['Content-Disposition'])
+        self.assertEqual(response['X-Total-Count'], '3')
+
+        wb = self._workbook(response)
+        self.assertEqual(wb.sheetnames, ['1. Tổng quan', '2. Theo đơn vị', '3. Danh sách HT', '4. Lưu ý đôn đốc'])
+
+        systems = [row for row in wb['3. Danh sách HT'].iter_rows(min_row=2, values_only=True)]
+        self.assertEqual([row[1] for row in systems], ['A1', 'A2', 'B1'])
+        self.assertEqual(systems[0][2:6], ('Org A', 'Đang vận hành', 'Quan trọng', 90))
+
+        orgs = {row[1]: row[3:5] for row in wb['2. Theo đơn vị'].iter_rows(min_row=3, max_row=5, values_only=True)}
+        self.assertEqual(orgs, {'Org A': (2, 80), 'Org B': (1, 20), 'Org C': ('Chưa có dữ liệu', 'Chưa có dữ liệu')})
+
+        follow_up = [row[1:] for row in wb['4. Lưu ý đôn đốc'].iter_rows(min_row=2, values_only=True)]
+        self.assertEqual(follow_up, [
+            ('Org C', 0, 'Chưa cập nhật dữ liệu'),
+            ('Org B', 20, 'Cần đốc thúc nhập liệu'),
+        ])
+
+    def test_org_user_sees_own_organization_only(self):
+        user = User.objects.create_user(username='org', password='x', role='org_user', organization=self.org_a)
+        self.client.force_authenticate(user=user)
+
+        wb = self._workbook(self.client.get('/api/systems/export_xlsx/'))
+
+        systems = [row[1] for row in wb['3. Danh sách HT'].iter_rows(min_row=2, values_only=True)]
+        self.assertEqual(systems, ['A1', 'A2'])
+        self.assertEqual(wb['2. Theo đơn vị']['B3'].value, 'Org A')
+        self.assertIsNone(wb['2. Theo đơn vị']['B4'].value)
+
+    def test_query_count_independent_of_row_count(self):
+        for index in range(50):
+            System.objects.create(org=self.org_c, system_name=f'C{index:02d}')
+
+        # summary aggregate + org rollup + organizations + one chunk of systems
+        with self.assertNumQueries(4):
+            count = write_systems_workbook(System.objects.filter(is_deleted=False), io.BytesIO())
+        self.assertEqual(count, 53)
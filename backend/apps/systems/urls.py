@@ -7,6 +7,7 @@ from .views import (
     AIConversationViewSet,
     AIResponseFeedbackViewSet,
     CustomPolicyViewSet,
+    ExportJobViewSet,
 )
 
 router = DefaultRouter()
@@ -15,6 +16,7 @@ router.register(r'attachments', AttachmentViewSet, basename='attachment')
 router.register(r'ai-conversations', AIConversationViewSet, basename='ai-conversation')
 router.register(r'ai-feedback', AIResponseFeedbackViewSet, basename='ai-feedback')
 router.register(r'custom-policies', CustomPolicyViewSet, basename='custom-policy')
+router.register(r'export-jobs', ExportJobViewSet, basename='export-job')
 
 urlpatterns = [
     path('', include(router.urls)),
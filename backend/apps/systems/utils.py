@@ -2,7 +2,9 @@
 Utility functions for the systems app.
 """
 from decimal import Decimal
-from typing import Dict, List, Any
+from functools import lru_cache
+from operator import add, and_
+from typing import Callable, Dict, List, Any, Optional, Tuple
 
 
 # Define required fields per tab for completion percentage calculation
@@ -37,6 +39,19 @@ CONDITIONAL_FIELDS_MAP: Dict[str, str] = {
 GO_LIVE_FIELDS_LOGIC = True  # Flag to enable special handling
 
 
+def round_percentage(filled: int, required: int) -> float:
+    """
+    filled / required as a percentage rounded to 1 decimal (15/48 -> 31.2).
+
+    Same float round() as calculate_system_completion_percentage(): the
+    binary value is rounded, half-to-even. percentage_expression()
+    reproduces it in SQL.
+    """
+    if required == 0:
+        return 100.0
+    return round((filled / required) * 100.0, 1)
+
+
 def is_field_filled(value: Any) -> bool:
     """
     Check if a field value is considered "filled" (not empty).
@@ -367,3 +382,535 @@ def get_tab_completion_status(system_instance: Any) -> Dict[str, Dict[str, Any]]
         }
 
     return tab_status
+
+
+# One-to-one relations read by the completion rules above
+COMPLETION_RELATED_FIELDS = ('architecture', 'data_info', 'operations', 'assessment')
+
+
+def get_completion_snapshot(system_instance: Any) -> Dict[str, Any]:
+    """
+    Build the completion data persisted on System.
+
+    Args:
+        system_instance: The System model instance (relations in
+                         COMPLETION_RELATED_FIELDS should be select_related)
+
+    Returns:
+        dict: {
+                  'percentage': 72.5,
+                  'status': {
+                      'tabs': {...get_tab_completion_status...},
+                      'incomplete_fields': [...],
+                      'total_required_fields': 80,
+                      'filled_fields': 58,
+                  }
+              }
+    """
+    incomplete = get_incomplete_fields(system_instance)
+
+    # Same counting as completion_stats has always reported
+    total_required = sum(len(fields) for fields in REQUIRED_FIELDS_MAP.values())
+    for field_name, condition_field in CONDITIONAL_FIELDS_MAP.items():
+        if getattr(system_instance, condition_field, False):
+            total_required += 1
+
+    return {
+        'percentage': calculate_system_completion_percentage(system_instance),
+        'status': {
+            'tabs': get_tab_completion_status(system_instance),
+            'incomplete_fields': incomplete,
+            'total_required_fields': total_required,
+            'filled_fields': total_required - len(incomplete),
+        },
+    }
+
+
+def refresh_system_completion(system_id: int, model=None) -> Optional[float]:
+    """
+    Recompute and store completion_percentage / completion_status for a system.
+
+    Reloads the system with its completion relations so the result never
+    depends on stale relation caches of the caller's instance, and writes
+    with queryset.update() (no signals, updated_at untouched).
+
+    Args:
+        system_id: Primary key of the System
+        model: System model class (historical model when called from migrations)
+
+    Returns:
+        float: The stored percentage, or None if the system does not exist
+    """
+    if model is None:
+        from .models import System as model
+
+    system = model.objects.select_related(*COMPLETION_RELATED_FIELDS).filter(pk=system_id).first()
+    if system is None:
+        return None
+
+    snapshot = get_completion_snapshot(system)
+    model.objects.filter(pk=system_id).update(
+        completion_percentage=snapshot['percentage'],
+        completion_status=snapshot['status'],
+    )
+    return snapshot['percentage']
+
+
+# ============================================================================
+# Batch completion calculator
+# ============================================================================
+
+# Fields read from one-to-one relations instead of System itself
+# (same routing as calculate_system_completion_percentage)
+TAB_RELATION_FIELDS: Dict[str, Tuple[str, List[str]]] = {
+    'tab3': ('architecture', ['architecture_type', 'architecture_description', 'backend_tech', 'frontend_tech', 'mobile_app', 'database_type', 'database_model', 'hosting_type']),
+    'tab4': ('data_info', ['storage_size_gb', 'file_storage_size_gb', 'growth_rate_percent', 'file_storage_type', 'record_count', 'secondary_databases', 'data_types']),
+    'tab8': ('operations', ['support_level']),
+}
+# Every tab9 field lives on SystemAssessment
+TAB_RELATION_ALL_FIELDS: Dict[str, str] = {
+    'tab9': 'assessment',
+}
+
+
+def _not_null(value: Any) -> bool:
+    return value is not None
+
+
+def _text_filled(value: Any) -> bool:
+    return value is not None and bool(value.strip())
+
+
+def _is_cloud(value: Any) -> bool:
+    return value == 'cloud'
+
+
+def _is_true(value: Any) -> bool:
+    return value is True
+
+
+def _filled_predicate(field: Any) -> Callable[[Any], bool]:
+    """
+    Specialize is_field_filled() for the Python type a column can hold.
+
+    Text columns only ever hold str/None and numeric, boolean and date columns
+    are filled whenever they are not NULL; JSON columns can hold any type and
+    use the generic check.
+    """
+    from django.db import models
+
+    if isinstance(field, (models.CharField, models.TextField)):
+        return _text_filled
+    if isinstance(field, models.JSONField):
+        return is_field_filled
+    return _not_null
+
+
+class CompletionPlan:
+    """
+    REQUIRED_FIELDS_MAP / CONDITIONAL_FIELDS_MAP compiled into a fixed list
+    of values_list() columns plus the per-column checks applied to them.
+
+    Attributes:
+        columns: Lookups passed to values_list(); columns[0] is 'pk'
+        fields: Model field behind each column (None for 'pk')
+        required: (column index, filled predicate) per always-required field
+        required_count: Number of always-required fields (incl. unbacked ones)
+        conditionals: (condition column, condition value, condition test,
+                      value column or None, filled predicate) per conditional field
+        is_go_live / go_live_date: Column indexes of the go-live special case
+    """
+
+    def __init__(self, model: Any):
+        self.model = model
+        self.columns = ['pk']
+        self.fields = [None]
+        self.required = []
+        self.required_count = 0
+        self.conditionals = []
+
+        for tab_key, field_names in REQUIRED_FIELDS_MAP.items():
+            for field_name in field_names:
+                self.required_count += 1
+                column = self._column(self._required_lookup(tab_key, field_name))
+                # Attributes without a column are read as None: never filled
+                if column is not None:
+                    self.required.append(column)
+
+        for field_name, condition_field in CONDITIONAL_FIELDS_MAP.items():
+            if field_name == 'cloud_provider':
+                condition = self._column(f'architecture__{condition_field}')
+                value = self._column('architecture__cloud_provider')
+                expected, test = 'cloud', _is_cloud
+            else:
+                condition = self._column(condition_field)
+                value = self._column(field_name)
+                expected, test = True, _is_true
+            # A condition that is not a column reads as False: never required
+            if condition is not None:
+                self.conditionals.append((condition[0], expected, test) + (value or (None, None)))
+
+        self.is_go_live = self._column('is_go_live')[0]
+        self.go_live_date = self._column('go_live_date')
+
+    @staticmethod
+    def _required_lookup(tab_key: str, field_name: str) -> str:
+        if tab_key in TAB_RELATION_ALL_FIELDS:
+            return f'{TAB_RELATION_ALL_FIELDS[tab_key]}__{field_name}'
+        relation, relation_fields = TAB_RELATION_FIELDS.get(tab_key, (None, []))
+        if field_name in relation_fields:
+            return f'{relation}__{field_name}'
+        return field_name
+
+    def _column(self, lookup: str) -> Optional[Tuple[int, Callable[[Any], bool]]]:
+        """Register a column; returns (index, filled predicate) or None if it does not exist"""
+        from django.core.exceptions import FieldDoesNotExist
+
+        model = self.model
+        *relations, field_name = lookup.split('__')
+        try:
+            for relation in relations:
+                model = model._meta.get_field(relation).related_model
+            field = model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            return None
+        if not field.concrete:
+            return None
+
+        # ForeignKey: values_list('org') yields the id, filled when not NULL
+        self.columns.append(lookup)
+        self.fields.append(field)
+        return len(self.columns) - 1, _filled_predicate(field)
+
+
+@lru_cache(maxsize=None)
+def get_completion_plan(model: Any = None) -> CompletionPlan:
+    """Compiled plan for the System model (built once per process)"""
+    if model is None:
+        from .models import System as model
+    return CompletionPlan(model)
+
+
+def compute_completion_batch(queryset: Any) -> Dict[int, float]:
+    """
+    Completion percentage for every system of a queryset in one query.
+
+    Fetches only the columns the rules read as flat values_list() rows (the
+    one-to-one relations are LEFT JOINed, so a missing row reads as NULL) and
+    scores them column by column with the compiled CompletionPlan. Results
+    are identical to calculate_system_completion_percentage() per system.
+
+    Args:
+        queryset: System queryset (any filters; ordering is ignored)
+
+    Returns:
+        dict: {system_id: percentage}
+    """
+    plan = get_completion_plan(queryset.model)
+    rows = list(queryset.order_by().values_list(*plan.columns))
+    if not rows:
+        return {}
+
+    columns = list(zip(*rows))
+    size = len(rows)
+
+    filled = [0] * size
+    for index, predicate in plan.required:
+        filled = list(map(add, filled, map(predicate, columns[index])))
+    required = [plan.required_count] * size
+
+    for condition_index, _expected, test, value_index, predicate in plan.conditionals:
+        mask = list(map(test, columns[condition_index]))
+        required = list(map(add, required, mask))
+        if value_index is not None:
+            filled = list(map(add, filled, map(and_, mask, map(predicate, columns[value_index]))))
+
+    # is_go_live: set -> counted and filled; True -> go_live_date also required
+    go_live_set = list(map(_not_null, columns[plan.is_go_live]))
+    go_live_true = list(map(_is_true, columns[plan.is_go_live]))
+    date_index, date_predicate = plan.go_live_date
+    required = list(map(add, required, map(add, go_live_set, go_live_true)))
+    filled = list(map(add, filled, go_live_set))
+    filled = list(map(add, filled, map(and_, go_live_true, map(date_predicate, columns[date_index]))))
+
+    return {
+        system_id: round_percentage(filled_count, required_count)
+        for system_id, filled_count, required_count in zip(columns[0], filled, required)
+    }
+
+
+# ============================================================================
+# Completion rules as a SQL expression
+# ============================================================================
+
+# A JSON value is empty when it is null, [], {} or a blank string
+# (compared on its text form: jsonb::text on PostgreSQL, stored text on SQLite)
+EMPTY_JSON_TEXTS = ['null', '[]', '{}']
+BLANK_JSON_STRING_REGEX = r'^"(\s|\\[tnr])*"$'
+
+
+def _filled_condition(lookup: str, field: Any) -> Any:
+    """SQL counterpart of _filled_predicate(field) for one column"""
+    from django.db import models
+    from django.db.models import F, Q, Value
+    from django.db.models.functions import Cast, Replace, Trim
+    from django.db.models.lookups import Exact, In, Regex
+
+    column = F(lookup)
+    not_null = Q(**{f'{lookup}__isnull': False})
+
+    if isinstance(field, (models.CharField, models.TextField)):
+        # str.strip(): drop tabs/newlines, then trim spaces
+        stripped = column
+        for whitespace in ('\t', '\n', '\r'):
+            stripped = Replace(stripped, Value(whitespace), Value(''), output_field=models.TextField())
+        return not_null & ~Q(Exact(Trim(stripped), Value('')))
+
+    if isinstance(field, models.JSONField):
+        as_text = Cast(column, models.TextField())
+        return (
+            not_null
+            & ~Q(In(as_text, EMPTY_JSON_TEXTS))
+            & ~Q(Regex(as_text, BLANK_JSON_STRING_REGEX))
+        )
+
+    return not_null
+
+
+def _balanced_sum(expressions: List[Any]) -> Any:
+    """a + b + ... nested as a balanced tree (SQLite's parser limits nesting depth)"""
+    if len(expressions) == 1:
+        return expressions[0]
+    middle = len(expressions) // 2
+    return _balanced_sum(expressions[:middle]) + _balanced_sum(expressions[middle:])
+
+
+def _count_if(condition: Any) -> Any:
+    from django.db.models import Case, IntegerField, Value, When
+
+    return Case(When(condition, then=Value(1)), default=Value(0), output_field=IntegerField())
+
+
+def ties_rounded_down(max_required: int) -> List[int]:
+    """
+    Half-way ratios that round_percentage() rounds down.
+
+    A ratio is half-way when 2000 * filled / required is an odd integer m
+    (the percentage ends in x.x5). Whether round() goes down depends on the
+    float value of m / 2000, so the cases are listed, limited to those
+    reachable with at most ``max_required`` required fields (required must
+    be a multiple of the reduced denominator of m / 2000).
+    """
+    from fractions import Fraction
+
+    return [
+        m for m in range(1, 2000, 2)
+        if Fraction(m, 2000).denominator <= max_required
+        and round_percentage(m, 2000) == (m - 1) // 2 / 10
+    ]
+
+
+def percentage_expression(filled: Any, required: Any, max_required: int) -> Any:
+    """
+    round_percentage() as a SQL expression over two integer expressions,
+    ``required`` being at most ``max_required``.
+
+    Integer arithmetic rounds half up; the half-way ratios in
+    ties_rounded_down() are then taken one tenth down.
+    """
+    from django.db.models import Case, ExpressionWrapper, FloatField, IntegerField, Value, When
+    from django.db.models.functions import Cast
+    from django.db.models.lookups import Exact, In
+
+    # Integer division on both PostgreSQL and SQLite (operands are >= 0)
+    twice = filled * Value(2000)
+    tenths = ExpressionWrapper((twice + required) / (required * Value(2)), output_field=IntegerField())
+
+    ties = ties_rounded_down(max_required)
+    if ties:
+        half_way = ExpressionWrapper(twice / required, output_field=IntegerField())
+        tenths = tenths - Case(
+            When(In(half_way, ties) & Exact(half_way * required, twice), then=Value(1)),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+    return Cast(tenths, FloatField()) / Value(10.0)
+
+
+def completion_expression(model: Any = None) -> Any:
+    """
+    calculate_system_completion_percentage() as a Django expression.
+
+    Every rule of the compiled CompletionPlan becomes a Case/When over the
+    same column (one-to-one relations are LEFT JOINed, so a missing row is
+    NULL = not filled), including the cloud_provider conditional and the
+    is_go_live / go_live_date special case. Usage:
+
+        System.objects.annotate(completion=completion_expression())
+        System.objects.with_completion().filter(completion__lt=50)
+
+    Returns:
+        Expression: completion percentage (float, rounded as round_percentage())
+    """
+    from django.db.models import Q, Value
+
+    plan = get_completion_plan(model)
+
+    def filled_if(index):
+        return _filled_condition(plan.columns[index], plan.fields[index])
+
+    filled = [_count_if(filled_if(index)) for index, _predicate in plan.required]
+    required = [Value(plan.required_count)]
+
+    for condition_index, expected, _test, value_index, _predicate in plan.conditionals:
+        condition = Q(**{plan.columns[condition_index]: expected})
+        required.append(_count_if(condition))
+        if value_index is not None:
+            filled.append(_count_if(condition & filled_if(value_index)))
+
+    go_live_set = Q(is_go_live__isnull=False)
+    go_live_true = Q(is_go_live=True)
+    required += [_count_if(go_live_set), _count_if(go_live_true)]
+    filled += [
+        _count_if(go_live_set),
+        _count_if(go_live_true & filled_if(plan.go_live_date[0])),
+    ]
+
+    filled_total = _balanced_sum(filled)
+    required_total = _balanced_sum(required)
+    max_required = plan.required_count + len(plan.conditionals) + 2  # + is_go_live, go_live_date
+    return percentage_expression(filled_total, required_total, max_required)
+
+
+# ============================================================================
+# Roadmap maturity (Kiến trúc tổng thể số - 3 giai đoạn)
+# ============================================================================
+
+# One-to-one relations read by the roadmap criteria
+ROADMAP_RELATED_FIELDS = ('architecture', 'integration', 'security')
+
+
+class RoadmapFlag:
+    """
+    Roadmap criterion earning ``points`` when a boolean field is set.
+
+    ``field`` is a System field or ``relation__field`` on a one-to-one
+    relation (a missing row earns nothing). Calling it scores an instance;
+    ``needed`` is the same rule as a Q for aggregates.
+    """
+
+    def __init__(self, field: str, points: int):
+        self.field = field
+        self.points = points
+        self.relation, _sep, self.attname = field.rpartition('__')
+
+    def __call__(self, system: Any) -> int:
+        owner = getattr(system, self.relation, None) if self.relation else system
+        return self.points if owner is not None and getattr(owner, self.attname) else 0
+
+    @property
+    def needed(self) -> Any:
+        """Q matching the systems earning 0 points"""
+        from django.db.models import Q
+
+        needed = Q(**{self.field: False})
+        if self.relation:
+            needed |= Q(**{f'{self.relation}__isnull': True})
+        return needed
+
+
+class RoadmapHosting:
+    """Roadmap criterion earning HOSTING_POINTS by hosting platform"""
+
+    HOSTING_POINTS = {'cloud': 20, 'hybrid': 10}
+
+    def __call__(self, system: Any) -> int:
+        return self.HOSTING_POINTS.get(system.hosting_platform, 0)
+
+    @property
+    def needed(self) -> Any:
+        from django.db.models import Q
+
+        return ~Q(hosting_platform__in=[value for value, points in self.HOSTING_POINTS.items() if points])
+
+
+# (phase, action, detail, criterion) - ``criterion(system)`` returns the points
+# earned, 0 meaning the improvement is still needed; ``criterion.needed`` is
+# the same test in SQL (aggregations.ROADMAP_IMPROVEMENTS). Maximum total: 100.
+ROADMAP_CRITERIA: List[Tuple[int, str, str, Any]] = [
+    # Phase 1: Infrastructure & Foundation
+    (1, 'Cloud Migration', 'Di chuyển lên Cloud hoặc Hybrid', RoadmapHosting()),
+    (1, 'API Gateway', 'Triển khai API Gateway tập trung', RoadmapFlag('integration__has_api_gateway', 15)),
+    (1, 'Data Encryption', 'Triển khai mã hóa dữ liệu', RoadmapFlag('has_encryption', 10)),
+    # Phase 2: Standardization & Integration
+    (2, 'CI/CD Pipeline', 'Triển khai CI/CD tự động', RoadmapFlag('architecture__has_cicd', 15)),
+    (2, 'Documentation', 'Hoàn thiện tài liệu thiết kế', RoadmapFlag('has_design_documents', 10)),
+    (2, 'Architecture Diagram', 'Xây dựng sơ đồ kiến trúc', RoadmapFlag('architecture__has_architecture_diagram', 10)),
+    # Audit log as proxy for monitoring
+    (2, 'Observability', 'Triển khai Monitoring & Logging', RoadmapFlag('has_audit_log', 10)),
+    # Phase 3: Optimization & AI
+    (3, 'Data Encryption', 'Mã hóa dữ liệu at-rest', RoadmapFlag('security__has_data_encryption_at_rest', 10)),
+]
+
+# Phase reported when no improvement is left
+ROADMAP_COMPLETED_PHASE = 4
+
+
+def calculate_roadmap_maturity(system_instance: Any) -> Dict[str, Any]:
+    """
+    Score a system against the digital transformation roadmap.
+
+    The current phase is the earliest phase with an improvement still
+    needed (4 when every criterion is met).
+
+    Args:
+        system_instance: The System model instance (relations in
+                         ROADMAP_RELATED_FIELDS should be select_related)
+
+    Returns:
+        dict: {
+                  'score': 55,
+                  'phase': 2,
+                  'improvements': [{'phase': 2, 'action': 'CI/CD Pipeline', 'detail': '...'}, ...],
+              }
+    """
+    score = 0
+    improvements = []
+
+    for phase, action, detail, criterion in ROADMAP_CRITERIA:
+        points = criterion(system_instance)
+        if points:
+            score += points
+        else:
+            improvements.append({'phase': phase, 'action': action, 'detail': detail})
+
+    return {
+        'score': score,
+        'phase': min((i['phase'] for i in improvements), default=ROADMAP_COMPLETED_PHASE),
+        'improvements': improvements,
+    }
+
+
+def refresh_system_roadmap(system_id: int, model=None) -> Optional[int]:
+    """
+    Recompute and store roadmap_score / roadmap_phase / roadmap_improvements.
+
+    Same contract as refresh_system_completion (fresh reload, queryset.update()).
+
+    Returns:
+        int: The stored phase, or None if the system does not exist
+    """
+    if model is None:
+        from .models import System as model
+
+    system = model.objects.select_related(*ROADMAP_RELATED_FIELDS).filter(pk=system_id).first()
+    if system is None:
+        return None
+
+    maturity = calculate_roadmap_maturity(system)
+    model.objects.filter(pk=system_id).update(
+        roadmap_score=maturity['score'],
+        roadmap_phase=maturity['phase'],
+        roadmap_improvements=maturity['improvements'],
+    )
+    return maturity['phase']
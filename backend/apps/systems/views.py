@@ -1,19 +1,25 @@
-from rest_framework import viewsets, status, filters
+from rest_framework import viewsets, status, filters, serializers
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.views import APIView
 from rest_framework.renderers import BaseRenderer
+from rest_framework.settings import api_settings
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q, Count, Sum, Avg
-from django.db.models.functions import Coalesce
+from django.db.models import Q, Count, Avg, Case, When, Value, IntegerField
 from django.conf import settings
 from django.http import StreamingHttpResponse
+from asgiref.sync import sync_to_async
+import asyncio
 import json
 import logging
+import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from apps.accounts.permissions import IsOrgUserOrAdmin, CanManageOrgSystems
+from config.pagination import KeysetPagination, PageNumberOrKeysetPagination
 from .models import System, Attachment, AIConversation, AIMessage, AIRequestLog, AIResponseFeedback
 from .serializers_feedback import AIResponseFeedbackSerializer, FeedbackStatsSerializer, ImprovementPolicySerializer
 
@@ -1830,6 +1836,114 @@ def estimate_llm_cost(model_name: str, input_tokens: int, output_tokens: int) ->
     input_cost = (input_tokens / 1_000_000) * pricing['input']
     output_cost = (output_tokens / 1_000_000) * pricing['output']
     return input_cost + output_cost
+
+
+# Seconds between keep_alive events while an SSE stream waits on the LLM
+SSE_KEEP_ALIVE_INTERVAL = 10
+
+
+async def run_db(func, *args, **kwargs):
+    """
+    Run sync ORM / cursor code from the async AI streams.
+
+    The thread's connection is closed afterwards (outside transactions), so a
+    stream waiting 10-20s on the LLM does not hold a database connection.
+    """
+    def call():
+        from django.db import connection
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if not connection.in_atomic_block:
+                connection.close()
+
+    return await sync_to_async(call)()
+
+
+def sse_keep_alive():
+    """keep_alive SSE event (stops proxies from closing an idle stream)"""
+    return f"event: keep_alive\ndata: {json.dumps({'timestamp': time.time()})}\n\n"
+
+
+async def with_keep_alive(chunks, interval=SSE_KEEP_ALIVE_INTERVAL):
+    """
+    Re-yield the items of the async iterator ``chunks``, yielding None
+    whenever nothing arrived for ``interval`` seconds (time for keep_alive).
+
+    ``chunks`` is closed if the stream is closed first (client disconnect).
+    """
+    iterator = chunks.__aiter__()
+    pending = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(iterator.__anext__())
+            done, _ = await asyncio.wait({pending}, timeout=interval)
+            if not done:
+                yield None
+                continue
+            try:
+                chunk = pending.result()
+            except StopAsyncIteration:
+                return
+            pending = None
+            yield chunk
+    finally:
+        if pending is not None and not pending.done():
+            pending.cancel()
+            await asyncio.gather(pending, return_exceptions=True)
+        if hasattr(iterator, 'aclose'):
+            await iterator.aclose()
+
+
+class JSONStringStream:
+    """
+    Incrementally decode one string field (e.g. ``"main_answer": "..."``) of
+    a JSON object the LLM is still streaming, so its text can be sent as
+    ``delta`` events before the whole object is parsed.
+    """
+
+    def __init__(self, field):
+        self.pattern = re.compile(r'"%s"\s*:\s*"' % re.escape(field))
+        self.buffer = ''
+        self.position = None
+        self.done = False
+
+    def feed(self, chunk):
+        """Add a chunk of the completion; return the newly decoded field text"""
+        self.buffer += chunk
+        if self.done:
+            return ''
+        if self.position is None:
+            match = self.pattern.search(self.buffer)
+            if not match:
+                return ''
+            self.position = match.end()
+
+        end = self.position
+        while end < len(self.buffer):
+            char = self.buffer[end]
+            if char == '"':
+                self.done = True
+                break
+            if char == '\\':
+                # Wait for the whole escape sequence (\n, \", \uXXXX)
+                length = 6 if self.buffer[end + 1:end + 2] == 'u' else 2
+                if end + length > len(self.buffer):
+                    break
+                end += length
+            else:
+                end += 1
+
+        raw = self.buffer[self.position:end]
+        if re.search(r'\\u[dD][89abAB][0-9a-fA-F]{2}$', raw):
+            # High surrogate: decode together with the low one
+            raw = raw[:-6]
+            end -= 6
+        self.position = end
+        return json.loads(f'"{raw}"', strict=False) if raw else ''
+
+
 from .serializers import (
     SystemListSerializer,
     SystemDetailSerializer,
@@ -1839,8 +1953,56 @@ from .serializers import (
     AIConversationListSerializer,
     AIConversationCreateSerializer,
     AIMessageSerializer,
+    ExportJobSerializer,
+    SYSTEM_DETAIL_MANY,
+    SYSTEM_DETAIL_ONE_TO_ONE,
+    parse_sparse_fieldset,
+)
+from .cache import cached_dashboard, conditional_get
+from .aggregations import (
+    aggregate_buckets,
+    org_cost_rollup,
+    COST_BREAKDOWN_FIELDS,
+    INVESTMENT_STATS_BUCKETS,
+    STATISTICS_BUCKETS,
+    STRATEGIC_STATS_BUCKETS,
+    INTEGRATION_STATS_BUCKETS,
+    OPTIMIZATION_STATS_BUCKETS,
+    ROADMAP_STATS_BUCKETS,
 )
-from .utils import calculate_system_completion_percentage
+from .insights import evaluate_insights
+from .answer_cache import lookup_answer, store_answer
+from .llm_gateway import LLMStream, PHASE_TIMEOUTS, configured_providers, get_claude_client, get_openai_client
+
+
+class DrilldownPagination(KeysetPagination):
+    """Keyset pages for the strategic dashboard drill-down (100 rows by default)"""
+    page_size = 100
+
+
+class FlatExportRenderer(BaseRenderer):
+    """
+    Pass-through renderer for export_data?format=ndjson|csv.
+
+    The streamed body is built by exports.stream_flat_export; only error
+    payloads (400/403/...) go through render() and are sent as JSON.
+    """
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, bytes):
+            return data
+        return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+
+class NDJSONRenderer(FlatExportRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+
+class CSVRenderer(FlatExportRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
 
 
 class EventStreamRenderer(BaseRenderer):
@@ -1854,6 +2016,79 @@ class EventStreamRenderer(BaseRenderer):
         return str(data).encode('utf-8')
 
 
+def with_detail_relations(queryset, relations):
+    """
+    Join / prefetch exactly the SystemDetailSerializer relations in
+    ``relations`` (one-to-ones in the main query, lists prefetched)
+    """
+    return queryset.select_related(
+        'org', *[name for name in SYSTEM_DETAIL_ONE_TO_ONE if name in relations]
+    ).prefetch_related(
+        *[name for name in SYSTEM_DETAIL_MANY if name in relations]
+    )
+
+
+# Columns read by SystemListSerializer (completion and roadmap are stored on
+# System, so no sub-model is needed). Keep in sync with its Meta.fields.
+SYSTEM_LIST_FIELDS = (
+    'id', 'system_code', 'system_name', 'system_name_en', 'org', 'org__name',
+    'status', 'criticality_level', 'form_level', 'go_live_date', 'current_version',
+    'business_owner', 'technical_owner', 'users_total', 'users_mau',
+    'created_at', 'updated_at', 'completion_percentage', 'roadmap_score', 'roadmap_phase',
+)
+
+
+def _system_detail_queryset(view, request, *args, **kwargs):
+    """The single system rendered by retrieve (ETag watermark)"""
+    pk = str(kwargs.get('pk', ''))
+    return view.get_queryset().filter(pk=pk) if pk.isdigit() else System.objects.none()
+
+
+_dashboard_executor = None
+_dashboard_executor_lock = threading.Lock()
+
+
+def get_dashboard_executor():
+    """
+    Process-wide thread pool computing dashboard_bundle sections, so
+    DASHBOARD_BUNDLE_MAX_WORKERS bounds threads (and DB connections) per
+    process however many bundles run at once.
+    """
+    global _dashboard_executor
+    with _dashboard_executor_lock:
+        if _dashboard_executor is None:
+            _dashboard_executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'DASHBOARD_BUNDLE_MAX_WORKERS', 4),
+                thread_name_prefix='dashboard',
+            )
+    return _dashboard_executor
+
+
+# (query param, lookup, value field) of the range filters on stored columns
+RANGE_FILTERS = [
+    ('completion_min', 'completion_percentage__gte', serializers.FloatField()),
+    ('completion_max', 'completion_percentage__lte', serializers.FloatField()),
+    ('roadmap_score_min', 'roadmap_score__gte', serializers.IntegerField()),
+    ('roadmap_score_max', 'roadmap_score__lte', serializers.IntegerField()),
+]
+
+
+def filter_by_ranges(queryset, query_params):
+    """Apply RANGE_FILTERS; invalid values raise ValidationError (400)"""
+    from rest_framework.exceptions import ValidationError
+
+    for param, lookup, field in RANGE_FILTERS:
+        value = query_params.get(param)
+        if not value:
+            continue
+        try:
+            value = field.run_validation(value)
+        except ValidationError as e:
+            raise ValidationError({param: e.detail})
+        queryset = queryset.filter(**{lookup: value})
+    return queryset
+
+
 class SystemViewSet(viewsets.ModelViewSet):
     """
     ViewSet for System CRUD operations
@@ -1886,14 +2121,28 @@ class SystemViewSet(viewsets.ModelViewSet):
     # P0.8: Added new filterset fields for technology stack
     filterset_fields = [
         'org', 'status', 'criticality_level', 'form_level', 'system_group',
-        'programming_language', 'framework', 'database_name', 'hosting_platform'
+        'programming_language', 'framework', 'database_name', 'hosting_platform',
+        'roadmap_phase',
     ]
     # Search by system code, system name, and organization name
     search_fields = [
         'system_code', 'system_name', 'org__name'
     ]
-    ordering_fields = ['created_at', 'updated_at', 'system_code', 'system_name', 'go_live_date']
+    ordering_fields = [
+        'created_at', 'updated_at', 'system_code', 'system_name', 'go_live_date',
+        'completion_percentage', 'roadmap_score',
+    ]
     ordering = ['-created_at']
+    # ?page=N as before; ?pagination=cursor / ?cursor= for keyset pages
+    pagination_class = PageNumberOrKeysetPagination
+    # Actions rendering SystemDetailSerializer with ?fields= / ?expand=
+    SPARSE_FIELDSET_ACTIONS = ('retrieve', 'export_data')
+
+    def get_serializer(self, *args, **kwargs):
+        """Pass ?fields= / ?expand= to SystemDetailSerializer (sparse fieldsets)"""
+        if self.action in self.SPARSE_FIELDSET_ACTIONS:
+            kwargs['fields'], kwargs['expand'] = parse_sparse_fieldset(self.request.query_params)
+        return super().get_serializer(*args, **kwargs)
 
     def get_serializer_class(self):
         """Return appropriate serializer based on action"""
@@ -1905,7 +2154,16 @@ class SystemViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """Filter queryset based on user role"""
-        queryset = super().get_queryset()
+        if self.action == 'list':
+            # Only the SystemListSerializer columns: one query per page
+            # (plus the count), whatever the page size
+            queryset = System.objects.select_related('org').only(*SYSTEM_LIST_FIELDS)
+        elif self.action in self.SPARSE_FIELDSET_ACTIONS:
+            # Fetch only the relations ?fields= / ?expand= will serialize
+            _fields, relations = parse_sparse_fieldset(self.request.query_params)
+            queryset = with_detail_relations(System.objects.all(), relations)
+        else:
+            queryset = super().get_queryset()
         user = self.request.user
 
         # Exclude soft-deleted systems
@@ -1926,6 +2184,23 @@ class SystemViewSet(viewsets.ModelViewSet):
         # If user has no organization assigned, return empty queryset
         return queryset.none()
 
+    @conditional_get('system_list')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional_get('system_detail', _system_detail_queryset)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        """
+        Add range filters on stored, indexed columns:
+        ?completion_min= / ?completion_max= (completion %) and
+        ?roadmap_score_min= / ?roadmap_score_max= (roadmap maturity score)
+        """
+        queryset = super().filter_queryset(queryset)
+        return filter_by_ranges(queryset, self.request.query_params)
+
     def perform_create(self, serializer):
         """
         Auto-set org field from logged-in user's organization
@@ -1947,6 +2222,61 @@ class SystemViewSet(viewsets.ModelViewSet):
             from rest_framework.exceptions import ValidationError
             raise ValidationError({'error': 'Invalid user role'})
 
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Create/update many systems in one request (imports, batch corrections).
+
+        Body: a list of SystemCreateUpdateSerializer payloads, or
+        {"systems": [...]}. Items with "id" update that system, the others
+        are created. Every item is validated, then the valid ones are
+        written in one transaction with per-table bulk writes (see bulk.py).
+
+        Query params:
+        - atomic=true: write nothing if any item is invalid
+
+        Returns per-item results in submission order:
+            {"created": 2, "updated": 1, "errors": 1, "results": [
+                {"index": 0, "status": "created", "id": 12, "system_code": "SYS-..."},
+                {"index": 3, "status": "error", "id": null, "errors": {...}}, ...]}
+        """
+        from .bulk import BULK_MAX_ITEMS, bulk_write_systems
+
+        user = request.user
+        if user.role not in ('admin', 'org_user'):
+            return Response(
+                {'error': 'Bạn không có quyền tạo hoặc cập nhật hệ thống'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        if user.role == 'org_user' and not user.organization:
+            return Response(
+                {'error': 'User must be assigned to an organization'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        items = request.data.get('systems') if isinstance(request.data, dict) else request.data
+        if not isinstance(items, list) or not items:
+            return Response(
+                {'error': 'Dữ liệu phải là danh sách hệ thống'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(items) > BULK_MAX_ITEMS:
+            return Response(
+                {'error': f'Tối đa {BULK_MAX_ITEMS} hệ thống mỗi lần gửi'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        atomic = request.query_params.get('atomic', '').lower() in ('1', 'true')
+        results = bulk_write_systems(items, self.get_queryset(), self.get_serializer_context(), atomic=atomic)
+
+        counts = {key: sum(1 for r in results if r['status'] == value)
+                  for key, value in (('created', 'created'), ('updated', 'updated'), ('errors', 'error'))}
+        written = counts['created'] + counts['updated']
+        return Response(
+            {**counts, 'results': results},
+            status=status.HTTP_200_OK if written or not counts['errors'] else status.HTTP_400_BAD_REQUEST
+        )
+
     @action(detail=True, methods=['post'])
     def save_draft(self, request, pk=None):
         """Save system as draft"""
@@ -1970,41 +2300,139 @@ class SystemViewSet(viewsets.ModelViewSet):
         """Get system statistics with average completion percentage"""
         queryset = self.get_queryset()
 
-        # Calculate average completion percentage
-        systems = list(queryset)
-        if systems:
-            total_completion = sum(
-                calculate_system_completion_percentage(system)
-                for system in systems
-            )
-            avg_completion = round(total_completion / len(systems), 1)
-        else:
-            avg_completion = 0.0
-
+        buckets = aggregate_buckets(queryset, STATISTICS_BUCKETS)
+        avg_completion = buckets['average_completion_percentage']
         stats = {
-            'total': queryset.count(),
-            'average_completion_percentage': avg_completion,
-            'by_status': {
-                'operating': queryset.filter(status='operating').count(),
-                'pilot': queryset.filter(status='pilot').count(),
-                'stopped': queryset.filter(status='stopped').count(),
-                'replacing': queryset.filter(status='replacing').count(),
-            },
-            'by_criticality': {
-                # P0.8: Removed 'critical' option per customer request
-                'high': queryset.filter(criticality_level='high').count(),
-                'medium': queryset.filter(criticality_level='medium').count(),
-                'low': queryset.filter(criticality_level='low').count(),
-            },
+            'total': buckets['total'],
+            'average_completion_percentage': round(avg_completion, 1) if avg_completion is not None else 0.0,
+            'by_status': buckets['by_status'],
+            'by_criticality': buckets['by_criticality'],
             'by_form_level': {
-                'level_1': queryset.filter(form_level=1).count(),
-                'level_2': queryset.filter(form_level=2).count(),
+                'level_1': buckets['by_form_level'][1],
+                'level_2': buckets['by_form_level'][2],
             },
         }
 
         return Response(stats)
 
+    # dashboard_bundle section name -> payload builder (takes the base queryset)
+    DASHBOARD_SECTIONS = {
+        'strategic_stats': '_strategic_stats_section',
+        'investment_stats': '_investment_stats_section',
+        'integration_stats': '_integration_stats_section',
+        'optimization_stats': '_optimization_stats_section',
+        'monitoring_stats': '_monitoring_stats_section',
+        'insights': '_insights_section',
+        'roadmap_stats': '_roadmap_stats_section',
+    }
+
+    def _dashboard_section(self, name, queryset):
+        """
+        Payload of a strategic section: the materialized snapshot when
+        DASHBOARD_SNAPSHOTS_ENABLED and one exists (with 'generated_at'),
+        otherwise computed live from ``queryset``
+        """
+        if getattr(settings, 'DASHBOARD_SNAPSHOTS_ENABLED', False):
+            from .snapshots import read_snapshot
+            snapshot = read_snapshot(name)
+            if snapshot is not None:
+                return snapshot
+        return getattr(self, self.DASHBOARD_SECTIONS[name])(queryset)
+
     @action(detail=False, methods=['get'])
+    @conditional_get('dashboard_bundle')
+    def dashboard_bundle(self, request):
+        """
+        Strategic Dashboard - all requested sections in one response.
+
+        Sections share one role check and one base queryset, are served from
+        the per-section dashboard cache when possible and otherwise computed
+        concurrently on the process-wide thread pool (get_dashboard_executor).
+        Only accessible by lanhdaobo role.
+
+        Query params:
+        - sections: Comma-separated section names (default: all), e.g.
+                    ?sections=strategic_stats,insights
+
+        Response:
+        {
+            'sections': {'strategic_stats': {...same payload as the action...}, ...},
+            'meta': {
+                'sections': {'strategic_stats': {'duration_ms': 12.3, 'cached': False}, ...},
+                'total_duration_ms': 25.1,
+                'workers': 4,
+            }
+        }
+        """
+        from django.db import connection
+        from .cache import dashboard_cache_key, get_data_version, read_dashboard_cache, write_dashboard_cache
+
+        user = request.user
+        if user.role not in ['leader', 'admin']:
+            return Response(
+                {'error': 'Chỉ Lãnh đạo Bộ mới có quyền xem Dashboard chiến lược'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        sections_param = request.query_params.get('sections', '')
+        sections = [name.strip() for name in sections_param.split(',') if name.strip()] or list(self.DASHBOARD_SECTIONS)
+        unknown = [name for name in sections if name not in self.DASHBOARD_SECTIONS]
+        if unknown:
+            return Response(
+                {
+                    'error': f"Unknown sections: {', '.join(unknown)}",
+                    'available_sections': list(self.DASHBOARD_SECTIONS),
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        sections = list(dict.fromkeys(sections))
+
+        started = time.perf_counter()
+        base_queryset = System.objects.filter(is_deleted=False)
+        version = get_data_version()
+
+        def compute(name, close_connection=False):
+            section_started = time.perf_counter()
+            try:
+                # Same cache entry as the standalone action (no query string)
+                key = dashboard_cache_key(name, request, version, query='') if version else None
+                data = read_dashboard_cache(key) if key else None
+                cached = data is not None
+                if not cached:
+                    data = self._dashboard_section(name, base_queryset)
+                    if key:
+                        write_dashboard_cache(key, data)
+                return name, data, {
+                    'duration_ms': round((time.perf_counter() - section_started) * 1000, 1),
+                    'cached': cached,
+                }
+            finally:
+                if close_connection:
+                    # Worker threads open their own DB connection
+                    connection.close()
+
+        # Worker threads use separate DB connections that cannot see writes of
+        # an open transaction (ATOMIC_REQUESTS, tests) - run inline there
+        max_workers = min(getattr(settings, 'DASHBOARD_BUNDLE_MAX_WORKERS', 4), len(sections))
+        if max_workers > 1 and not connection.in_atomic_block:
+            executor = get_dashboard_executor()
+            results = list(executor.map(lambda name: compute(name, close_connection=True), sections))
+        else:
+            max_workers = 1
+            results = [compute(name) for name in sections]
+
+        return Response({
+            'sections': {name: data for name, data, _meta in results},
+            'meta': {
+                'sections': {name: section_meta for name, _data, section_meta in results},
+                'total_duration_ms': round((time.perf_counter() - started) * 1000, 1),
+                'workers': max_workers,
+            },
+        })
+
+    @action(detail=False, methods=['get'])
+    @conditional_get('strategic_stats')
+    @cached_dashboard('strategic_stats')
     def strategic_stats(self, request):
         """
         Strategic Dashboard - Overview Statistics
@@ -2019,36 +2447,22 @@ class SystemViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        # Get all active systems
-        queryset = System.objects.filter(is_deleted=False)
-        total_systems = queryset.count()
+        return Response(self._dashboard_section('strategic_stats', System.objects.filter(is_deleted=False)))
+
+    def _strategic_stats_section(self, queryset):
+        """strategic_stats payload for the active systems in ``queryset`` (also used by dashboard_bundle)"""
+        # Status / criticality / scope distributions and integration totals
+        # are computed in a single conditional-aggregation query
+        buckets = aggregate_buckets(queryset, STRATEGIC_STATS_BUCKETS)
+        total_systems = buckets['total']
 
         # Organization count
         from apps.organizations.models import Organization
         total_orgs = Organization.objects.count()
 
-        # Status distribution
-        status_distribution = {
-            'operating': queryset.filter(status='operating').count(),
-            'pilot': queryset.filter(status='pilot').count(),
-            'testing': queryset.filter(status='testing').count(),
-            'stopped': queryset.filter(status='stopped').count(),
-            'replacing': queryset.filter(status='replacing').count(),
-        }
-
-        # Criticality distribution
-        criticality_distribution = {
-            'high': queryset.filter(criticality_level='high').count(),
-            'medium': queryset.filter(criticality_level='medium').count(),
-            'low': queryset.filter(criticality_level='low').count(),
-        }
-
-        # Scope distribution
-        scope_distribution = {
-            'internal_unit': queryset.filter(scope='internal_unit').count(),
-            'org_wide': queryset.filter(scope='org_wide').count(),
-            'external': queryset.filter(scope='external').count(),
-        }
+        status_distribution = buckets['status_distribution']
+        criticality_distribution = buckets['criticality_distribution']
+        scope_distribution = buckets['scope_distribution']
 
         # Systems per organization (top 10)
         systems_per_org = list(
@@ -2057,38 +2471,13 @@ class SystemViewSet(viewsets.ModelViewSet):
             .order_by('-count')[:10]
         )
 
-        # Recommendation distribution (from assessment)
-        recommendation_distribution = {
-            'keep': 0,
-            'upgrade': 0,
-            'replace': 0,
-            'merge': 0,
-            'unknown': 0,
-        }
-        for system in queryset.select_related('assessment'):
-            try:
-                if hasattr(system, 'assessment') and system.assessment:
-                    rec = system.assessment.recommendation
-                    if rec in recommendation_distribution:
-                        recommendation_distribution[rec] += 1
-                    else:
-                        recommendation_distribution['unknown'] += 1
-                else:
-                    recommendation_distribution['unknown'] += 1
-            except Exception:
-                recommendation_distribution['unknown'] += 1
+        # Recommendation distribution (from assessment, classified in SQL)
+        recommendation_distribution = buckets['recommendation_distribution']
 
         # Integration stats
-        total_api_provided = queryset.aggregate(
-            total=Coalesce(Sum('api_provided_count'), 0)
-        )['total']
-        total_api_consumed = queryset.aggregate(
-            total=Coalesce(Sum('api_consumed_count'), 0)
-        )['total']
-
-        systems_with_integration = queryset.filter(
-            Q(api_provided_count__gt=0) | Q(api_consumed_count__gt=0)
-        ).count()
+        total_api_provided = buckets['total_api_provided']
+        total_api_consumed = buckets['total_api_consumed']
+        systems_with_integration = buckets['with_integration']
         systems_without_integration = total_systems - systems_with_integration
 
         # Calculate health score
@@ -2108,7 +2497,7 @@ class SystemViewSet(viewsets.ModelViewSet):
             'info': recommendation_distribution.get('unknown', 0),
         }
 
-        return Response({
+        return {
             'overview': {
                 'total_systems': total_systems,
                 'total_organizations': total_orgs,
@@ -2118,6 +2507,7 @@ class SystemViewSet(viewsets.ModelViewSet):
             'status_distribution': status_distribution,
             'criticality_distribution': criticality_distribution,
             'scope_distribution': scope_distribution,
+            'hosting_distribution': buckets['hosting_distribution'],
             'systems_per_org': systems_per_org,
             'recommendation_distribution': recommendation_distribution,
             'integration': {
@@ -2126,9 +2516,11 @@ class SystemViewSet(viewsets.ModelViewSet):
                 'with_integration': systems_with_integration,
                 'without_integration': systems_without_integration,
             },
-        })
+        }
 
     @action(detail=False, methods=['get'])
+    @conditional_get('investment_stats')
+    @cached_dashboard('investment_stats')
     def investment_stats(self, request):
         """
         Strategic Dashboard - Investment Analytics
@@ -2142,78 +2534,49 @@ class SystemViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        from apps.organizations.models import Organization
+        return Response(self._dashboard_section('investment_stats', System.objects.filter(is_deleted=False)))
 
-        queryset = System.objects.filter(is_deleted=False)
+    def _investment_stats_section(self, queryset):
+        """investment_stats payload for the active systems in ``queryset`` (also used by dashboard_bundle)"""
+        def as_number(value):
+            # Sums are Decimal (or None when no cost rows); keep 0 for "no data"
+            return float(value) if value else 0
 
-        # Total investment across all systems
-        total_investment = 0
+        # Total investment and cost breakdown across all systems (single aggregate)
+        totals = aggregate_buckets(queryset, INVESTMENT_STATS_BUCKETS)
+        total_investment = as_number(totals['initial_investment'])
         cost_breakdown = {
-            'development': 0,
-            'license': 0,
-            'maintenance': 0,
-            'infrastructure': 0,
-            'personnel': 0,
+            key: as_number(totals[key]) for key in COST_BREAKDOWN_FIELDS
         }
 
-        for system in queryset.select_related('cost'):
-            try:
-                if hasattr(system, 'cost') and system.cost:
-                    cost = system.cost
-                    if cost.initial_investment:
-                        total_investment += float(cost.initial_investment)
-                    if cost.development_cost:
-                        cost_breakdown['development'] += float(cost.development_cost)
-                    if cost.annual_license_cost:
-                        cost_breakdown['license'] += float(cost.annual_license_cost)
-                    if cost.annual_maintenance_cost:
-                        cost_breakdown['maintenance'] += float(cost.annual_maintenance_cost)
-                    if cost.annual_infrastructure_cost:
-                        cost_breakdown['infrastructure'] += float(cost.annual_infrastructure_cost)
-                    if cost.annual_personnel_cost:
-                        cost_breakdown['personnel'] += float(cost.annual_personnel_cost)
-            except Exception:
-                pass
-
-        # Investment by organization
-        by_organization = []
-        for org in Organization.objects.all():
-            org_systems = queryset.filter(org=org)
-            system_count = org_systems.count()
-            org_total_cost = 0
-
-            for sys in org_systems.select_related('cost'):
-                try:
-                    if hasattr(sys, 'cost') and sys.cost and sys.cost.initial_investment:
-                        org_total_cost += float(sys.cost.initial_investment)
-                except Exception:
-                    pass
-
-            if system_count > 0:
-                by_organization.append({
-                    'org_id': org.id,
-                    'org_name': org.name,
-                    'system_count': system_count,
-                    'total_cost': org_total_cost,
-                })
-
-        by_organization.sort(key=lambda x: x['system_count'], reverse=True)
+        # Investment by organization: top 15 by system count (one grouped query)
+        by_organization = [
+            {
+                'org_id': row['org_id'],
+                'org_name': row['org__name'],
+                'system_count': row['system_count'],
+                'total_cost': as_number(row['initial_investment']),
+            }
+            for row in org_cost_rollup(queryset)[:15]
+        ]
 
         # Cost efficiency metrics
-        total_users = queryset.aggregate(total=Coalesce(Sum('users_total'), 0))['total']
+        total_users = totals['total_users']
         avg_cost_per_user = total_investment / total_users if total_users > 0 else 0
 
-        return Response({
+        return {
             'total_investment': total_investment,
-            'by_organization': by_organization[:15],
+            'by_organization': by_organization,
             'cost_breakdown': cost_breakdown,
             'cost_efficiency': {
                 'avg_cost_per_user': round(avg_cost_per_user, 2),
                 'total_users': total_users,
             },
-        })
+        }
 
     @action(detail=False, methods=['get'])
+    @conditional_get('integration_stats')
+    @cached_dashboard('integration_stats')
     def integration_stats(self, request):
         """
         Strategic Dashboard - Integration Analytics
@@ -2227,21 +2590,16 @@ class SystemViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        queryset = System.objects.filter(is_deleted=False)
-        total_systems = queryset.count()
-
-        # API counts
-        total_api_provided = queryset.aggregate(
-            total=Coalesce(Sum('api_provided_count'), 0)
-        )['total']
-        total_api_consumed = queryset.aggregate(
-            total=Coalesce(Sum('api_consumed_count'), 0)
-        )['total']
-
-        # Systems with/without integration
-        systems_with_integration = queryset.filter(
-            Q(api_provided_count__gt=0) | Q(api_consumed_count__gt=0)
-        ).count()
+        return Response(self._dashboard_section('integration_stats', System.objects.filter(is_deleted=False)))
+
+    def _integration_stats_section(self, queryset):
+        """integration_stats payload for the active systems in ``queryset`` (also used by dashboard_bundle)"""
+        # API counts and systems with/without integration (single query)
+        buckets = aggregate_buckets(queryset, INTEGRATION_STATS_BUCKETS)
+        total_systems = buckets['total']
+        total_api_provided = buckets['total_api_provided']
+        total_api_consumed = buckets['total_api_consumed']
+        systems_with_integration = buckets['with_integration']
         systems_without_integration = total_systems - systems_with_integration
 
         # Data islands (systems with no integration)
@@ -2265,7 +2623,7 @@ class SystemViewSet(viewsets.ModelViewSet):
             .values('id', 'system_name', 'api_consumed_count')[:10]
         )
 
-        return Response({
+        return {
             'total_api_provided': total_api_provided,
             'total_api_consumed': total_api_consumed,
             'systems_with_integration': systems_with_integration,
@@ -2274,9 +2632,11 @@ class SystemViewSet(viewsets.ModelViewSet):
             'data_islands': data_islands,
             'top_api_providers': top_api_providers,
             'top_api_consumers': top_api_consumers,
-        })
+        }
 
     @action(detail=False, methods=['get'])
+    @conditional_get('optimization_stats')
+    @cached_dashboard('optimization_stats')
     def optimization_stats(self, request):
         """
         Strategic Dashboard - Optimization Analytics
@@ -2290,42 +2650,29 @@ class SystemViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        from datetime import datetime, timedelta
-
-        queryset = System.objects.filter(is_deleted=False)
+        return Response(self._dashboard_section('optimization_stats', System.objects.filter(is_deleted=False)))
 
-        # Recommendation distribution
-        recommendations = {
-            'keep': 0,
-            'upgrade': 0,
-            'replace': 0,
-            'merge': 0,
-            'unknown': 0,
-        }
+    def _optimization_stats_section(self, queryset):
+        """optimization_stats payload for the active systems in ``queryset`` (also used by dashboard_bundle)"""
+        from datetime import datetime, timedelta
 
-        legacy_systems = []
-        for system in queryset.select_related('assessment'):
-            try:
-                if hasattr(system, 'assessment') and system.assessment:
-                    rec = system.assessment.recommendation
-                    if rec in recommendations:
-                        recommendations[rec] += 1
-                    else:
-                        recommendations['unknown'] += 1
-
-                    # Collect systems marked for replacement
-                    if rec == 'replace':
-                        legacy_systems.append({
-                            'id': system.id,
-                            'name': system.system_name,
-                            'org_name': system.org.name if system.org else None,
-                            'go_live_date': system.go_live_date.isoformat() if system.go_live_date else None,
-                            'users': system.users_total or 0,
-                        })
-                else:
-                    recommendations['unknown'] += 1
-            except Exception:
-                recommendations['unknown'] += 1
+        # Recommendation distribution (classified in SQL, incl. missing assessment)
+        buckets = aggregate_buckets(queryset, OPTIMIZATION_STATS_BUCKETS)
+        recommendations = buckets['recommendation_distribution']
+
+        # Collect systems marked for replacement
+        legacy_systems = [
+            {
+                'id': system['id'],
+                'name': system['system_name'],
+                'org_name': system['org__name'],
+                'go_live_date': system['go_live_date'].isoformat() if system['go_live_date'] else None,
+                'users': system['users_total'] or 0,
+            }
+            for system in queryset.in_recommendation_bucket('replace').values(
+                'id', 'system_name', 'org__name', 'go_live_date', 'users_total'
+            )[:10]
+        ]
 
         # Systems that need attention (stopped or replacing)
         attention_needed = list(
@@ -2333,17 +2680,21 @@ class SystemViewSet(viewsets.ModelViewSet):
             .values('id', 'system_name', 'status', 'org__name')[:10]
         )
 
-        return Response({
+        total_systems = buckets['total']
+
+        return {
             'recommendations': recommendations,
-            'legacy_systems': legacy_systems[:10],
+            'legacy_systems': legacy_systems,
             'attention_needed': attention_needed,
             'total_needing_action': recommendations['replace'] + recommendations['upgrade'],
             'assessment_coverage': round(
-                ((queryset.count() - recommendations['unknown']) / queryset.count() * 100), 1
-            ) if queryset.count() > 0 else 0,
-        })
+                ((total_systems - recommendations['unknown']) / total_systems * 100), 1
+            ) if total_systems > 0 else 0,
+        }
 
     @action(detail=False, methods=['get'])
+    @conditional_get('monitoring_stats')
+    @cached_dashboard('monitoring_stats')
     def monitoring_stats(self, request):
         """
         Strategic Dashboard - Monitoring Analytics
@@ -2357,55 +2708,40 @@ class SystemViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        from apps.organizations.models import Organization
-
-        queryset = System.objects.filter(is_deleted=False)
-
-        # Organization rankings
-        organization_rankings = []
-        for org in Organization.objects.all():
-            org_systems = list(queryset.filter(org=org))
-            system_count = len(org_systems)
-
-            if system_count > 0:
-                # Calculate average completion
-                total_completion = sum(
-                    calculate_system_completion_percentage(sys)
-                    for sys in org_systems
-                )
-                avg_completion = round(total_completion / system_count, 1)
-
-                # Calculate average performance (if available)
-                performance_scores = []
-                for sys in org_systems:
-                    try:
-                        if hasattr(sys, 'assessment') and sys.assessment and sys.assessment.performance_rating:
-                            performance_scores.append(sys.assessment.performance_rating)
-                    except Exception:
-                        pass
-
-                avg_performance = round(sum(performance_scores) / len(performance_scores), 1) if performance_scores else None
-
-                organization_rankings.append({
-                    'org_id': org.id,
-                    'org_name': org.name,
-                    'system_count': system_count,
-                    'avg_completion': avg_completion,
-                    'avg_performance': avg_performance,
-                })
-
-        # Sort by system count
-        organization_rankings.sort(key=lambda x: x['system_count'], reverse=True)
+        return Response(self._dashboard_section('monitoring_stats', System.objects.filter(is_deleted=False)))
+
+    def _monitoring_stats_section(self, queryset):
+        """monitoring_stats payload for the active systems in ``queryset`` (also used by dashboard_bundle)"""
+        # Organization rankings: one grouped query over the stored completion
+        # (performance_rating 0/NULL means "not rated" and is left out of the average)
+        org_rows = (
+            queryset.values('org_id', 'org__name')
+            .annotate(
+                system_count=Count('pk'),
+                avg_completion=Avg('completion_percentage'),
+                avg_performance=Avg(
+                    'assessment__performance_rating',
+                    filter=Q(assessment__performance_rating__gt=0),
+                ),
+            )
+            .order_by('-system_count', 'org__name')
+        )
+        organization_rankings = [
+            {
+                'org_id': row['org_id'],
+                'org_name': row['org__name'],
+                'system_count': row['system_count'],
+                'avg_completion': round(row['avg_completion'], 1),
+                'avg_performance': round(row['avg_performance'], 1) if row['avg_performance'] is not None else None,
+            }
+            for row in org_rows
+        ]
 
         # Overall stats
-        all_systems = list(queryset)
-        total_completion = sum(
-            calculate_system_completion_percentage(sys)
-            for sys in all_systems
-        )
-        avg_completion_all = round(total_completion / len(all_systems), 1) if all_systems else 0
+        avg_completion_all = queryset.aggregate(avg=Avg('completion_percentage'))['avg']
+        avg_completion_all = round(avg_completion_all, 1) if avg_completion_all is not None else 0
 
-        return Response({
+        return {
             'organization_rankings': organization_rankings,
             'summary': {
                 'total_organizations': len(organization_rankings),
@@ -2413,7 +2749,7 @@ class SystemViewSet(viewsets.ModelViewSet):
                 'orgs_with_100_percent': sum(1 for o in organization_rankings if o['avg_completion'] == 100),
                 'orgs_below_50_percent': sum(1 for o in organization_rankings if o['avg_completion'] < 50),
             },
-        })
+        }
 
     @action(detail=False, methods=['get'])
     def drilldown(self, request):
@@ -2461,50 +2797,52 @@ class SystemViewSet(viewsets.ModelViewSet):
                     Q(api_consumed_count__isnull=True) | Q(api_consumed_count=0)
                 )
         elif filter_type == 'recommendation':
-            # Need to filter through assessment relation
-            # Match logic with strategic_stats recommendation_distribution calculation
-            valid_recommendations = ['keep', 'upgrade', 'replace', 'merge']
-            system_ids = []
-            for system in queryset.select_related('assessment'):
-                try:
-                    if hasattr(system, 'assessment') and system.assessment:
-                        rec = system.assessment.recommendation
-                        if filter_value == 'unknown':
-                            # System has assessment but recommendation not in valid list
-                            if rec not in valid_recommendations:
-                                system_ids.append(system.id)
-                        else:
-                            # Match specific recommendation
-                            if rec == filter_value:
-                                system_ids.append(system.id)
-                    else:
-                        # System has no assessment → counts as unknown
-                        if filter_value == 'unknown':
-                            system_ids.append(system.id)
-                except Exception:
-                    # Exception accessing assessment → counts as unknown
-                    if filter_value == 'unknown':
-                        system_ids.append(system.id)
-            queryset = queryset.filter(id__in=system_ids)
-
-        # Return paginated results
-        systems = list(
-            queryset.select_related('org')
-            .values(
-                'id', 'system_name', 'system_code', 'status',
-                'criticality_level', 'scope', 'org__name',
-                'users_total', 'go_live_date'
-            )[:100]
+            # Same classification as strategic_stats recommendation_distribution:
+            # 'unknown' also matches systems without an assessment row
+            queryset = queryset.in_recommendation_bucket(filter_value)
+
+        # Keyset pages (default 100 rows, ?page_size= up to 1000, ?ordering=
+        # any of ordering_fields); follow next_cursor to get every system.
+        # The total is only counted for the first page.
+        paginator = DrilldownPagination()
+        page = paginator.paginate_queryset(
+            queryset.select_related('org').only(
+                'id', 'system_name', 'system_code', 'status', 'criticality_level',
+                'scope', 'users_total', 'go_live_date', 'created_at', 'updated_at',
+                'completion_percentage', 'roadmap_score', 'org__name',
+            ),
+            request,
+            view=self,
         )
+        systems = [
+            {
+                'id': system.id,
+                'system_name': system.system_name,
+                'system_code': system.system_code,
+                'status': system.status,
+                'criticality_level': system.criticality_level,
+                'scope': system.scope,
+                'org__name': system.org.name if system.org else None,
+                'users_total': system.users_total,
+                'go_live_date': system.go_live_date,
+            }
+            for system in page
+        ]
 
-        return Response({
-            'count': len(systems),
+        data = {
             'filter_type': filter_type,
             'filter_value': filter_value,
             'systems': systems,
-        })
+            'next': paginator.get_next_link(),
+            'next_cursor': paginator.next_cursor,
+        }
+        if paginator.cursor_query_param not in request.query_params:
+            data['count'] = queryset.count()
+        return Response(data)
 
     @action(detail=False, methods=['get'])
+    @conditional_get('insights')
+    @cached_dashboard('insights')
     def insights(self, request):
         """
         Strategic Dashboard - Rule-based Insights
@@ -2518,240 +2856,16 @@ class SystemViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        queryset = System.objects.filter(is_deleted=False)
-        total_systems = queryset.count()
-
-        insights = []
-
-        # === DOCUMENTATION INSIGHTS ===
-        # Systems without design docs
-        no_design_docs = queryset.filter(has_design_documents=False).count()
-        if no_design_docs > 0:
-            pct = round(no_design_docs / total_systems * 100, 1)
-            insights.append({
-                'id': 'no_design_docs',
-                'category': 'documentation',
-                'severity': 'warning' if pct > 50 else 'info',
-                'title': f'{no_design_docs} hệ thống chưa có tài liệu thiết kế',
-                'description': f'{pct}% hệ thống thiếu tài liệu thiết kế, ảnh hưởng đến khả năng bảo trì và nâng cấp.',
-                'recommendation': 'Ưu tiên bổ sung tài liệu cho các hệ thống mức độ quan trọng cao.',
-                'metric': {'count': no_design_docs, 'percentage': pct},
-                'filter': {'type': 'no_design_docs'},
-            })
-
-        # Systems without architecture diagram
-        no_arch_diagram = queryset.filter(
-            Q(architecture__has_architecture_diagram=False) | Q(architecture__isnull=True)
-        ).count()
-        if no_arch_diagram > 0:
-            pct = round(no_arch_diagram / total_systems * 100, 1)
-            insights.append({
-                'id': 'no_arch_diagram',
-                'category': 'documentation',
-                'severity': 'warning' if pct > 70 else 'info',
-                'title': f'{no_arch_diagram} hệ thống chưa có sơ đồ kiến trúc',
-                'description': f'{pct}% hệ thống thiếu sơ đồ kiến trúc, gây khó khăn trong việc đánh giá và tích hợp.',
-                'recommendation': 'Xây dựng sơ đồ kiến trúc cho các hệ thống core trước.',
-                'metric': {'count': no_arch_diagram, 'percentage': pct},
-                'filter': {'type': 'no_arch_diagram'},
-            })
-
-        # === DEVOPS INSIGHTS ===
-        # Systems without CI/CD
-        no_cicd = queryset.filter(
-            Q(architecture__has_cicd=False) | Q(architecture__isnull=True)
-        ).count()
-        if no_cicd > 0:
-            pct = round(no_cicd / total_systems * 100, 1)
-            insights.append({
-                'id': 'no_cicd',
-                'category': 'devops',
-                'severity': 'warning' if pct > 80 else 'info',
-                'title': f'{no_cicd} hệ thống chưa có CI/CD',
-                'description': f'{pct}% hệ thống triển khai thủ công, tăng rủi ro lỗi và thời gian release.',
-                'recommendation': 'Triển khai CI/CD pipeline cho các hệ thống có tần suất release cao.',
-                'metric': {'count': no_cicd, 'percentage': pct},
-                'filter': {'type': 'no_cicd'},
-            })
-
-        # Systems without API Gateway
-        no_api_gateway = queryset.filter(
-            Q(integration__has_api_gateway=False) | Q(integration__isnull=True)
-        ).count()
-        if no_api_gateway > 0:
-            pct = round(no_api_gateway / total_systems * 100, 1)
-            insights.append({
-                'id': 'no_api_gateway',
-                'category': 'integration',
-                'severity': 'warning' if pct > 70 else 'info',
-                'title': f'{no_api_gateway} hệ thống chưa có API Gateway',
-                'description': f'{pct}% hệ thống thiếu API Gateway, khó kiểm soát và bảo mật API.',
-                'recommendation': 'Triển khai API Gateway tập trung theo kiến trúc tổng thể.',
-                'metric': {'count': no_api_gateway, 'percentage': pct},
-                'filter': {'type': 'no_api_gateway'},
-            })
-
-        # === INFRASTRUCTURE INSIGHTS ===
-        # Systems still on-premise
-        on_premise = queryset.filter(hosting_platform='on_premise').count()
-        if on_premise > 0:
-            pct = round(on_premise / total_systems * 100, 1)
-            insights.append({
-                'id': 'on_premise',
-                'category': 'infrastructure',
-                'severity': 'info',
-                'title': f'{on_premise} hệ thống còn on-premise',
-                'description': f'{pct}% hệ thống chạy on-premise. Theo lộ trình chuyển đổi số, cần đánh giá khả năng di chuyển lên Cloud.',
-                'recommendation': 'Lập kế hoạch Cloud migration theo giai đoạn 1 (2026).',
-                'metric': {'count': on_premise, 'percentage': pct},
-                'filter': {'type': 'hosting_platform', 'value': 'on_premise'},
-            })
+        return Response(self._dashboard_section('insights', System.objects.filter(is_deleted=False)))
 
-        # Systems on cloud
-        on_cloud = queryset.filter(hosting_platform='cloud').count()
-        if on_cloud > 0:
-            pct = round(on_cloud / total_systems * 100, 1)
-            insights.append({
-                'id': 'cloud_ready',
-                'category': 'infrastructure',
-                'severity': 'success',
-                'title': f'{on_cloud} hệ thống đã lên Cloud',
-                'description': f'{pct}% hệ thống đã triển khai trên Cloud, đáp ứng định hướng kiến trúc hiện đại.',
-                'recommendation': 'Tiếp tục mở rộng và tối ưu hóa chi phí Cloud.',
-                'metric': {'count': on_cloud, 'percentage': pct},
-                'filter': {'type': 'hosting_platform', 'value': 'cloud'},
-            })
-
-        # === TECHNOLOGY INSIGHTS ===
-        # Technology distribution
-        tech_stats = list(
-            queryset.exclude(Q(programming_language__isnull=True) | Q(programming_language=''))
-            .values('programming_language')
-            .annotate(count=Count('id'))
-            .order_by('-count')[:5]
-        )
-        if tech_stats:
-            top_tech = tech_stats[0]
-            top_pct = round(top_tech['count'] / total_systems * 100, 1)
-            tech_list = ', '.join(["{} ({})".format(t['programming_language'], t['count']) for t in tech_stats])
-            insights.append({
-                'id': 'tech_distribution',
-                'category': 'technology',
-                'severity': 'info',
-                'title': f"Ngôn ngữ phổ biến nhất: {top_tech['programming_language']} ({top_tech['count']} hệ thống)",
-                'description': f"Top 5: {tech_list}",
-                'recommendation': 'Xem xét chuẩn hóa công nghệ để dễ bảo trì và tìm nhân sự.',
-                'metric': {'top': tech_stats},
-                'filter': {'type': 'technology'},
-            })
-
-        # Database distribution
-        db_stats = list(
-            queryset.exclude(Q(database_name__isnull=True) | Q(database_name=''))
-            .values('database_name')
-            .annotate(count=Count('id'))
-            .order_by('-count')[:5]
-        )
-        if db_stats:
-            db_list = ', '.join(["{} ({})".format(d['database_name'], d['count']) for d in db_stats])
-            insights.append({
-                'id': 'database_distribution',
-                'category': 'technology',
-                'severity': 'info',
-                'title': f"Database phổ biến nhất: {db_stats[0]['database_name']} ({db_stats[0]['count']} hệ thống)",
-                'description': f"Top 5: {db_list}",
-                'recommendation': 'Đánh giá khả năng hợp nhất database để giảm chi phí vận hành.',
-                'metric': {'top': db_stats},
-                'filter': {'type': 'database'},
-            })
-
-        # === SECURITY INSIGHTS ===
-        # Systems without data encryption
-        no_encryption = queryset.filter(has_encryption=False).count()
-        if no_encryption > 0:
-            pct = round(no_encryption / total_systems * 100, 1)
-            insights.append({
-                'id': 'no_encryption',
-                'category': 'security',
-                'severity': 'critical' if pct > 50 else 'warning',
-                'title': f'{no_encryption} hệ thống chưa mã hóa dữ liệu',
-                'description': f'{pct}% hệ thống chưa mã hóa dữ liệu at-rest, tiềm ẩn rủi ro bảo mật.',
-                'recommendation': 'Ưu tiên triển khai mã hóa cho các hệ thống xử lý dữ liệu nhạy cảm.',
-                'metric': {'count': no_encryption, 'percentage': pct},
-                'filter': {'type': 'no_encryption'},
-            })
-
-        # === ASSESSMENT INSIGHTS ===
-        # Systems not assessed
-        not_assessed = 0
-        needs_upgrade = 0
-        needs_replace = 0
-        for system in queryset.select_related('assessment'):
-            try:
-                if not hasattr(system, 'assessment') or not system.assessment:
-                    not_assessed += 1
-                elif system.assessment.recommendation == 'upgrade':
-                    needs_upgrade += 1
-                elif system.assessment.recommendation == 'replace':
-                    needs_replace += 1
-            except Exception:
-                not_assessed += 1
-
-        if not_assessed > 0:
-            pct = round(not_assessed / total_systems * 100, 1)
-            insights.append({
-                'id': 'not_assessed',
-                'category': 'assessment',
-                'severity': 'warning' if pct > 50 else 'info',
-                'title': f'{not_assessed} hệ thống chưa được đánh giá',
-                'description': f'{pct}% hệ thống chưa có kết quả assessment, không thể lập kế hoạch tối ưu.',
-                'recommendation': 'Hoàn thiện đánh giá để có cơ sở lập lộ trình nâng cấp.',
-                'metric': {'count': not_assessed, 'percentage': pct},
-                'filter': {'type': 'recommendation', 'value': 'unknown'},
-            })
-
-        if needs_replace > 0:
-            insights.append({
-                'id': 'needs_replace',
-                'category': 'assessment',
-                'severity': 'critical',
-                'title': f'{needs_replace} hệ thống cần thay thế',
-                'description': 'Các hệ thống này được đánh giá cần thay thế do lỗi thời hoặc không đáp ứng yêu cầu.',
-                'recommendation': 'Lập kế hoạch thay thế và chuyển đổi dữ liệu.',
-                'metric': {'count': needs_replace},
-                'filter': {'type': 'recommendation', 'value': 'replace'},
-            })
-
-        if needs_upgrade > 0:
-            insights.append({
-                'id': 'needs_upgrade',
-                'category': 'assessment',
-                'severity': 'warning',
-                'title': f'{needs_upgrade} hệ thống cần nâng cấp',
-                'description': 'Các hệ thống này cần nâng cấp để cải thiện hiệu năng hoặc tính năng.',
-                'recommendation': 'Lập kế hoạch nâng cấp theo thứ tự ưu tiên.',
-                'metric': {'count': needs_upgrade},
-                'filter': {'type': 'recommendation', 'value': 'upgrade'},
-            })
-
-        # Sort insights by severity
-        severity_order = {'critical': 0, 'warning': 1, 'info': 2, 'success': 3}
-        insights.sort(key=lambda x: severity_order.get(x['severity'], 99))
-
-        # Summary stats
-        summary = {
-            'total_insights': len(insights),
-            'critical': sum(1 for i in insights if i['severity'] == 'critical'),
-            'warning': sum(1 for i in insights if i['severity'] == 'warning'),
-            'info': sum(1 for i in insights if i['severity'] == 'info'),
-            'success': sum(1 for i in insights if i['severity'] == 'success'),
-        }
+    def _insights_section(self, queryset):
+        """
+        insights payload for the active systems in ``queryset`` (also used by dashboard_bundle)
 
-        return Response({
-            'insights': insights,
-            'summary': summary,
-            'total_systems': total_systems,
-        })
+        Rules are declared in insights.INSIGHT_RULES; all count rules are
+        evaluated in a single aggregate query.
+        """
+        return evaluate_insights(queryset)
 
     # ============================================================================
     # DEPRECATED: POST endpoint không được sử dụng - TẤT CẢ APIs đều dùng SSE
@@ -3176,8 +3290,7 @@ GROUP BY o.id, o.name;
 
         # Initialize AI client based on provider
         if use_claude:
-            from anthropic import Anthropic
-            client = Anthropic(api_key=api_key)
+            client = get_claude_client(api_key)
         else:
             import requests
             openai_client = None  # Use requests for OpenAI API
@@ -3250,8 +3363,7 @@ GROUP BY o.id, o.name;
                 return response.content[0].text
             else:
                 # OpenAI API - using GPT-5 with reasoning via Responses API
-                import openai as openai_sdk
-                openai_client = openai_sdk.OpenAI(api_key=api_key)
+                openai_client = get_openai_client(api_key)
 
                 # Build input array with 'developer' role for system prompt
                 input_array = [{'role': 'developer', 'content': system_prompt}]
@@ -3739,11 +3851,21 @@ Trả về JSON với SQL đã sửa."""
         Authentication: Pass JWT token via 'token' query parameter
         (EventSource doesn't support custom headers).
 
+        The streams are async generators: served by the ASGI app
+        (config/asgi.py) a stream waiting on the LLM holds no worker thread
+        and no database connection, so CRUD requests keep flowing.
+
         Events:
         - phase_start: When a phase begins
         - phase_complete: When a phase completes
+        - delta: Answer text as the LLM generates it
+          ({'phase', 'field', 'text'}; quick mode 'answer' still holds
+          {{column}} placeholders, deep mode 'main_answer'). Display only:
+          'complete' carries the final, post-processed answer
+        - keep_alive: Every 10s while deep mode waits on the LLM
         - error: When an error occurs
-        - complete: Final result with all data
+        - complete: Final result with all data ('cached': true when served
+          from the answer cache, see answer_cache.py)
         """
         # Manual authentication from query param (EventSource limitation)
         from rest_framework_simplejwt.tokens import AccessToken
@@ -3751,7 +3873,7 @@ Trả về JSON với SQL đã sửa."""
 
         token_param = request.query_params.get('token')
         if not token_param:
-            def error_stream():
+            async def error_stream():
                 yield f"event: error\ndata: {json.dumps({'error': 'Token required'})}\n\n"
             response = StreamingHttpResponse(error_stream(), content_type='text/event-stream')
             response['Cache-Control'] = 'no-cache'
@@ -3765,7 +3887,7 @@ Trả về JSON với SQL đã sửa."""
             user = User.objects.get(id=user_id)
         except Exception as e:
             logger.warning(f"SSE authentication failed: {e}")
-            def error_stream():
+            async def error_stream():
                 yield f"event: error\ndata: {json.dumps({'error': 'Invalid token'})}\n\n"
             response = StreamingHttpResponse(error_stream(), content_type='text/event-stream')
             response['Cache-Control'] = 'no-cache'
@@ -3773,7 +3895,7 @@ Trả về JSON với SQL đã sửa."""
             return response
         # TEMP: Allow admin for testing
         if user.role not in ['leader', 'admin']:
-            def error_stream():
+            async def error_stream():
                 yield f"event: error\ndata: {json.dumps({'error': 'Chỉ Lãnh đạo Bộ mới có quyền sử dụng AI Assistant'})}\n\n"
             response = StreamingHttpResponse(error_stream(), content_type='text/event-stream')
             response['Cache-Control'] = 'no-cache'
@@ -3782,7 +3904,7 @@ Trả về JSON với SQL đã sửa."""
 
         query = request.query_params.get('query', '').strip()
         if not query:
-            def error_stream():
+            async def error_stream():
                 yield f"event: error\ndata: {json.dumps({'error': 'Vui lòng nhập câu hỏi'})}\n\n"
             response = StreamingHttpResponse(error_stream(), content_type='text/event-stream')
             response['Cache-Control'] = 'no-cache'
@@ -3909,26 +4031,21 @@ RULE: Khi user hỏi "Bộ KH&CN có bao nhiêu hệ thống?" hoặc "Bộ có
 
         Stream:
         - phase_start: "Phân tích nhanh"
+        - delta: answer template text while the LLM generates it
         - complete: SQL + answer + data (NO strategic insights, NO review)
         """
-        def event_stream():
+        async def event_stream():
             import re
             import requests
             from django.utils import timezone
 
-            # API Configuration
-            CLAUDE_API_KEY = getattr(settings, 'CLAUDE_API_KEY', None)
-            OPENAI_API_KEY = getattr(settings, 'OPENAI_API_KEY', None)
-
-            use_claude = bool(CLAUDE_API_KEY)
-            use_openai = bool(OPENAI_API_KEY)
-
-            if not use_claude and not use_openai:
+            # API Configuration (OpenAI first, Claude as failover)
+            if not configured_providers():
                 yield f"event: error\ndata: {json.dumps({'error': 'AI service not configured'})}\n\n"
                 return
 
             # Create AI Request Log
-            request_log = AIRequestLog.objects.create(
+            request_log = await AIRequestLog.objects.acreate(
                 user=user,
                 query=query,
                 mode='quick',
@@ -3938,61 +4055,41 @@ RULE: Khi user hỏi "Bộ KH&CN có bao nhiêu hệ thống?" hoặc "Bộ có
                 tasks=[]
             )
 
-            # Helper function to call AI with logging
-            def call_ai_internal(system_prompt, messages, phase_name='Phase'):
+            # Get active improvement policies from user feedback
+            policies_text = await run_db(self._get_active_policies_text)
+
+            # Answer cache: same question, mode and active policies
+            cache_key, data_version, cached = await run_db(lookup_answer, query, 'quick', policies_text, context)
+            if cached and cached['data_version'] == data_version:
+                request_log.completed_at = timezone.now()
+                request_log.total_duration_ms = int((request_log.completed_at - request_log.started_at).total_seconds() * 1000)
+                request_log.tasks = [{'name': 'Answer cache', 'status': 'completed'}]
+                await request_log.asave(update_fields=['completed_at', 'total_duration_ms', 'tasks'])
+                yield f"event: complete\ndata: {json.dumps({**cached['response'], 'query': query, 'cached': True}, ensure_ascii=False, default=str)}\n\n"
+                return
+
+            # Helper function to stream the AI completion with logging
+            async def call_ai_stream(system_prompt, messages, phase_name='Phase', timeout=PHASE_TIMEOUTS['sql']):
+                """Yield the completion text chunk by chunk, then log the request"""
                 start_time = time.time()
-                model_used = None
-                estimated_input_tokens = 0
-                estimated_output_tokens = 0
-                estimated_cost = 0.0
+                first_token_time = None
+                chunks = []
+
+                # Estimate input tokens (rough estimate: 1 token ≈ 4 chars)
+                input_text = system_prompt + ''.join(m.get('content', '') for m in messages)
+                estimated_input_tokens = len(input_text) // 4
 
                 try:
-                    if use_openai:
-                        import openai
-                        client = openai.OpenAI(
-                            api_key=OPENAI_API_KEY,
-                            timeout=45.0
-                        )
-                        input_array = [{'role': 'developer', 'content': system_prompt}]
-                        input_array.extend(messages)
-
-                        # Estimate input tokens (rough estimate: 1 token ≈ 4 chars)
-                        input_text = system_prompt + ''.join(m.get('content', '') for m in messages)
-                        estimated_input_tokens = len(input_text) // 4
-
-                        # Use GPT-5.2 with low reasoning effort for quick mode
-                        response = client.responses.create(
-                            model='gpt-5.2',
-                            reasoning={'effort': 'low'},
-                            input=input_array,
-                            max_output_tokens=8192,
-                        )
-                        model_used = 'gpt-5.2'
-                        result = response.output_text
-
-                        # Estimate output tokens
-                        estimated_output_tokens = len(result) // 4
-
-                    elif use_claude:
-                        import anthropic
-                        client = anthropic.Anthropic(
-                            api_key=CLAUDE_API_KEY,
-                            timeout=45.0
-                        )
-
-                        input_text = system_prompt + ''.join(m.get('content', '') for m in messages)
-                        estimated_input_tokens = len(input_text) // 4
-
-                        response = client.messages.create(
-                            model='claude-sonnet-4-20250514',
-                            max_tokens=4096,
-                            system=system_prompt,
-                            messages=messages
-                        )
-                        model_used = 'claude-sonnet-4-20250514'
-                        result = response.content[0].text
-
-                        estimated_output_tokens = len(result) // 4
+                    # GPT-5.2 with low reasoning effort for quick mode
+                    llm = LLMStream(system_prompt, messages, timeout=timeout, effort='low', max_output_tokens=8192)
+                    async for text in llm:
+                        first_token_time = first_token_time or time.time()
+                        chunks.append(text)
+                        yield text
+                    model_used = llm.model
+
+                    # Estimate output tokens
+                    estimated_output_tokens = len(''.join(chunks)) // 4
 
                     # Calculate duration and cost
                     duration_ms = int((time.time() - start_time) * 1000)
@@ -4003,6 +4100,7 @@ RULE: Khi user hỏi "Bộ KH&CN có bao nhiêu hệ thống?" hoặc "Bộ có
                         'phase': phase_name,
                         'model': model_used,
                         'duration_ms': duration_ms,
+                        'first_token_ms': int((first_token_time - start_time) * 1000) if first_token_time else None,
                         'estimated_input_tokens': estimated_input_tokens,
                         'estimated_output_tokens': estimated_output_tokens,
                         'estimated_cost_usd': round(estimated_cost, 6),
@@ -4013,9 +4111,7 @@ RULE: Khi user hỏi "Bộ KH&CN có bao nhiêu hệ thống?" hoặc "Bộ có
                     current_requests = request_log.llm_requests or []
                     current_requests.append(llm_request)
                     request_log.llm_requests = current_requests
-                    request_log.save(update_fields=['llm_requests'])
-
-                    return result
+                    await request_log.asave(update_fields=['llm_requests'])
 
                 except Exception as e:
                     logger.error(f"AI call error in {phase_name}: {e}")
@@ -4106,10 +4202,7 @@ Lưu ý quan trọng:
 - Khi user hỏi bằng tiếng Việt, map sang đúng field name tiếng Anh trong database"""
 
             # Phase 1: Combined SQL Generation + Answer
-            yield f"event: phase_start\ndata: {json.dumps({'phase': 1, 'name': 'Phân tích nhanh', 'description': 'Đang tạo câu trả lời...', 'mode': 'quick'})}\n\n"
-
-            # Get active improvement policies from user feedback
-            policies_text = self._get_active_policies_text()
+            yield f"event: phase_start\ndata: {json.dumps({'phase': 1, 'name': 'Phân tích nhanh', 'description': 'Đang tạo câu trả lời...', 'mode': 'quick'})}\n\n"
 
             critical_context = self._get_critical_context()
             quick_prompt = f"""Bạn là AI assistant phân tích dữ liệu CNTT.
@@ -4215,30 +4308,41 @@ Trả về JSON:
 
 CHỈ trả về JSON."""
 
-            try:
-                phase1_content = call_ai_internal(quick_prompt, [{'role': 'user', 'content': query}], 'SQL Generation + Answer')
-                json_match = re.search(r'\{[\s\S]*\}', phase1_content)
-                if json_match:
-                    phase1_data = json.loads(json_match.group())
-                else:
-                    phase1_data = {'sql': None, 'answer': 'Không thể xử lý yêu cầu này.'}
+            if cached:
+                # Data changed since the answer was cached: re-run its SQL
+                sql_query, answer = cached['sql'], cached['answer']
+                yield f"event: phase_complete\ndata: {json.dumps({'phase': 1, 'sql': sql_query, 'answer_template': answer, 'cached': True})}\n\n"
+            else:
+                try:
+                    phase1_content = ''
+                    answer_stream = JSONStringStream('answer')
+                    async for chunk in call_ai_stream(quick_prompt, [{'role': 'user', 'content': query}], 'SQL Generation + Answer'):
+                        phase1_content += chunk
+                        text = answer_stream.feed(chunk)
+                        if text:
+                            yield f"event: delta\ndata: {json.dumps({'phase': 1, 'field': 'answer', 'text': text}, ensure_ascii=False)}\n\n"
+                    json_match = re.search(r'\{[\s\S]*\}', phase1_content)
+                    if json_match:
+                        phase1_data = json.loads(json_match.group())
+                    else:
+                        phase1_data = {'sql': None, 'answer': 'Không thể xử lý yêu cầu này.'}
 
-                sql_query = phase1_data.get('sql')
-                answer = phase1_data.get('answer')
+                    sql_query = phase1_data.get('sql')
+                    answer = phase1_data.get('answer')
 
-                # Emit phase 1 complete with details (like Deep mode)
-                yield f"event: phase_complete\ndata: {json.dumps({'phase': 1, 'sql': sql_query, 'answer_template': answer})}\n\n"
+                    # Emit phase 1 complete with details (like Deep mode)
+                    yield f"event: phase_complete\ndata: {json.dumps({'phase': 1, 'sql': sql_query, 'answer_template': answer})}\n\n"
 
-            except Exception as e:
-                logger.error(f"Quick mode phase 1 error: {e}")
-                # Update request log with error status
-                request_log.status = 'error'
-                request_log.error_message = str(e)
-                request_log.completed_at = timezone.now()
-                request_log.total_duration_ms = int((request_log.completed_at - request_log.started_at).total_seconds() * 1000)
-                request_log.save(update_fields=['status', 'error_message', 'completed_at', 'total_duration_ms'])
-                yield f"event: error\ndata: {json.dumps({'error': 'Lỗi xử lý', 'detail': str(e)})}\n\n"
-                return
+                except Exception as e:
+                    logger.error(f"Quick mode phase 1 error: {e}")
+                    # Update request log with error status
+                    request_log.status = 'error'
+                    request_log.error_message = str(e)
+                    request_log.completed_at = timezone.now()
+                    request_log.total_duration_ms = int((request_log.completed_at - request_log.started_at).total_seconds() * 1000)
+                    await request_log.asave(update_fields=['status', 'error_message', 'completed_at', 'total_duration_ms'])
+                    yield f"event: error\ndata: {json.dumps({'error': 'Lỗi xử lý', 'detail': str(e)})}\n\n"
+                    return
 
             if not sql_query:
                 yield f"event: complete\ndata: {json.dumps({'query': query, 'response': {'greeting': '', 'main_answer': answer or 'Không thể tạo truy vấn cho yêu cầu này.', 'follow_up_suggestions': []}, 'data': None, 'mode': 'quick'})}\n\n"
@@ -4247,7 +4351,7 @@ CHỈ trả về JSON."""
             # Phase 2: Execute SQL
             yield f"event: phase_start\ndata: {json.dumps({'phase': 2, 'name': 'Truy vấn dữ liệu', 'description': 'Đang lấy dữ liệu...', 'mode': 'quick'})}\n\n"
 
-            query_result, sql_error = validate_and_execute_sql_internal(sql_query)
+            query_result, sql_error = await run_db(validate_and_execute_sql_internal, sql_query)
             if query_result is None:
                 yield f"event: error\ndata: {json.dumps({'error': 'Lỗi truy vấn dữ liệu', 'detail': sql_error})}\n\n"
                 return
@@ -4281,7 +4385,7 @@ CHỈ trả về JSON."""
                 WHERE s.is_deleted = false
                 LIMIT 100
                 """
-                system_list, list_error = validate_and_execute_sql_internal(supplementary_sql)
+                system_list, list_error = await run_db(validate_and_execute_sql_internal, supplementary_sql)
 
                 if system_list is not None:
                     logger.info(f"[POLICY-SSE] Fetched {len(system_list.get('rows', []))} systems for visualization")
@@ -4323,7 +4427,9 @@ Trả về JSON:
 CHỈ trả về JSON."""
 
                 try:
-                    review_content = call_ai_internal(review_prompt, [{'role': 'user', 'content': query}], 'SQL Review')
+                    review_content = ''.join([
+                        chunk async for chunk in call_ai_stream(review_prompt, [{'role': 'user', 'content': query}], 'SQL Review', PHASE_TIMEOUTS['review'])
+                    ])
                     json_match = re.search(r'\{[\s\S]*\}', review_content)
 
                     if json_match:
@@ -4337,7 +4443,7 @@ CHỈ trả về JSON."""
                             # Retry with fixed SQL
                             yield f"event: phase_start\ndata: {json.dumps({'phase': 2.6, 'name': 'Thử lại truy vấn', 'description': 'Đang chạy SQL đã sửa...', 'mode': 'quick'})}\n\n"
 
-                            retry_result, retry_error = validate_and_execute_sql_internal(fixed_sql)
+                            retry_result, retry_error = await run_db(validate_and_execute_sql_internal, fixed_sql)
                             if retry_result and retry_result.get('total_rows', 0) > 0:
                                 query_result = retry_result
                                 sql_query = fixed_sql  # Update for logging
@@ -4496,7 +4602,14 @@ CHỈ trả về JSON."""
                 {'name': 'SQL Generation & Answer', 'status': 'completed'},
                 {'name': 'SQL Execution', 'status': 'completed'},
             ]
-            request_log.save(update_fields=['completed_at', 'total_duration_ms', 'total_cost_usd', 'tasks'])
+            await request_log.asave(update_fields=['completed_at', 'total_duration_ms', 'total_cost_usd', 'tasks'])
+
+            await run_db(store_answer, cache_key, {
+                'data_version': data_version,
+                'sql': sql_query,
+                'answer': answer,
+                'response': final_response,
+            })
 
             yield f"event: complete\ndata: {json.dumps(final_response, ensure_ascii=False, default=str)}\n\n"
 
@@ -4512,72 +4625,25 @@ CHỈ trả về JSON."""
         context: Optional dict with previous_query, previous_answer, previous_sql for follow-up questions
 
         Existing logic with strategic insights and self-review.
+        LLM calls are streamed: keep_alive events flow while no text arrives
+        and the Phase 3 main_answer is forwarded as delta events.
         """
-        def event_stream():
+        async def event_stream():
             import re
             import requests
-            import threading
-            import time
-
-            # API Configuration
-            CLAUDE_API_KEY = getattr(settings, 'CLAUDE_API_KEY', None)
-            OPENAI_API_KEY = getattr(settings, 'OPENAI_API_KEY', None)
 
-            use_claude = bool(CLAUDE_API_KEY)
-            use_openai = bool(OPENAI_API_KEY)
-
-            if not use_claude and not use_openai:
+            # API Configuration (OpenAI first, Claude as failover)
+            if not configured_providers():
                 yield f"event: error\ndata: {json.dumps({'error': 'AI service not configured'})}\n\n"
                 return
 
-            # Keep-alive event to prevent connection timeout
-            stop_keep_alive = threading.Event()
-            def send_keep_alive():
-                while not stop_keep_alive.is_set():
-                    time.sleep(10)  # Send every 10 seconds
-                    if not stop_keep_alive.is_set():
-                        yield f"event: keep_alive\ndata: {json.dumps({'timestamp': time.time()})}\n\n"
-
-            # Start keep-alive thread
-            keep_alive_thread = threading.Thread(target=lambda: list(send_keep_alive()))
-            keep_alive_thread.daemon = True
-            keep_alive_thread.start()
-
-            # Helper function to call AI with reduced timeout
-            def call_ai_internal(system_prompt, messages):
-                if use_openai:
-                    # Use OpenAI Responses API for reasoning models (GPT-5.2)
-                    # https://platform.openai.com/docs/guides/reasoning
-                    import openai
-                    client = openai.OpenAI(
-                        api_key=OPENAI_API_KEY,
-                        timeout=45.0  # Reduced from 60s to 45s for faster fail
-                    )
-
-                    # Build input array with system prompt and user messages
-                    input_array = [{'role': 'developer', 'content': system_prompt}]
-                    input_array.extend(messages)
-
-                    response = client.responses.create(
-                        model='gpt-5.2',
-                        reasoning={'effort': 'medium'},
-                        input=input_array,
-                        max_output_tokens=16000,
-                    )
-                    return response.output_text
-                elif use_claude:
-                    import anthropic
-                    client = anthropic.Anthropic(
-                        api_key=CLAUDE_API_KEY,
-                        timeout=60.0  # 60 second timeout
-                    )
-                    response = client.messages.create(
-                        model='claude-sonnet-4-20250514',
-                        max_tokens=4096,
-                        system=system_prompt,
-                        messages=messages
-                    )
-                    return response.content[0].text
+            # Helper function to stream the AI completion
+            async def call_ai_stream(system_prompt, messages, phase_name='Phase', timeout=PHASE_TIMEOUTS['sql']):
+                """Yield the completion text chunk by chunk"""
+                # GPT-5.2 with medium reasoning effort via the Responses API
+                # https://platform.openai.com/docs/guides/reasoning
+                async for text in LLMStream(system_prompt, messages, timeout=timeout, effort='medium', max_output_tokens=16000):
+                    yield text
 
             # SQL validation function
             def validate_and_execute_sql_internal(sql):
@@ -4602,6 +4668,15 @@ CHỈ trả về JSON."""
                 except Exception as e:
                     return None, str(e)
 
+            # Get active improvement policies from user feedback
+            policies_text = await run_db(self._get_active_policies_text)
+
+            # Answer cache: same question, mode and active policies
+            cache_key, data_version, cached = await run_db(lookup_answer, query, 'deep', policies_text, context)
+            if cached and cached['data_version'] == data_version:
+                yield f"event: complete\ndata: {json.dumps({**cached['response'], 'query': query, 'cached': True}, ensure_ascii=False, default=str)}\n\n"
+                return
+
             # ====== START STREAMING ======
 
             # Phase 1: SQL Generation
@@ -4671,9 +4746,6 @@ Lưu ý quan trọng:
 - data_volume_gb, storage_size_gb là NUMERIC - dùng để tính SUM/AVG
 - Khi user hỏi bằng tiếng Việt, map sang đúng field name tiếng Anh trong database"""
 
-            # Get active improvement policies from user feedback
-            policies_text = self._get_active_policies_text()
-
             phase1_prompt = f"""Bạn là AI assistant chuyên phân tích dữ liệu hệ thống CNTT cho Bộ KH&CN.
 
 QUAN TRỌNG - NGỮ CẢNH:
@@ -4755,30 +4827,41 @@ Trả về JSON:
 
 CHỈ trả về JSON."""
 
-            try:
-                # Progress: Calling AI
-                yield f"event: progress\ndata: {json.dumps({'message': 'Đang gọi AI tạo truy vấn SQL...'})}\n\n"
+            if cached:
+                # Data changed since the report was cached: re-run its (already
+                # enhanced) SQL and write the report from the fresh rows
+                thinking, sql_query = cached['thinking'], cached['sql']
+                yield f"event: phase_complete\ndata: {json.dumps({'phase': 1, 'thinking': thinking, 'sql': sql_query, 'cached': True})}\n\n"
+            else:
+                try:
+                    # Progress: Calling AI
+                    yield f"event: progress\ndata: {json.dumps({'message': 'Đang gọi AI tạo truy vấn SQL...'})}\n\n"
 
-                phase1_content = call_ai_internal(phase1_prompt, [{'role': 'user', 'content': query}])
+                    phase1_content = ''
+                    async for chunk in with_keep_alive(call_ai_stream(phase1_prompt, [{'role': 'user', 'content': query}])):
+                        if chunk is None:
+                            yield sse_keep_alive()
+                        else:
+                            phase1_content += chunk
 
-                # Progress: Processing response
-                yield f"event: progress\ndata: {json.dumps({'message': 'Đang xử lý kết quả AI...'})}\n\n"
+                    # Progress: Processing response
+                    yield f"event: progress\ndata: {json.dumps({'message': 'Đang xử lý kết quả AI...'})}\n\n"
 
-                json_match = re.search(r'\{[\s\S]*\}', phase1_content)
-                if json_match:
-                    phase1_data = json.loads(json_match.group())
-                else:
-                    phase1_data = {'thinking': {'plan': 'Direct response'}, 'sql': None}
+                    json_match = re.search(r'\{[\s\S]*\}', phase1_content)
+                    if json_match:
+                        phase1_data = json.loads(json_match.group())
+                    else:
+                        phase1_data = {'thinking': {'plan': 'Direct response'}, 'sql': None}
 
-                thinking = phase1_data.get('thinking', {})
-                sql_query = phase1_data.get('sql')
+                    thinking = phase1_data.get('thinking', {})
+                    sql_query = phase1_data.get('sql')
 
-                yield f"event: phase_complete\ndata: {json.dumps({'phase': 1, 'thinking': thinking, 'sql': sql_query})}\n\n"
+                    yield f"event: phase_complete\ndata: {json.dumps({'phase': 1, 'thinking': thinking, 'sql': sql_query})}\n\n"
 
-            except Exception as e:
-                logger.error(f"Phase 1 error: {e}")
-                yield f"event: error\ndata: {json.dumps({'error': 'Lỗi phân tích yêu cầu', 'detail': str(e)})}\n\n"
-                return
+                except Exception as e:
+                    logger.error(f"Phase 1 error: {e}")
+                    yield f"event: error\ndata: {json.dumps({'error': 'Lỗi phân tích yêu cầu', 'detail': str(e)})}\n\n"
+                    return
 
             if not sql_query:
                 yield f"event: complete\ndata: {json.dumps({'query': query, 'thinking': thinking, 'response': {'greeting': 'Báo cáo anh/chị,', 'main_answer': 'Không thể tạo truy vấn cho yêu cầu này.', 'follow_up_suggestions': []}, 'data': None})}\n\n"
@@ -4799,6 +4882,7 @@ CHỈ trả về JSON."""
             has_filter = 'WHERE' in sql_upper and sql_upper.count('WHERE') > 1  # Multiple conditions
 
             needs_enhancement = (has_group_by or has_order_by or has_filter) and not (is_simple_count or is_simple_sum)
+            needs_enhancement = needs_enhancement and not cached
 
             if needs_enhancement:
                 yield f"event: phase_start\ndata: {json.dumps({'phase': 1.5, 'name': 'Phân tích nhu cầu dữ liệu', 'description': 'Đang phân tích dữ liệu bổ sung cần thiết cho quyết định...'})}\n\n"
@@ -4840,7 +4924,12 @@ NHIỆM VỤ:
 CHỈ trả về JSON, không giải thích."""
 
                 try:
-                    phase15_content = call_ai_internal(phase15_prompt, [])
+                    phase15_content = ''
+                    async for chunk in with_keep_alive(call_ai_stream(phase15_prompt, [])):
+                        if chunk is None:
+                            yield sse_keep_alive()
+                        else:
+                            phase15_content += chunk
 
                     # Parse JSON
                     json_match = re.search(r'\{[\s\S]*\}', phase15_content)
@@ -4873,7 +4962,7 @@ CHỈ trả về JSON, không giải thích."""
             # Phase 2: Execute SQL (now using enhanced SQL if available)
             yield f"event: phase_start\ndata: {json.dumps({'phase': 2, 'name': 'Truy vấn dữ liệu', 'description': 'Đang thực thi truy vấn SQL tăng cường...'})}\n\n"
 
-            query_result, sql_error = validate_and_execute_sql_internal(sql_query)
+            query_result, sql_error = await run_db(validate_and_execute_sql_internal, sql_query)
 
             if query_result is None:
                 yield f"event: error\ndata: {json.dumps({'error': 'Lỗi truy vấn dữ liệu', 'detail': sql_error})}\n\n"
@@ -4911,7 +5000,12 @@ Trả về JSON:
 CHỈ trả về JSON."""
 
                 try:
-                    review_content = call_ai_internal(review_prompt, [{'role': 'user', 'content': query}], 'Deep SQL Review')
+                    review_content = ''
+                    async for chunk in with_keep_alive(call_ai_stream(review_prompt, [{'role': 'user', 'content': query}], 'Deep SQL Review', PHASE_TIMEOUTS['review'])):
+                        if chunk is None:
+                            yield sse_keep_alive()
+                        else:
+                            review_content += chunk
                     json_match = re.search(r'\{[\s\S]*\}', review_content)
 
                     if json_match:
@@ -4926,7 +5020,7 @@ CHỈ trả về JSON."""
                             # Retry with fixed SQL
                             yield f"event: phase_start\ndata: {json.dumps({'phase': 2.6, 'name': 'Thử lại truy vấn', 'description': 'Đang chạy SQL đã tối ưu...', 'mode': 'deep'})}\n\n"
 
-                            retry_result, retry_error = validate_and_execute_sql_internal(fixed_sql)
+                            retry_result, retry_error = await run_db(validate_and_execute_sql_internal, fixed_sql)
                             if retry_result and retry_result.get('total_rows', 0) > 0:
                                 query_result = retry_result
                                 sql_query = fixed_sql
@@ -5003,7 +5097,16 @@ CHỈ trả về JSON."""
                 # Progress: Calling AI
                 yield f"event: progress\ndata: {json.dumps({'message': 'Đang gọi AI tạo báo cáo...'})}\n\n"
 
-                phase2_content = call_ai_internal(phase2_prompt, [{'role': 'user', 'content': 'Generate response'}])
+                phase2_content = ''
+                answer_stream = JSONStringStream('main_answer')
+                async for chunk in with_keep_alive(call_ai_stream(phase2_prompt, [{'role': 'user', 'content': 'Generate response'}], 'Report', PHASE_TIMEOUTS['report'])):
+                    if chunk is None:
+                        yield sse_keep_alive()
+                        continue
+                    phase2_content += chunk
+                    text = answer_stream.feed(chunk)
+                    if text:
+                        yield f"event: delta\ndata: {json.dumps({'phase': 3, 'field': 'main_answer', 'text': text}, ensure_ascii=False)}\n\n"
 
                 # Progress: Processing response
                 yield f"event: progress\ndata: {json.dumps({'message': 'Đang hoàn thiện báo cáo...'})}\n\n"
@@ -5069,6 +5172,7 @@ CHỈ trả về JSON."""
 
             except Exception as e:
                 logger.error(f"Phase 3 error: {e}")
+                cache_key = None  # Never cache the fallback report
                 response_content = {
                     'greeting': 'Báo cáo anh/chị,',
                     'main_answer': f'Tìm thấy **{query_result.get("total_rows", 0)}** kết quả.',
@@ -5088,22 +5192,24 @@ Câu trả lời: {response_content.get('main_answer', '')}
 Trả về JSON: {{"is_consistent": true/false, "issues": []}}"""
 
             try:
-                review_content = call_ai_internal(review_prompt, [{'role': 'user', 'content': 'Review'}])
+                review_content = ''
+                async for chunk in with_keep_alive(call_ai_stream(review_prompt, [{'role': 'user', 'content': 'Review'}], 'Consistency Review', PHASE_TIMEOUTS['review'])):
+                    if chunk is None:
+                        yield sse_keep_alive()
+                    else:
+                        review_content += chunk
                 review_match = re.search(r'\{[\s\S]*\}', review_content)
                 if review_match:
                     review_result = json.loads(review_match.group())
                     is_consistent = review_result.get('is_consistent', True)
                 else:
                     is_consistent = True
-            except:
+            except Exception:
                 is_consistent = True
 
             thinking['review_passed'] = is_consistent
             yield f"event: phase_complete\ndata: {json.dumps({'phase': 4, 'review_passed': is_consistent})}\n\n"
 
-            # Stop keep-alive before final result
-            stop_keep_alive.set()
-
             # STEP 2: Generate interactive visualization AFTER answer is ready
             # This 2-step approach ensures better quality: answer first, then visualization
             # OLD: HTML string visualization (deprecated - causes duplicate tables)
@@ -5132,6 +5238,13 @@ Trả về JSON: {{"is_consistent": true/false, "issues": []}}"""
                 'mode': 'deep'  # Mark as deep mode
             }
 
+            await run_db(store_answer, cache_key, {
+                'data_version': data_version,
+                'sql': sql_query,
+                'thinking': thinking,
+                'response': final_response,
+            })
+
             yield f"event: complete\ndata: {json.dumps(final_response, ensure_ascii=False, default=str)}\n\n"
 
         response = StreamingHttpResponse(event_stream(), content_type='text/event-stream')
@@ -5141,6 +5254,8 @@ Trả về JSON: {{"is_consistent": true/false, "issues": []}}"""
         return response
 
     @action(detail=False, methods=['get'])
+    @conditional_get('roadmap_stats')
+    @cached_dashboard('roadmap_stats')
     def roadmap_stats(self, request):
         """
         Strategic Dashboard - Roadmap Statistics
@@ -5159,169 +5274,23 @@ Trả về JSON: {{"is_consistent": true/false, "issues": []}}"""
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        queryset = System.objects.filter(is_deleted=False).select_related(
-            'org', 'architecture', 'operations', 'integration', 'security', 'assessment'
-        )
-        total_systems = queryset.count()
-
-        # Phase criteria mapping
-        phase1_systems = []  # Need basic infrastructure improvements
-        phase2_systems = []  # Need standardization and integration
-        phase3_systems = []  # Ready for optimization and AI
-        completed_systems = []  # Already meet most criteria
-
-        for system in queryset:
-            system_data = {
-                'id': system.id,
-                'name': system.system_name,
-                'org_name': system.org.name if system.org else None,
-                'status': system.status,
-                'criticality': system.criticality_level,
-                'improvements_needed': [],
-                'score': 0,  # Higher = more mature
-            }
-
-            # Check Phase 1 criteria (Infrastructure & Foundation)
-            # Cloud readiness
-            if system.hosting_platform == 'cloud':
-                system_data['score'] += 20
-            elif system.hosting_platform == 'hybrid':
-                system_data['score'] += 10
-            else:
-                system_data['improvements_needed'].append({
-                    'phase': 1,
-                    'action': 'Cloud Migration',
-                    'detail': 'Di chuyển lên Cloud hoặc Hybrid',
-                })
-
-            # API Gateway
-            has_api_gw = False
-            try:
-                if hasattr(system, 'integration') and system.integration:
-                    has_api_gw = system.integration.has_api_gateway
-            except Exception:
-                pass
-
-            if has_api_gw:
-                system_data['score'] += 15
-            else:
-                system_data['improvements_needed'].append({
-                    'phase': 1,
-                    'action': 'API Gateway',
-                    'detail': 'Triển khai API Gateway tập trung',
-                })
-
-            # Basic security (Encryption)
-            has_encryption = system.has_encryption
-            if has_encryption:
-                system_data['score'] += 10
-            else:
-                system_data['improvements_needed'].append({
-                    'phase': 1,
-                    'action': 'Data Encryption',
-                    'detail': 'Triển khai mã hóa dữ liệu',
-                })
-
-            # Check Phase 2 criteria (Standardization & Integration)
-            # CI/CD
-            has_cicd = False
-            try:
-                if hasattr(system, 'architecture') and system.architecture:
-                    has_cicd = system.architecture.has_cicd
-            except Exception:
-                pass
-
-            if has_cicd:
-                system_data['score'] += 15
-            else:
-                system_data['improvements_needed'].append({
-                    'phase': 2,
-                    'action': 'CI/CD Pipeline',
-                    'detail': 'Triển khai CI/CD tự động',
-                })
-
-            # Documentation
-            has_docs = system.has_design_documents
-            has_arch = False
-            try:
-                if hasattr(system, 'architecture') and system.architecture:
-                    has_arch = system.architecture.has_architecture_diagram
-            except Exception:
-                pass
-
-            if has_docs:
-                system_data['score'] += 10
-            else:
-                system_data['improvements_needed'].append({
-                    'phase': 2,
-                    'action': 'Documentation',
-                    'detail': 'Hoàn thiện tài liệu thiết kế',
-                })
-
-            if has_arch:
-                system_data['score'] += 10
-            else:
-                system_data['improvements_needed'].append({
-                    'phase': 2,
-                    'action': 'Architecture Diagram',
-                    'detail': 'Xây dựng sơ đồ kiến trúc',
-                })
-
-            # Audit Log (as proxy for monitoring)
-            has_audit_log = system.has_audit_log
-            if has_audit_log:
-                system_data['score'] += 10
-            else:
-                system_data['improvements_needed'].append({
-                    'phase': 2,
-                    'action': 'Observability',
-                    'detail': 'Triển khai Monitoring & Logging',
-                })
-
-            # Check Phase 3 criteria (Optimization & AI)
-            # Data encryption
-            has_encryption = False
-            try:
-                if hasattr(system, 'security') and system.security:
-                    has_encryption = system.security.has_data_encryption_at_rest
-            except Exception:
-                pass
+        return Response(self._dashboard_section('roadmap_stats', System.objects.filter(is_deleted=False)))
 
-            if has_encryption:
-                system_data['score'] += 10
-            else:
-                system_data['improvements_needed'].append({
-                    'phase': 3,
-                    'action': 'Data Encryption',
-                    'detail': 'Mã hóa dữ liệu at-rest',
-                })
+    def _roadmap_stats_section(self, queryset):
+        """
+        roadmap_stats payload for the active systems in ``queryset`` (also used by dashboard_bundle)
 
-            # Categorize by phase needed
-            phase1_improvements = [i for i in system_data['improvements_needed'] if i['phase'] == 1]
-            phase2_improvements = [i for i in system_data['improvements_needed'] if i['phase'] == 2]
-            phase3_improvements = [i for i in system_data['improvements_needed'] if i['phase'] == 3]
-
-            if phase1_improvements:
-                system_data['current_phase'] = 1
-                system_data['phase_label'] = 'Giai đoạn 1: Xây móng'
-                phase1_systems.append(system_data)
-            elif phase2_improvements:
-                system_data['current_phase'] = 2
-                system_data['phase_label'] = 'Giai đoạn 2: Chuẩn hóa'
-                phase2_systems.append(system_data)
-            elif phase3_improvements:
-                system_data['current_phase'] = 3
-                system_data['phase_label'] = 'Giai đoạn 3: Tối ưu hóa'
-                phase3_systems.append(system_data)
-            else:
-                system_data['current_phase'] = 4
-                system_data['phase_label'] = 'Hoàn thành'
-                completed_systems.append(system_data)
+        Reads the stored roadmap_phase / roadmap_score / roadmap_improvements
+        (see utils.calculate_roadmap_maturity): one aggregate query for the
+        phase counts and improvement totals, plus one LIMIT query per phase.
+        Full phase lists: /api/systems/?roadmap_phase=<1-4>
+        """
+        buckets = aggregate_buckets(queryset, ROADMAP_STATS_BUCKETS)
+        total_systems = buckets['total']
+        phase_counts = buckets['phase_distribution']
 
-        # Sort each phase by criticality (high first)
-        criticality_order = {'high': 0, 'medium': 1, 'low': 2}
-        for systems_list in [phase1_systems, phase2_systems, phase3_systems, completed_systems]:
-            systems_list.sort(key=lambda x: criticality_order.get(x['criticality'], 99))
+        def percentage(count):
+            return round(count / total_systems * 100, 1) if total_systems > 0 else 0
 
         # Phase summary
         phase_summary = {
@@ -5329,114 +5298,146 @@ Trả về JSON: {{"is_consistent": true/false, "issues": []}}"""
                 'name': 'Giai đoạn 1 (2026)',
                 'title': 'Xây móng - Hội tụ dữ liệu',
                 'description': 'Ổn định hạ tầng, Cloud migration, API Gateway, SSL/TLS',
-                'count': len(phase1_systems),
-                'percentage': round(len(phase1_systems) / total_systems * 100, 1) if total_systems > 0 else 0,
+                'count': phase_counts[1],
+                'percentage': percentage(phase_counts[1]),
             },
             'phase2': {
                 'name': 'Giai đoạn 2 (2027-2028)',
                 'title': 'Chuẩn hóa - Tích hợp sâu',
                 'description': 'CI/CD, Documentation, Monitoring, Logging',
-                'count': len(phase2_systems),
-                'percentage': round(len(phase2_systems) / total_systems * 100, 1) if total_systems > 0 else 0,
+                'count': phase_counts[2],
+                'percentage': percentage(phase_counts[2]),
             },
             'phase3': {
                 'name': 'Giai đoạn 3 (2029-2030)',
                 'title': 'Tối ưu hóa - Thông minh hóa',
                 'description': 'Data encryption, AI integration, Open data',
-                'count': len(phase3_systems),
-                'percentage': round(len(phase3_systems) / total_systems * 100, 1) if total_systems > 0 else 0,
+                'count': phase_counts[3],
+                'percentage': percentage(phase_counts[3]),
             },
             'completed': {
                 'name': 'Hoàn thành',
                 'title': 'Đạt chuẩn',
                 'description': 'Đã đáp ứng các tiêu chí chuyển đổi số',
-                'count': len(completed_systems),
-                'percentage': round(len(completed_systems) / total_systems * 100, 1) if total_systems > 0 else 0,
+                'count': phase_counts[4],
+                'percentage': percentage(phase_counts[4]),
             },
         }
 
-        # Top priorities for each phase
-        top_priorities = {
-            'phase1': phase1_systems[:10],
-            'phase2': phase2_systems[:10],
-            'phase3': phase3_systems[:10],
-        }
+        # Top priorities for each phase: high criticality first
+        criticality_rank = Case(
+            When(criticality_level='high', then=Value(0)),
+            When(criticality_level='medium', then=Value(1)),
+            When(criticality_level='low', then=Value(2)),
+            default=Value(99),
+            output_field=IntegerField(),
+        )
+        phase_labels = dict(System.ROADMAP_PHASE_CHOICES)
+        top_priorities = {}
+        for phase in (1, 2, 3):
+            systems = (
+                queryset.filter(roadmap_phase=phase)
+                .annotate(criticality_rank=criticality_rank)
+                .order_by('criticality_rank', '-created_at')
+                .values(
+                    'id', 'system_name', 'org__name', 'status', 'criticality_level',
+                    'roadmap_improvements', 'roadmap_score',
+                )[:10]
+            )
+            top_priorities[f'phase{phase}'] = [
+                {
+                    'id': system['id'],
+                    'name': system['system_name'],
+                    'org_name': system['org__name'],
+                    'status': system['status'],
+                    'criticality': system['criticality_level'],
+                    'improvements_needed': system['roadmap_improvements'],
+                    'score': system['roadmap_score'],
+                    'current_phase': phase,
+                    'phase_label': phase_labels[phase],
+                }
+                for system in systems
+            ]
 
-        # Improvement actions summary
-        all_improvements = []
-        for system in queryset:
-            system_data = {
-                'id': system.id,
-                'name': system.system_name,
-            }
-            # Re-calculate improvements for summary
-            for sys_list in [phase1_systems, phase2_systems, phase3_systems]:
-                for s in sys_list:
-                    if s['id'] == system.id:
-                        all_improvements.extend(s['improvements_needed'])
-                        break
-
-        # Count improvements by action
-        from collections import Counter
-        action_counts = Counter(i['action'] for i in all_improvements)
-        improvement_actions = [
-            {'action': action, 'count': count, 'phase': next(
-                (i['phase'] for i in all_improvements if i['action'] == action), 1
-            )}
-            for action, count in action_counts.most_common()
-        ]
+        # Improvement actions summary (same action name in several phases is
+        # merged and reported under its earliest phase)
+        action_totals = {}
+        for (phase, action_name), count in buckets['improvements'].items():
+            if not count:
+                continue
+            entry = action_totals.setdefault(action_name, {'action': action_name, 'count': 0, 'phase': phase})
+            entry['count'] += count
+        improvement_actions = sorted(action_totals.values(), key=lambda a: -a['count'])
 
-        return Response({
+        return {
             'summary': phase_summary,
             'top_priorities': top_priorities,
             'improvement_actions': improvement_actions,
             'total_systems': total_systems,
-            'systems_by_phase': {
-                'phase1': phase1_systems,
-                'phase2': phase2_systems,
-                'phase3': phase3_systems,
-                'completed': completed_systems,
-            },
-        })
+        }
 
-    @action(detail=False, methods=['get'])
-    def export_data(self, request):
+    def _export_queryset(self, request):
         """
-        Export all systems with full details for Excel export.
-        Returns SystemDetailSerializer data for all systems (no pagination).
+        Role-scoped systems for the export endpoints.
 
         Query params:
         - search: Filter by search term
         - org: Filter by organization ID
         - status: Filter by status
         """
-        queryset = self.get_queryset()
+        from .exports import filter_export_queryset
 
-        # Apply search filter
-        search = request.query_params.get('search', '')
-        if search:
-            queryset = queryset.filter(
-                Q(system_code__icontains=search) |
-                Q(system_name__icontains=search) |
-                Q(system_name_en__icontains=search) |
-                Q(purpose__icontains=search)
-            )
+        return filter_export_queryset(self.get_queryset(), request.query_params)
+
+    def _export_organizations(self, request):
+        """Organizations listed in the per-organization sheets of export_xlsx"""
+        from apps.organizations.models import Organization
 
-        # Apply org filter
+        user = request.user
+        organizations = Organization.objects.all()
+        if user.role == 'org_user':
+            organizations = organizations.filter(pk=user.organization_id)
         org_id = request.query_params.get('org')
         if org_id:
-            queryset = queryset.filter(org_id=org_id)
+            organizations = organizations.filter(pk=org_id)
+        return organizations
 
-        # Apply status filter
-        status_filter = request.query_params.get('status')
-        if status_filter:
-            queryset = queryset.filter(status=status_filter)
+    @action(detail=False, methods=['get'],
+            renderer_classes=[*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer, CSVRenderer])
+    @conditional_get('export_data')
+    def export_data(self, request):
+        """
+        Export all systems with full details for Excel export.
+        Returns SystemDetailSerializer data for all systems (no pagination).
+
+        Query params:
+        - search / org / status: see _export_queryset
+        - fields / expand: Sparse fieldset (see parse_sparse_fieldset),
+          e.g. ?fields=id,system_name,org_name&expand=security
+        - format=ndjson|csv: Stream a flat dump instead (one line per system,
+          one-to-one sub-models as prefixed columns such as
+          architecture__backend_tech, see exports.stream_flat_export)
+        """
+        queryset = self._export_queryset(request)
+
+        export_format = getattr(request.accepted_renderer, 'format', None)
+        if export_format in ('ndjson', 'csv'):
+            from .exports import (
+                EXPORT_CHUNK_SIZE, FLAT_EXPORT_CONTENT_TYPES, export_filename, flat_export_columns, stream_flat_export,
+            )
+            from .streaming import streaming_content
 
-        # Order by org name, then system name
-        queryset = queryset.order_by('org__name', 'system_name')
+            columns = flat_export_columns(*parse_sparse_fieldset(request.query_params))
+            lines = stream_flat_export(queryset, export_format, columns)
+            response = StreamingHttpResponse(
+                streaming_content(request, lines, batch_size=EXPORT_CHUNK_SIZE),
+                content_type=FLAT_EXPORT_CONTENT_TYPES[export_format],
+            )
+            response['Content-Disposition'] = f'attachment; filename="{export_filename(extension=export_format)}"'
+            return response
 
-        # Serialize with full details
-        serializer = SystemDetailSerializer(queryset, many=True)
+        # Serialize with full details (or the ?fields= / ?expand= subset)
+        serializer = self.get_serializer(queryset, many=True)
 
         return Response({
             'count': queryset.count(),
@@ -5444,6 +5445,40 @@ Trả về JSON: {{"is_consistent": true/false, "issues": []}}"""
         })
 
     @action(detail=False, methods=['get'])
+    @conditional_get('export_xlsx')
+    def export_xlsx(self, request):
+        """
+        Download the system report as an .xlsx file built on the server.
+
+        Same sheets as 14-automated-solution/generate_excel_sample.py
+        (summary, per-organization, system list, follow-up). The workbook is
+        written in openpyxl write-only mode to a temporary file while systems
+        are read in chunks, then streamed to the client.
+
+        Query params: search / org / status (see _export_queryset)
+        """
+        import tempfile
+        from django.http import FileResponse
+        from .exports import XLSX_CONTENT_TYPE, export_filename, write_systems_workbook
+        from .streaming import stream_file
+
+        queryset = self._export_queryset(request)
+        output = tempfile.TemporaryFile(suffix='.xlsx')
+        try:
+            count = write_systems_workbook(queryset, output, self._export_organizations(request))
+        except Exception:
+            output.close()
+            raise
+        output.seek(0)
+
+        response = stream_file(request, FileResponse(
+            output, as_attachment=True, filename=export_filename(), content_type=XLSX_CONTENT_TYPE,
+        ))
+        response['X-Total-Count'] = count
+        return response
+
+    @action(detail=False, methods=['get'])
+    @conditional_get('completion_stats')
     def completion_stats(self, request):
         """
         Get detailed completion statistics for systems.
@@ -5456,9 +5491,12 @@ Trả về JSON: {{"is_consistent": true/false, "issues": []}}"""
         - completion_min: Min completion % (0-100)
         - completion_max: Max completion % (0-100)
         - ordering: Sort field (e.g., 'completion_percentage', '-system_name')
+        - page / page_size: Optional pagination of `results` (summary still covers all matches)
+
+        Filtering, ordering and aggregates run in the database on the stored
+        System.completion_percentage / completion_status.
         """
-        from collections import defaultdict
-        from .utils import get_incomplete_fields, REQUIRED_FIELDS_MAP, CONDITIONAL_FIELDS_MAP
+        from apps.organizations.models import Organization
 
         queryset = self.get_queryset()
 
@@ -5479,32 +5517,67 @@ Trả về JSON: {{"is_consistent": true/false, "issues": []}}"""
                 Q(system_code__icontains=search_query)
             )
 
-        # Get all systems with completion data
-        systems_data = []
-        org_stats = defaultdict(lambda: {
-            'id': None,
-            'name': '',
-            'system_count': 0,
-            'total_completion': 0.0,
-            'systems_100_percent': 0,
-            'systems_below_50_percent': 0,
-        })
-
-        for system in queryset.select_related('org'):
-            completion = calculate_system_completion_percentage(system)
-            incomplete = get_incomplete_fields(system)
-
-            # Calculate total required fields for this system
-            total_required = sum(len(fields) for fields in REQUIRED_FIELDS_MAP.values())
+        # Apply completion range filter
+        queryset = filter_by_ranges(queryset, request.query_params)
 
-            # Add conditional fields if applicable
-            for field_name, condition_field in CONDITIONAL_FIELDS_MAP.items():
-                if getattr(system, condition_field, False):
-                    total_required += 1
+        # Sort systems (ties keep the default newest-first order)
+        ordering = request.query_params.get('ordering', 'system_name')
+        sort_fields = {
+            'completion_percentage': 'completion_percentage',
+            'system_name': 'system_name',
+            'org_name': 'org__name',
+        }
+        sort_field = sort_fields.get(ordering.lstrip('-'))
+        if sort_field:
+            prefix = '-' if ordering.startswith('-') else ''
+            queryset = queryset.order_by(f'{prefix}{sort_field}', '-created_at')
+
+        # Per-org aggregates; every organization is listed (even those without systems)
+        org_rows = {
+            row['org_id']: row
+            for row in queryset.order_by().values('org_id').annotate(
+                system_count=Count('pk'),
+                avg_completion=Avg('completion_percentage'),
+                systems_100_percent=Count('pk', filter=Q(completion_percentage=100.0)),
+                systems_below_50_percent=Count('pk', filter=Q(completion_percentage__lt=50.0)),
+            )
+        }
+        org_list = []
+        for org in Organization.objects.order_by('name').values('id', 'name'):
+            row = org_rows.get(org['id'])
+            org_list.append({
+                'id': org['id'],
+                'name': org['name'],
+                'system_count': row['system_count'] if row else 0,
+                'avg_completion': round(row['avg_completion'], 1) if row else 0.0,
+                'systems_100_percent': row['systems_100_percent'] if row else 0,
+                'systems_below_50_percent': row['systems_below_50_percent'] if row else 0,
+            })
 
-            filled = total_required - len(incomplete)
+        # Calculate summary
+        summary = queryset.aggregate(
+            total_systems=Count('pk'),
+            avg_completion=Avg('completion_percentage'),
+            systems_100=Count('pk', filter=Q(completion_percentage=100.0)),
+            systems_below_50=Count('pk', filter=Q(completion_percentage__lt=50.0)),
+        )
+        total_systems = summary['total_systems']
+        avg_completion_all = round(summary['avg_completion'], 1) if total_systems > 0 else 0.0
+
+        page = None
+        systems = queryset.select_related('org').only(
+            'id', 'system_name', 'system_code', 'status', 'criticality_level',
+            'completion_percentage', 'completion_status', 'updated_at', 'created_at',
+            'org__id', 'org__name',
+        )
+        if request.query_params.get('page'):
+            page = self.paginate_queryset(systems)
+            systems = page
 
-            system_data = {
+        systems_data = []
+        for system in systems:
+            completion_status = system.completion_status or {}
+            systems_data.append({
                 'id': system.id,
                 'system_name': system.system_name,
                 'system_code': system.system_code or f'SYS-{system.id}',
@@ -5512,93 +5585,29 @@ Trả về JSON: {{"is_consistent": true/false, "issues": []}}"""
                 'org_name': system.org.name if system.org else None,
                 'status': system.status,
                 'criticality_level': system.criticality_level,
-                'completion_percentage': completion,
-                'filled_fields': filled,
-                'total_required_fields': total_required,
-                'incomplete_fields': incomplete,
-                'last_updated': system.updated_at if hasattr(system, 'updated_at') else None,
-            }
-
-            # Apply completion range filter
-            completion_min = request.query_params.get('completion_min')
-            completion_max = request.query_params.get('completion_max')
-            if completion_min and completion < float(completion_min):
-                continue
-            if completion_max and completion > float(completion_max):
-                continue
-
-            systems_data.append(system_data)
-
-            # Update org stats
-            if system.org:
-                org_key = system.org.id
-                org_stats[org_key]['id'] = system.org.id
-                org_stats[org_key]['name'] = system.org.name
-                org_stats[org_key]['system_count'] += 1
-                org_stats[org_key]['total_completion'] += completion
-                if completion == 100.0:
-                    org_stats[org_key]['systems_100_percent'] += 1
-                if completion < 50.0:
-                    org_stats[org_key]['systems_below_50_percent'] += 1
-
-        # Calculate org averages
-        org_list = []
-        for org_key, stats in org_stats.items():
-            stats['avg_completion'] = round(
-                stats['total_completion'] / stats['system_count'], 1
-            ) if stats['system_count'] > 0 else 0.0
-            del stats['total_completion']  # Remove temp field
-            org_list.append(stats)
-
-        # Include all organizations (even those without systems)
-        from apps.organizations.models import Organization
-        all_orgs = Organization.objects.all()
-        existing_org_ids = {stats['id'] for stats in org_list}
-        for org in all_orgs:
-            if org.id not in existing_org_ids:
-                org_list.append({
-                    'id': org.id,
-                    'name': org.name,
-                    'system_count': 0,
-                    'avg_completion': 0.0,
-                    'systems_100_percent': 0,
-                    'systems_below_50_percent': 0,
-                })
-
-        # Sort org_list by name for consistent ordering
-        org_list.sort(key=lambda x: x['name'])
-
-        # Sort systems
-        ordering = request.query_params.get('ordering', 'system_name')
-        reverse = ordering.startswith('-')
-        sort_key = ordering.lstrip('-')
-
-        if sort_key == 'completion_percentage':
-            systems_data.sort(key=lambda x: x['completion_percentage'], reverse=reverse)
-        elif sort_key == 'system_name':
-            systems_data.sort(key=lambda x: x['system_name'], reverse=reverse)
-        elif sort_key == 'org_name':
-            systems_data.sort(key=lambda x: x['org_name'] or '', reverse=reverse)
-
-        # Calculate summary
-        total_systems = len(systems_data)
-        avg_completion_all = round(
-            sum(s['completion_percentage'] for s in systems_data) / total_systems, 1
-        ) if total_systems > 0 else 0.0
-        systems_100 = sum(1 for s in systems_data if s['completion_percentage'] == 100.0)
-        systems_below_50 = sum(1 for s in systems_data if s['completion_percentage'] < 50.0)
+                'completion_percentage': system.completion_percentage,
+                'filled_fields': completion_status.get('filled_fields', 0),
+                'total_required_fields': completion_status.get('total_required_fields', 0),
+                'incomplete_fields': completion_status.get('incomplete_fields', []),
+                'last_updated': system.updated_at,
+            })
 
-        return Response({
+        response_data = {
             'count': total_systems,
             'results': systems_data,
             'summary': {
                 'organizations': org_list,
                 'total_systems': total_systems,
                 'avg_completion_all': avg_completion_all,
-                'systems_100_percent': systems_100,
-                'systems_below_50_percent': systems_below_50,
+                'systems_100_percent': summary['systems_100'],
+                'systems_below_50_percent': summary['systems_below_50'],
             }
-        })
+        }
+        if page is not None:
+            response_data['next'] = self.paginator.get_next_link()
+            response_data['previous'] = self.paginator.get_previous_link()
+
+        return Response(response_data)
 
     def destroy(self, request, *args, **kwargs):
         """
@@ -5629,6 +5638,99 @@ Trả về JSON: {{"is_consistent": true/false, "issues": []}}"""
         )
 
 
+class ExportJobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Background exports of the system report (Celery, see tasks.run_export_job)
+
+    Endpoints:
+    - POST /api/export-jobs/ - Start an export ({search, org, status, export_format})
+    - GET /api/export-jobs/{id}/ - Progress (rows_processed / rows_total)
+    - GET /api/export-jobs/{id}/download/ - Download the finished file
+
+    An identical request (same filters, same visible data, unchanged data
+    version) returns the existing job instead of exporting again.
+    """
+
+    serializer_class = ExportJobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        """Jobs exporting the data the user can see (admin: all jobs)"""
+        from .cache import get_org_scope
+        from .models import ExportJob
+
+        queryset = ExportJob.objects.all()
+        user = self.request.user
+        if user.role == 'admin':
+            return queryset
+        return queryset.filter(params__org_scope=get_org_scope(user))
+
+    def create(self, request, *args, **kwargs):
+        from django.db import transaction
+        from django.utils import timezone
+        from .exports import export_cache_key, export_params, find_reusable_job
+        from .models import ExportJob
+        from .tasks import run_export_job
+
+        data = request.data or request.query_params
+        export_format = data.get('export_format', 'xlsx')
+        if export_format not in dict(ExportJob.FORMAT_CHOICES):
+            return Response(
+                {'error': f'Định dạng không hỗ trợ: {export_format}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        params = export_params(data, request.user)
+        cache_key = export_cache_key(export_format, params)
+
+        job = find_reusable_job(cache_key)
+        if job:
+            return Response(self.get_serializer(job).data, status=status.HTTP_200_OK)
+
+        job = ExportJob.objects.create(
+            user=request.user, export_format=export_format, params=params, cache_key=cache_key,
+        )
+
+        def start():
+            try:
+                task = run_export_job.delay(job.pk)
+            except Exception as e:
+                logger.error(f"Could not queue export job {job.pk}: {e}")
+                ExportJob.objects.filter(pk=job.pk).update(
+                    status='failed', error='Không thể khởi chạy tác vụ xuất dữ liệu', finished_at=timezone.now(),
+                )
+                return
+            ExportJob.objects.filter(pk=job.pk).update(task_id=task.id)
+
+        transaction.on_commit(start)
+        return Response(self.get_serializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        from django.http import FileResponse
+        from .exports import XLSX_CONTENT_TYPE, export_artifact_path, export_filename
+        from .streaming import stream_file
+
+        job = self.get_object()
+        if job.status != 'success':
+            return Response(
+                {'error': 'Tệp xuất chưa sẵn sàng', 'status': job.status},
+                status=status.HTTP_409_CONFLICT
+            )
+
+        path = export_artifact_path(job)
+        if not path:
+            return Response(
+                {'error': 'Tệp xuất đã hết hạn, vui lòng xuất lại'},
+                status=status.HTTP_410_GONE
+            )
+
+        return stream_file(request, FileResponse(
+            open(path, 'rb'), as_attachment=True,
+            filename=export_filename(job.finished_at), content_type=XLSX_CONTENT_TYPE,
+        ))
+
+
 class AttachmentViewSet(viewsets.ModelViewSet):
     """
     ViewSet for Attachment CRUD operations
@@ -5670,6 +5772,15 @@ class AttachmentViewSet(viewsets.ModelViewSet):
         # If user has no organization assigned, return empty queryset
         return queryset.none()
 
+def _unit_progress_queryset(view, request, *args, **kwargs):
+    """Systems shown by the unit progress dashboard (ETag watermark)"""
+    user = request.user
+    org_id = request.query_params.get('org_id') if user.role == 'admin' else user.organization_id
+    if not org_id or not str(org_id).isdigit():
+        return System.objects.none()
+    return System.objects.filter(org_id=org_id, is_deleted=False)
+
+
 class UnitProgressDashboardView(APIView):
     """
     P0.9: Unit Progress Dashboard API
@@ -5685,6 +5796,7 @@ class UnitProgressDashboardView(APIView):
     """
     permission_classes = [IsAuthenticated]
 
+    @conditional_get('unit_progress', _unit_progress_queryset)
     def get(self, request):
         """Get progress dashboard data for the user's organization."""
         user = request.user
@@ -5701,7 +5813,7 @@ class UnitProgressDashboardView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             try:
-                from apps.accounts.models import Organization
+                from apps.organizations.models import Organization
                 organization = Organization.objects.get(id=org_id)
             except Organization.DoesNotExist:
                 return Response(
@@ -5721,35 +5833,37 @@ class UnitProgressDashboardView(APIView):
         systems = System.objects.filter(
             org=organization,
             is_deleted=False
-        ).select_related('org').order_by('-updated_at')
-
-        # Calculate completion percentage for each system
-        systems_data = []
-        total_completion = 0.0
-        for system in systems:
-            completion_percentage = calculate_system_completion_percentage(system)
-            total_completion += completion_percentage
-
-            systems_data.append({
-                'id': system.id,
-                'system_name': system.system_name,
-                'system_code': system.system_code,
-                'status': system.status,
-                'completion_percentage': completion_percentage,
-                'created_at': system.created_at.isoformat() if system.created_at else None,
-                'updated_at': system.updated_at.isoformat() if system.updated_at else None,
-            })
+        ).order_by('-updated_at')
 
-        # Calculate overall completion percentage
-        total_systems = len(systems_data)
+        # Counts and average over the stored completion percentage
+        totals = systems.aggregate(
+            total_systems=Count('pk'),
+            avg_completion=Avg('completion_percentage'),
+            complete_systems=Count('pk', filter=Q(completion_percentage__gte=100.0)),
+        )
+        total_systems = totals['total_systems']
         overall_completion_percentage = (
-            round(total_completion / total_systems, 1) if total_systems > 0 else 0.0
+            round(totals['avg_completion'], 1) if total_systems > 0 else 0.0
         )
-
-        # Count systems by completion level
-        complete_systems = sum(1 for s in systems_data if s['completion_percentage'] >= 100.0)
+        complete_systems = totals['complete_systems']
         incomplete_systems = total_systems - complete_systems
 
+        systems_data = [
+            {
+                'id': system['id'],
+                'system_name': system['system_name'],
+                'system_code': system['system_code'],
+                'status': system['status'],
+                'completion_percentage': system['completion_percentage'],
+                'created_at': system['created_at'].isoformat() if system['created_at'] else None,
+                'updated_at': system['updated_at'].isoformat() if system['updated_at'] else None,
+            }
+            for system in systems.values(
+                'id', 'system_name', 'system_code', 'status',
+                'completion_percentage', 'created_at', 'updated_at',
+            )
+        ]
+
         # Response data
         response_data = {
             'organization': {
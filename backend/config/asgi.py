@@ -1,5 +1,9 @@
 """
 ASGI config for System Report Management project.
+
+Production entry point (gunicorn -k uvicorn.workers.UvicornWorker). Sync
+views run in threads; the AI assistant's SSE streams are async generators
+served on the event loop.
 """
 
 import os
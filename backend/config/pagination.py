@@ -1,7 +1,18 @@
 """
 Custom pagination classes for the project
 """
-from rest_framework.pagination import PageNumberPagination
+import base64
+import binascii
+import datetime
+import json
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 
 class CustomPageNumberPagination(PageNumberPagination):
@@ -21,3 +32,188 @@ class CustomPageNumberPagination(PageNumberPagination):
     page_size = 20
     page_size_query_param = 'page_size'
     max_page_size = 1000
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination: constant cost per page, no COUNT(*), no OFFSET.
+
+    Rows are ordered by one field from the view's ``ordering_fields`` (or
+    ``id``) plus ``id`` as tie-breaker, in the same direction. The opaque
+    ``cursor`` encodes the (value, id) of the last row of the page, and the
+    next page is ``WHERE (field, id) > (value, id)`` (``<`` when descending),
+    which an index on the ordering field can serve directly. NULLs sort as
+    the largest value (PostgreSQL's native index order).
+
+    Usage:
+    - /api/systems/?pagination=cursor → first page (default ordering)
+    - /api/systems/?pagination=cursor&ordering=system_name&page_size=100
+    - follow ``next`` (or pass ``?cursor=<next_cursor>``) until it is null
+
+    Response: {'next': url, 'next_cursor': str, 'page_size': N, 'results': [...]}
+
+    Pages are forward-only; clients keep the cursors they visited to go back.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    cursor_query_param = 'cursor'
+    ordering_query_param = 'ordering'
+    default_ordering = '-created_at'
+    invalid_cursor_message = 'Cursor không hợp lệ'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request, view)
+        field = self.ordering.lstrip('-')
+        descending = self.ordering.startswith('-')
+
+        model_field = None if field == 'pk' else queryset.model._meta.get_field(field)
+        nullable = model_field is not None and model_field.null
+
+        tie_breaker = '-pk' if descending else 'pk'
+        if field == 'pk':
+            queryset = queryset.order_by(tie_breaker)
+        elif nullable:
+            order = F(field).desc(nulls_first=True) if descending else F(field).asc(nulls_last=True)
+            queryset = queryset.order_by(order, tie_breaker)
+        else:
+            queryset = queryset.order_by(self.ordering, tie_breaker)
+
+        cursor = self.decode_cursor(request, model_field)
+        if cursor is not None:
+            queryset = queryset.filter(self.after(field, descending, nullable, *cursor))
+
+        # One extra row tells whether a next page exists
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+
+        self.next_cursor = None
+        if self.has_next:
+            last = rows[-1]
+            self.next_cursor = self.encode_cursor(self.position(last, field))
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'next_cursor': self.next_cursor,
+            'page_size': self.page_size,
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'next_cursor': {'type': 'string', 'nullable': True},
+                'page_size': {'type': 'integer'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def get_ordering(self, request, view):
+        """First ?ordering= term if it is one of view.ordering_fields, else the view default"""
+        allowed = set(getattr(view, 'ordering_fields', None) or []) | {'id', 'pk'}
+        params = request.query_params.get(self.ordering_query_param)
+        candidates = [params.split(',')[0].strip()] if params else []
+        candidates += list(getattr(view, 'ordering', None) or [self.default_ordering])
+
+        for term in candidates:
+            if term.lstrip('-') in allowed:
+                return term.replace('id', 'pk') if term.lstrip('-') == 'id' else term
+        return self.default_ordering
+
+    @staticmethod
+    def position(row, field):
+        """(value, pk) of a model instance or a .values() dict"""
+        if isinstance(row, dict):
+            return row.get(field), row.get('pk', row.get('id'))
+        return getattr(row, field), row.pk
+
+    @staticmethod
+    def after(field, descending, nullable, value, pk):
+        """Rows strictly after (value, pk), NULL being the largest value"""
+        compare = 'lt' if descending else 'gt'
+        if field == 'pk':
+            return Q(**{f'pk__{compare}': pk})
+
+        if value is None:
+            after = Q(**{f'{field}__isnull': True, f'pk__{compare}': pk})
+            # Descending: NULLs come first, every non-NULL row follows them
+            return after | Q(**{f'{field}__isnull': False}) if descending else after
+
+        after = Q(**{f'{field}__{compare}': value}) | Q(**{field: value, f'pk__{compare}': pk})
+        # Ascending: NULLs come last, after every non-NULL row
+        return after | Q(**{f'{field}__isnull': True}) if nullable and not descending else after
+
+    def encode_cursor(self, position):
+        value, pk = position
+        if isinstance(value, (datetime.date, datetime.datetime)):
+            # Full precision (DjangoJSONEncoder would drop microseconds)
+            value = value.isoformat()
+        elif isinstance(value, Decimal):
+            value = str(value)
+        payload = json.dumps([self.ordering, value, pk], separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+    def decode_cursor(self, request, model_field=None):
+        """
+        (value, pk) from ?cursor=, None on the first page.
+
+        The value is parsed with ``model_field.to_python()`` (None when
+        ordering by pk), so a tampered cursor is rejected here instead of
+        failing in the query.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            ordering, value, pk = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            pk = int(pk)
+            if model_field is not None:
+                value = model_field.to_python(value)
+        except (TypeError, ValueError, ValidationError, UnicodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if ordering != self.ordering:
+            # The cursor belongs to a different sort order
+            raise NotFound(self.invalid_cursor_message)
+        return value, pk
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+
+class PageNumberOrKeysetPagination(CustomPageNumberPagination):
+    """
+    Page-number pagination (existing UI) unless the client asks for keyset
+    mode with ``?pagination=cursor`` or passes a ``?cursor=``.
+    """
+    mode_query_param = 'pagination'
+    keyset_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if (request.query_params.get(self.mode_query_param) == 'cursor'
+                or self.keyset_class.cursor_query_param in request.query_params):
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        self.keyset = None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -82,6 +82,9 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+# Production serves the ASGI app (gunicorn + uvicorn workers) so the AI
+# assistant's SSE streams run on the event loop instead of pinning a worker
+ASGI_APPLICATION = 'config.asgi.application'
 
 # Database
 # Use SQLite for local dev, PostgreSQL for production
@@ -250,5 +253,101 @@ CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60  # 30 minutes max per task
 CELERY_TASK_SOFT_TIME_LIMIT = 25 * 60  # Soft limit at 25 minutes
 
+# Periodic tasks (beat runs embedded in the worker, see docker-compose.yml)
+CELERY_BEAT_SCHEDULE = {
+    'prune-export-artifacts': {
+        'task': 'apps.systems.tasks.prune_export_artifacts',
+        'schedule': 60 * 60,
+    },
+}
+
+# Cache
+# Redis (same instance as Celery, separate DB) when REDIS_CACHE_URL is set;
+# without it, local memory in DEBUG and no cache at all in production
+REDIS_CACHE_URL = env('REDIS_CACHE_URL', default='')
+if REDIS_CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_CACHE_URL,
+            'KEY_PREFIX': 'thongke',
+        }
+    }
+elif env.bool('DEBUG', default=True):
+    # Single-process dev server and tests: local memory is consistent
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'thongke-default',
+        }
+    }
+else:
+    # Several workers (and celery) without a shared cache: a per-process data
+    # version would let workers that never saw a write serve stale payloads,
+    # so nothing is cached (apps/systems/cache.py reads version 0)
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+        }
+    }
+
+# Dashboard payloads are invalidated by the data version (apps/systems/cache.py);
+# the timeout only bounds how long stale versions occupy memory
+DASHBOARD_CACHE_TIMEOUT = env.int('DASHBOARD_CACHE_TIMEOUT', default=60 * 60)
+
+# Max threads per process computing sections of /api/systems/dashboard_bundle/,
+# shared by all concurrent bundle requests
+# (each thread holds one DB connection while it runs)
+DASHBOARD_BUNDLE_MAX_WORKERS = env.int('DASHBOARD_BUNDLE_MAX_WORKERS', default=4)
+
+# Serve strategic dashboard sections from the DashboardSnapshot table
+# (apps/systems/snapshots.py) instead of computing them per request.
+# Snapshots are refreshed DASHBOARD_SNAPSHOT_DEBOUNCE seconds after a burst
+# of writes and every DASHBOARD_SNAPSHOT_REFRESH_INTERVAL seconds by beat.
+DASHBOARD_SNAPSHOTS_ENABLED = env.bool('DASHBOARD_SNAPSHOTS_ENABLED', default=False)
+DASHBOARD_SNAPSHOT_DEBOUNCE = env.int('DASHBOARD_SNAPSHOT_DEBOUNCE', default=30)
+if DASHBOARD_SNAPSHOTS_ENABLED:
+    CELERY_BEAT_SCHEDULE['refresh-dashboard-snapshots'] = {
+        'task': 'apps.systems.tasks.refresh_dashboard_snapshots',
+        'schedule': env.int('DASHBOARD_SNAPSHOT_REFRESH_INTERVAL', default=15 * 60),
+    }
+
+# Systems fetched per round-trip by the streaming .xlsx export
+# (apps/systems/exports.py)
+EXPORT_CHUNK_SIZE = env.int('EXPORT_CHUNK_SIZE', default=2000)
+
+# Background export jobs (/api/export-jobs/) write their files here; the
+# directory must be shared by the backend and celery containers. Files and
+# finished jobs older than EXPORT_ARTIFACT_MAX_AGE seconds are pruned hourly.
+# Jobs still pending / running EXPORT_JOB_TIMEOUT seconds after they were
+# created / started are marked as failed (above CELERY_TASK_TIME_LIMIT).
+EXPORT_ROOT = env('EXPORT_ROOT', default=str(BASE_DIR / 'exports'))
+EXPORT_ARTIFACT_MAX_AGE = env.int('EXPORT_ARTIFACT_MAX_AGE', default=24 * 60 * 60)
+EXPORT_JOB_TIMEOUT = env.int('EXPORT_JOB_TIMEOUT', default=45 * 60)
+
+# Max systems per POST /api/systems/bulk/ request
+SYSTEM_BULK_MAX_ITEMS = env.int('SYSTEM_BULK_MAX_ITEMS', default=500)
+
+# AI assistant answers cached per normalized question + mode + active
+# policies (apps/systems/answer_cache.py). Entries are re-validated against
+# the data version on every hit, which must be shared by every worker:
+# enabled by default only with the Redis cache. The timeout only bounds
+# memory use.
+AI_ANSWER_CACHE_ENABLED = env.bool('AI_ANSWER_CACHE_ENABLED', default=bool(REDIS_CACHE_URL))
+AI_ANSWER_CACHE_TIMEOUT = env.int('AI_ANSWER_CACHE_TIMEOUT', default=7 * 24 * 60 * 60)
+
+# LLM gateway (apps/systems/llm_gateway.py): pooled OpenAI/Claude clients,
+# bounded retries with jittered back-off, and a per-provider circuit breaker
+# that opens after LLM_BREAKER_THRESHOLD consecutive failures and lets a
+# trial call through after LLM_BREAKER_COOLDOWN seconds. The base URLs point
+# the SDKs at a proxy or a local fake server.
+OPENAI_BASE_URL = env('OPENAI_BASE_URL', default=None)
+CLAUDE_BASE_URL = env('CLAUDE_BASE_URL', default=None)
+LLM_CONNECT_TIMEOUT = env.float('LLM_CONNECT_TIMEOUT', default=5.0)
+LLM_MAX_RETRIES = env.int('LLM_MAX_RETRIES', default=2)
+LLM_RETRY_BASE_DELAY = env.float('LLM_RETRY_BASE_DELAY', default=0.5)
+LLM_BREAKER_THRESHOLD = env.int('LLM_BREAKER_THRESHOLD', default=5)
+LLM_BREAKER_COOLDOWN = env.int('LLM_BREAKER_COOLDOWN', default=30)
+
 # Policy generation model (used by PolicyGenerator)
 POLICY_GENERATION_MODEL = env('POLICY_GENERATION_MODEL', default='gpt-4o-mini')
@@ -382,12 +382,6 @@ interface RoadmapStats {
   };
   improvement_actions: Array<{ action: string; count: number; phase: number }>;
   total_systems: number;
-  systems_by_phase: {
-    phase1: RoadmapSystem[];
-    phase2: RoadmapSystem[];
-    phase3: RoadmapSystem[];
-    completed: RoadmapSystem[];
-  };
 }
 
 // AI Query interfaces - Multi-agent thinking mode
@@ -623,6 +617,9 @@ const StrategicDashboard = () => {
   const [drilldownTitle, setDrilldownTitle] = useState('');
   const [drilldownSystems, setDrilldownSystems] = useState<DrilldownSystem[]>([]);
   const [drilldownLoading, setDrilldownLoading] = useState(false);
+  const [drilldownFilter, setDrilldownFilter] = useState<{ filterType: string; filterValue: string } | null>(null);
+  const [drilldownNextCursor, setDrilldownNextCursor] = useState<string | null>(null);
+  const [drilldownCount, setDrilldownCount] = useState(0);
 
   // AI Assistant state
   const [aiAssistantExpanded, setAiAssistantExpanded] = useState(true);
@@ -883,6 +880,29 @@ const StrategicDashboard = () => {
       }
     });
 
+    // Partial answer text while the LLM is still generating it.
+    // Display only: the complete event replaces it with the final answer
+    eventSource.addEventListener('delta', (e: MessageEvent) => {
+      try {
+        const data = JSON.parse(e.data);
+        setConversationHistory(prev => {
+          const entry = prev[pendingConversationIndex];
+          if (!entry || !(entry.response as any)?.loading) return prev;
+          const updated = [...prev];
+          updated[pendingConversationIndex] = {
+            ...entry,
+            response: {
+              ...entry.response,
+              streamingAnswer: ((entry.response as any).streamingAnswer || '') + (data.text || '')
+            } as any
+          };
+          return updated;
+        });
+      } catch (err) {
+        console.error('Error parsing delta:', err);
+      }
+    });
+
     eventSource.addEventListener('complete', (e: MessageEvent) => {
       try {
         console.log('[AI DEBUG] *** COMPLETE EVENT RECEIVED ***', e.data);
@@ -1485,21 +1505,49 @@ const StrategicDashboard = () => {
     setDrilldownLoading(true);
     setDrilldownTitle(title);
     setDrilldownVisible(true);
+    setDrilldownFilter({ filterType, filterValue });
 
     try {
       const response = await api.get('/systems/drilldown/', {
         params: { filter_type: filterType, filter_value: filterValue },
       });
       setDrilldownSystems(response.data.systems);
+      setDrilldownCount(response.data.count ?? response.data.systems.length);
+      setDrilldownNextCursor(response.data.next_cursor || null);
     } catch (error) {
       console.error('Drill-down failed:', error);
       message.error('Không thể tải danh sách hệ thống');
       setDrilldownSystems([]);
+      setDrilldownCount(0);
+      setDrilldownNextCursor(null);
     } finally {
       setDrilldownLoading(false);
     }
   }, []);
 
+  // Drill-down: load the next keyset page
+  const handleDrilldownLoadMore = useCallback(async () => {
+    if (!drilldownFilter || !drilldownNextCursor) return;
+    setDrilldownLoading(true);
+
+    try {
+      const response = await api.get('/systems/drilldown/', {
+        params: {
+          filter_type: drilldownFilter.filterType,
+          filter_value: drilldownFilter.filterValue,
+          cursor: drilldownNextCursor,
+        },
+      });
+      setDrilldownSystems((prev) => [...prev, ...response.data.systems]);
+      setDrilldownNextCursor(response.data.next_cursor || null);
+    } catch (error) {
+      console.error('Drill-down failed:', error);
+      message.error('Không thể tải danh sách hệ thống');
+    } finally {
+      setDrilldownLoading(false);
+    }
+  }, [drilldownFilter, drilldownNextCursor]);
+
   // Excel Export - Escape formula injection characters
   const escapeExcelValue = (value: any): any => {
     if (typeof value === 'string' && value.length > 0) {
@@ -2677,7 +2725,15 @@ const StrategicDashboard = () => {
                           }}
                         >
                           {/* Show loading spinner if response is still loading */}
-                          {(aiQueryResponse as any).loading ? (
+                          {(aiQueryResponse as any).loading && (aiQueryResponse as any).streamingAnswer ? (
+                            <div style={{ fontSize: 15, lineHeight: 1.8 }} className="ai-markdown-content">
+                              {/* Quick mode templates hold {{column}} placeholders until the data is in */}
+                              <ReactMarkdown>
+                                {(aiQueryResponse as any).streamingAnswer.replace(/\{\{?\w*\}?\}?|\[\w+\]/g, '…')}
+                              </ReactMarkdown>
+                              <Spin size="small" />
+                            </div>
+                          ) : (aiQueryResponse as any).loading ? (
                             <Space direction="vertical" size={8} align="center" style={{ width: '100%', padding: '20px 0' }}>
                               <Spin size="default" />
                               <Text type="secondary" style={{ fontSize: 13 }}>
@@ -4953,6 +5009,11 @@ const StrategicDashboard = () => {
         onCancel={() => setDrilldownVisible(false)}
         width={1000}
         footer={[
+          drilldownNextCursor && (
+            <Button key="more" onClick={handleDrilldownLoadMore} loading={drilldownLoading}>
+              Tải thêm ({drilldownSystems.length}/{drilldownCount})
+            </Button>
+          ),
           <Button key="close" onClick={() => setDrilldownVisible(false)}>
             Đóng
           </Button>,